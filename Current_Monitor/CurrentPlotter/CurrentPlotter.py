@@ -1,39 +1,84 @@
 from datetime import datetime
+import math
 import os
 import sys
 import threading
 import time
 import tkinter as tk
 from tkinter import ttk
+from typing import List, NamedTuple
 import requests
-import matplotlib.dates as mdates
 import matplotlib.pyplot as plt
-from matplotlib import ticker
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
+_COMMON_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "common"))
+if _COMMON_DIR not in sys.path:
+    sys.path.insert(0, _COMMON_DIR)
+
+from BinaryLog import STATUS_OK, BinaryLogWriter
+from LogIndex import LogIndexWriter
+from RenderScheduler import RenderScheduler
+from SampleFormat import BINARY_TYPE, decode_binary
+from RenderWorker import RenderWorker, WorkerCanvasTkAgg
+from FigureLayout import FigureLayout
+from WidgetState import WidgetState
 from CustomDateLocator import CustomDateLocator
+from DateTicks import CachedDateFormatter
 from VariousTimeDeque import VariousTimeDeque, Interval
 
+WRITE_BINARY_LOG = True  # fixed-record DD.bin next to each DD.txt
+OFFTHREAD_RENDER = False  # draw plot frames on a RenderWorker thread; the Tk thread only shows finished images
+BACKFILL_GAP_SEC = 3  # last stored sample older than this: catch up from the receiver's /Meas/since
+BACKFILL_LIMIT = 3600  # samples per catch-up request (1 h at 1 s); a longer gap takes several polls
+BINARY_MEAS = True  # ask /Meas for the struct-packed float64 sample (common/SampleFormat); older receivers still answer JSON
+X_TICK_FORMATS = {
+    Interval.ONE_SECOND: "%H:%M:%S",
+    Interval.ONE_MINUTE: "%H:%M",
+    Interval.TEN_MINUTES: "%H:%M",
+    Interval.ONE_HOUR: "%m-%d %H:%M",
+}
+
+
+class PlotView(NamedTuple):
+    """What one plot frame shows, copied on the Tk thread so the render never reads Tk state or live deques."""
+
+    interval: Interval
+    times: List[datetime]
+    data: List[List[float]]
+
 
 class CurrentPlotter:
     def __init__(self, master):
         self.master = master
         self.master.title("Current Plotter")
         self.master.bind("<Configure>", self.on_resize)
-        self.width = 800  # Default width
+
+        self.render_scheduler = RenderScheduler(self.master, self._render_frame)
 
         # Create UI components
         self.create_widgets()
+        self.render_worker = (
+            RenderWorker(self.master, self.canvas, self.update_plot, log=print) if OFFTHREAD_RENDER else None
+        )
 
-        # Deques for storing values
+        # Deques for storing values; the fetch thread appends under the lock, the plot copies under it
         self.arduino_deque = VariousTimeDeque(1)  # 0: Current
+        self.deque_lock = threading.Lock()
+        # 1 min buckets opened by backfilled samples, as save_log arguments, until main_loop writes them
+        self._backfilled_minutes = []
 
         self.time_arduino_plot = self.arduino_deque.get_time_deque(Interval.ONE_SECOND)
         self.data_arduino_plot = self.arduino_deque.get_data_deque(Interval.ONE_SECOND)
 
         self.arduino_status_code = "Off"
+        self.http = requests.Session()
+        self.http.trust_env = False
+        self.binary_log = None
+        self.log_index = LogIndexWriter()
 
         self.update_interval(None)
+        if self.render_worker is not None:
+            self.render_worker.start()
+        self.render_scheduler.start()
         self.main_loop()
 
     def create_widgets(self):
@@ -47,7 +92,7 @@ class CurrentPlotter:
             self.top_frame,
             text="Enable Arduino",
             variable=self.enable_arduino,
-            command=self.update_plot,
+            command=self.render_scheduler.request,
         )
         self.checkbox_arduino.pack(side=tk.LEFT)
 
@@ -58,6 +103,7 @@ class CurrentPlotter:
             self.top_frame, values=["1 s", "1 min", "10 min", "1 hour"]
         )
         self.interval_combo.current(0)  # Default to 1 s
+        self.plot_interval = Interval.ONE_SECOND
         self.interval_combo.pack(side=tk.LEFT)
         self.interval_combo.bind("<<ComboboxSelected>>", self.update_interval)
 
@@ -67,8 +113,10 @@ class CurrentPlotter:
 
         # Left canvas for plotting
         self.figure, self.ax = plt.subplots()
-        self.canvas = FigureCanvasTkAgg(self.figure, master=self.bottom_frame)
+        self.canvas = WorkerCanvasTkAgg(self.figure, master=self.bottom_frame)
         self.canvas.get_tk_widget().grid(row=0, column=0, sticky="nsew")
+        self.figure_layout = FigureLayout(self.master, self.figure, self._resize_settled)
+        self._x_tickers = {}  # interval -> (locator, formatter), reused across redraws
 
         # Right frame for displaying values and status
         self.right_frame = tk.Frame(self.bottom_frame, width=150)
@@ -77,6 +125,7 @@ class CurrentPlotter:
         # Data frame
         self.data_frame = tk.Frame(self.right_frame)
         self.data_frame.pack(side=tk.TOP, fill=tk.Y)
+        self.widget_state = WidgetState()  # labels are configured only when their text changes
 
         self.label_name_unit_pairs = [("• Current", "A")]
         self.name_labels = []
@@ -114,35 +163,37 @@ class CurrentPlotter:
         return [name_label, value_label]
 
     def on_resize(self, event):
-        self.last_width = self.width
-        self.width = event.width
-        if self.last_width != self.width:
+        self.figure_layout.configure(event)
+
+    def _on_close(self):
+        self.render_scheduler.stop()
+        print(f"Plot frames: {self.render_scheduler.counts()}")
+        if self.render_worker is not None:
+            self.render_worker.stop()
+            print(f"Render worker frames: {self.render_worker.counts()}")
+        self.http.close()
+        self.master.destroy()
+
+    def _resize_settled(self):
+        """Called by ``figure_layout`` once the window width has stopped changing."""
+        if self.render_worker is not None:
+            self.render_worker.call(self.resize_figure)
+        else:
             self.resize_figure()
+        self.render_scheduler.request()
 
     def resize_figure(self):
-        new_font_size = max(8, self.width // 75)
-
-        plt.rcParams.update(
-            {
-                "font.size": new_font_size,
-                "axes.labelsize": new_font_size,
-                "axes.titlesize": new_font_size,
-                "xtick.labelsize": new_font_size * 0.8,
-                "ytick.labelsize": new_font_size * 0.8,
-                "legend.fontsize": new_font_size * 0.9,
-            }
-        )
-
-        self.figure.tight_layout(pad=1.0)
+        self.figure_layout.relayout()
 
     def update_interval(self, event):
         interval = self.get_interval()
+        self.plot_interval = interval
         self.time_arduino_plot = self.arduino_deque.get_time_deque(interval)
         self.data_arduino_plot = self.arduino_deque.get_data_deque(interval)
 
         if len(self.time_arduino_plot) <= 2:
             return
-        self.update_plot()
+        self.render_scheduler.request()
 
     def main_loop(self):
         loop_start_time = time.time()
@@ -150,34 +201,38 @@ class CurrentPlotter:
         self.update_display()
 
         expected_exc_delay = 0.2
-        if loop_start_time - self.arduino_deque.get_last_time().timestamp() < expected_exc_delay:
-            if self.get_interval() == Interval.ONE_SECOND:
-                self.update_plot()
+
+        with self.deque_lock:
+            minutes, self._backfilled_minutes = self._backfilled_minutes, []
+        for minute in minutes:
+            self.save_log(*minute)
+        backfilled_until = minutes[-1][0] if minutes else None
 
         if (
             loop_start_time - self.arduino_deque.get_last_1min_time().timestamp()
             < expected_exc_delay
         ):
             if self.get_interval() == Interval.ONE_MINUTE:
-                self.update_plot()
-            self.save_log(
-                self.arduino_deque.get_last_1min_time(),
-                self.arduino_deque.get_last_data(),
-            )
+                self.render_scheduler.request()
+            if self.arduino_deque.get_last_1min_time() != backfilled_until:
+                self.save_log(
+                    self.arduino_deque.get_last_1min_time(),
+                    self.arduino_deque.get_last_data(),
+                )
 
         if (
             loop_start_time - self.arduino_deque.get_last_10min_time().timestamp()
             < expected_exc_delay
         ):
             if self.get_interval() == Interval.TEN_MINUTES:
-                self.update_plot()
+                self.render_scheduler.request()
 
         if (
             loop_start_time - self.arduino_deque.get_last_1hour_time().timestamp()
             < expected_exc_delay
         ):
             if self.get_interval() == Interval.ONE_HOUR:
-                self.update_plot()
+                self.render_scheduler.request()
 
         loop_end_time = time.time()
         execution_time = loop_end_time - loop_start_time
@@ -207,12 +262,24 @@ class CurrentPlotter:
             self.arduino_status_code = "Off"
             return [0]
         try:
-            response = requests.get("http://127.0.0.1:5005/Meas", timeout=1)
+            response = self.http.get(
+                "http://127.0.0.1:5005/Meas", headers={"Accept": BINARY_TYPE} if BINARY_MEAS else None, timeout=1
+            )
             self.arduino_status_code = response.status_code
             if response.status_code != 200:
                 print(f"Error fetching from Arduino: {response.status_code}")
                 return [0]
 
+            if response.headers.get("Content-Type") == BINARY_TYPE:
+                _, timestamp, values = decode_binary(response.content)
+                if time.time() - timestamp > 5:
+                    self.arduino_status_code = "DataTooOld"
+                    print("Data is too old")
+                    return [0]
+                if len(values) != 1 or math.isnan(values[0]):
+                    raise ValueError(f"no current value in {values}")
+                return list(values)
+
             json = response.json()
 
             if time.time() - json["timestamp"] > 5:
@@ -239,9 +306,51 @@ class CurrentPlotter:
             print(f"Critical error fetching from Arduino: {e}")
         return [0]
 
+    def backfill(self):
+        """Store the readings the receiver took since the last stored sample, if that is BACKFILL_GAP_SEC old.
+
+        The receiver keeps its recent readings and returns the newer ones (at
+        most one per second) in one reply, so a stalled fetch thread or slow
+        replies leave no hole in the plot or the log: the 1 min buckets the
+        samples open are queued for main_loop to log. Returns True if samples
+        were stored.
+        """
+        if self.enable_arduino.get() == 0:
+            return False
+        last_time = self.arduino_deque.get_last_time().timestamp()
+        if time.time() - last_time < BACKFILL_GAP_SEC:
+            return False
+        try:
+            response = self.http.get(
+                "http://127.0.0.1:5005/Meas/since",
+                params={"ts": last_time, "limit": BACKFILL_LIMIT, "step": 1},
+                timeout=1,
+            )
+            if response.status_code != 200:
+                return False
+            rows = [([float(sample["Current"].split(" ")[0])], sample["timestamp"])
+                    for sample in response.json()["samples"] if sample["Current"] is not None]
+        except (requests.exceptions.RequestException, ValueError, KeyError) as e:
+            print(f"Backfill from Arduino failed: {e}")
+            return False
+        deque = self.arduino_deque
+        with self.deque_lock:
+            for values, timestamp in rows:
+                bucket = deque.get_last_1min_time()
+                deque.update_data(values, timestamp)
+                if deque.get_last_1min_time() != bucket:
+                    self._backfilled_minutes.append((deque.get_last_1min_time(), deque.get_last_data()))
+        return bool(rows)
+
     def fetch_data(self):
-        values_arduino = self.get_data_from_arduino()
-        self.arduino_deque.update_data(values_arduino, time.time())
+        if not self.backfill():
+            values_arduino = self.get_data_from_arduino()
+            with self.deque_lock:
+                self.arduino_deque.update_data(values_arduino, time.time())
+
+        # Only the 1 s view changes with every sample; the others redraw when a bucket opens
+        if self.plot_interval == Interval.ONE_SECOND:
+            self.render_scheduler.request()
 
     def get_interval(self) -> Interval:
         interval_str = self.interval_combo.get()
@@ -264,27 +373,45 @@ class CurrentPlotter:
 
     def update_display(self):
         data_order = [0]
-        for i, position in enumerate(self.last_positions):
-            self.name_labels[i].config(text=self.label_name_unit_pairs[position][0])
-            self.value_labels[i].config(
-                text=(
-                    f": {self.arduino_deque.get_last_data()[data_order[position]]:.2f} "
-                    f"{self.label_name_unit_pairs[position][1]}"
+        state = self.widget_state
+        # VariousTimeDeque has no generation counter: the last values themselves are the key
+        last_data = self.arduino_deque.get_last_data()
+        if state.changed("values", (tuple(last_data), tuple(self.last_positions))):
+            for i, position in enumerate(self.last_positions):
+                name, unit = self.label_name_unit_pairs[position]
+                state.set(self.name_labels[i], text=name)
+                state.set(
+                    self.value_labels[i],
+                    text=f": {last_data[data_order[position]]:.2f} {unit}",
                 )
-            )
-        self.current_time_label.config(
-            text=f": {datetime.now().strftime('%H:%M:%S')}"
+        state.set(
+            self.current_time_label,
+            text=f": {datetime.now().strftime('%H:%M:%S')}",
         )
-        self.arduino_status_label.config(
+        state.set(
+            self.arduino_status_label,
             text=(
                 ": Connected"
                 if self.arduino_status_code == 200
                 else self.make_error_sentence(self.arduino_status_code)
-            )
+            ),
         )
 
-    def update_plot(self):
-        if len(self.time_arduino_plot) <= 2:
+    def _render_frame(self):
+        """RenderScheduler callback: copy the frame's data, then draw it here or on the render worker."""
+        with self.deque_lock:
+            view = PlotView(
+                self.get_interval(),
+                list(self.time_arduino_plot),
+                [list(channel) for channel in self.data_arduino_plot],
+            )
+        if self.render_worker is not None:
+            self.render_worker.request(view)
+        else:
+            self.update_plot(view)
+
+    def update_plot(self, view):
+        if view is None or len(view.times) <= 2:
             return
 
         self.ax.clear()
@@ -292,8 +419,8 @@ class CurrentPlotter:
         marker_size = 3
 
         self.ax.plot(
-            self.time_arduino_plot,
-            self.data_arduino_plot[0],
+            view.times,
+            view.data[0],
             marker="o",
             color="blue",
             label="Current",
@@ -302,7 +429,7 @@ class CurrentPlotter:
 
         self.ax.set_xlabel("")
         self.ax.set_ylabel("Current (A)")
-        self.ax.set_ylim(0, max(1, max(self.data_arduino_plot[0])))
+        self.ax.set_ylim(0, max(1, max(view.data[0])))
         self.ax.autoscale_view()
         self.ax.legend(loc="lower left")
 
@@ -310,25 +437,18 @@ class CurrentPlotter:
             label.set_rotation(30)
             label.set_horizontalalignment("right")
 
-        self.update_xformatter(self.get_interval())
+        self.update_xformatter(view.interval)
         self.set_axes_margin()
+        self.figure_layout.apply_fonts()
         self.canvas.draw()
 
     def set_axes_margin(self):
         self.ax.margins(x=0.1, y=0.5)
 
     def update_xformatter(self, interval: Interval):
-        def format_date(x, pos=None):
-            date = mdates.num2date(x)
-            if interval == Interval.ONE_SECOND:
-                return date.strftime("%H:%M:%S")
-            elif interval == Interval.ONE_HOUR:
-                return date.strftime("%m-%d %H:%M")
-            else:
-                return date.strftime("%H:%M")
-
-        locator = CustomDateLocator(interval)
-        formatter = ticker.FuncFormatter(format_date)
+        if interval not in self._x_tickers:
+            self._x_tickers[interval] = (CustomDateLocator(interval), CachedDateFormatter(X_TICK_FORMATS[interval]))
+        locator, formatter = self._x_tickers[interval]
 
         self.ax.xaxis.set_major_locator(locator)
         self.ax.xaxis.set_major_formatter(formatter)
@@ -350,11 +470,27 @@ class CurrentPlotter:
 
         log_file_path = os.path.join(year_month_dir, f"{day}.txt")
 
+        offset = os.path.getsize(log_file_path) if os.path.exists(log_file_path) else 0
         with open(log_file_path, "a", encoding="utf-8") as f:
             f.write(
                 f"{time.strftime('%Y-%m-%d %H:%M:%S')}: {arduino_data[0]:.2f} A\n"
             )
 
+        try:
+            self.log_index.record(log_file_path, offset, time, [round(arduino_data[0], 2)])
+        except (OSError, ValueError) as e:
+            print(f"Failed to update data log index: {e}")
+
+        if WRITE_BINARY_LOG:
+            if self.binary_log is None:
+                self.binary_log = BinaryLogWriter(os.path.join(base, "log_current"), 1, calibrated=False)
+            # Status bit 0: Arduino not delivering good data
+            status = STATUS_OK if self.arduino_status_code == 200 else 1
+            try:
+                self.binary_log.append(time, arduino_data, status=status)
+            except (OSError, ValueError) as e:
+                print(f"Failed to write binary data log: {e}")
+
 
 def resource_path(relative_path):
     """Resolve bundled icon assets next to exe / script."""
@@ -371,5 +507,6 @@ if __name__ == "__main__":
     root = tk.Tk()
     root.iconbitmap(resource_path("CurrentPlotter.ico"))
     app = CurrentPlotter(root)
+    root.protocol("WM_DELETE_WINDOW", app._on_close)
     app.start()
     root.mainloop()
@@ -1 +1 @@
-python -m PyInstaller --onefile --noconsole -n=CurrentPlotter --icon=.\CurrentPlotter.ico --add-data "CurrentPlotter.ico;." .\CurrentPlotter.py
+python -m PyInstaller --onefile --noconsole -n=CurrentPlotter --icon=.\CurrentPlotter.ico --add-data "CurrentPlotter.ico;." --paths=..\..\common --hidden-import=BinaryLog --hidden-import=LogIndex --hidden-import=RenderScheduler --hidden-import=RenderWorker --hidden-import=FigureLayout --hidden-import=DateTicks --hidden-import=WidgetState --hidden-import=SampleFormat .\CurrentPlotter.py
@@ -1,7 +1,17 @@
+import os
+import sys
 import serial
 import time
+from http.server import ThreadingHTTPServer
 from typing import Optional
 
+_COMMON_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "common"))
+if _COMMON_DIR not in sys.path:
+    sys.path.insert(0, _COMMON_DIR)
+
+from ReceiverHTTP import KeepAliveHandler, Snapshot
+from SampleHistory import SampleHistory
+
 
 class SerialMediator:
     def __init__(self, port: str = 'COM5', baud_rate: int = 9600):
@@ -12,6 +22,11 @@ class SerialMediator:
         # Measurement values
         self.current: Optional[float] = None
         self.last_read_time = time.time()
+        # What /Meas serves: replaced as a whole per reading
+        self.sequence = 0
+        self.snapshot = Snapshot.of(self.measurement(), self.sequence, (self.current,))
+        # Recent readings for /Meas/since
+        self.history = SampleHistory(('Current',), decimals=3)
 
         # Connection management
         self.is_running = True
@@ -51,10 +66,20 @@ class SerialMediator:
             current_bit = float(parts[0])
             self.current = SerialMediator.cal_current(current_bit)
             self.last_read_time = time.time()
+            self.sequence += 1
+            self.snapshot = Snapshot.of(self.measurement(), self.sequence, (self.current,))
+            self.history.append(self.last_read_time, (self.current,))
 
         except (ValueError, IndexError) as e:
             print(f"Error processing serial data: {e}")
 
+    def measurement(self) -> dict:
+        """Latest current as a /Meas record"""
+        return {
+            'Current': None if self.current is None else f"{self.current:.3f}",
+            'timestamp': self.last_read_time
+        }
+
     def run(self) -> None:
         """Main loop for serial communication"""
         last_flush_time = time.time()
@@ -91,33 +116,31 @@ class SerialMediator:
                 time.sleep(self.reconnect_delay)
 
 
-def main():
-    import threading
-    from http.server import HTTPServer, BaseHTTPRequestHandler
-    import json
-
-    mediator = SerialMediator()
+def make_request_handler(mediator: SerialMediator) -> type[KeepAliveHandler]:
+    """HTTP handler class serving ``mediator``'s latest current at ``/Meas`` and recent readings at ``/Meas/since``."""
 
-    class SimpleHTTPRequestHandler(BaseHTTPRequestHandler):
+    class SimpleHTTPRequestHandler(KeepAliveHandler):
         def do_GET(self):
-            if self.path == '/Meas':
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
+            path, _, query = self.path.partition('?')
+            if path == '/Meas':
+                self.send_snapshot(mediator.snapshot)
+            elif path == '/Meas/since':
+                self.send_since(mediator.history, query)
+            else:
+                self.send_error(404)
 
-                data = {
-                    'Current': None if mediator.current is None else f"{mediator.current:.3f}",
-                    'timestamp': mediator.last_read_time
-                }
+    return SimpleHTTPRequestHandler
 
-                self.wfile.write(json.dumps(data).encode())
-            else:
-                self.send_response(404)
-                self.end_headers()
+
+def main():
+    import threading
+
+    mediator = SerialMediator()
 
     def run_simple_server():
         server_address = ('', 5005)
-        httpd = HTTPServer(server_address, SimpleHTTPRequestHandler)
+        # Threaded: each kept-alive plotter connection holds a handler thread
+        httpd = ThreadingHTTPServer(server_address, make_request_handler(mediator))
         httpd.serve_forever()
 
     server_thread = threading.Thread(target=run_simple_server)
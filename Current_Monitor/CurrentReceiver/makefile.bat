@@ -1 +1 @@
-python -m PyInstaller --onefile -n=CurrentReceiver .\CurrentReceiver.py
+python -m PyInstaller --onefile -n=CurrentReceiver --paths=..\..\common --hidden-import=ReceiverHTTP --hidden-import=SampleHistory --hidden-import=SampleFormat .\CurrentReceiver.py
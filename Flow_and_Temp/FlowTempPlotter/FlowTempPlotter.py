@@ -1,36 +1,78 @@
 from datetime import datetime, timedelta
 import json
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.dates as mdates
+import math
 import matplotlib.pyplot as plt
-import matplotlib.ticker as ticker
+from matplotlib.transforms import nonsingular
 import os
-import re
 import sys
 import requests
 import threading
 import time
 import tkinter as tk
 from tkinter import ttk
-from typing import Optional, List, Deque
+from typing import Dict, NamedTuple, Optional, List, Tuple
+
+import numpy as np
 
 _COMMON_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "common"))
 if _COMMON_DIR not in sys.path:
     sys.path.insert(0, _COMMON_DIR)
 
 from CustomDateLocator import CustomDateLocator
-from VariousTimeDeque import VariousTimeDeque, Interval, MAXLEN
+from DateTicks import CachedDateFormatter
+from VariousTimeDeque import Interval, MAXLEN
 from CustomMail import send_mail
 from FuncLogger import FuncLogger
+from RingBuffer import RollupTimeDeque, local_datetime64
+from BinaryLog import STATUS_OK, BinaryLogReader, BinaryLogWriter
+from LogIndex import LogIndexWriter
+from LogQuery import read_range
+from MinuteLog import GAP_FIELD, MinuteLogWriter
+from RenderScheduler import RenderScheduler
+from SampleFormat import BINARY_TYPE, decode_binary
+from RenderWorker import RenderWorker, WorkerCanvasTkAgg
+from FigureLayout import FigureLayout
+from WidgetState import WidgetState
 from paths import bundle_path, writable_path
 
 flog = FuncLogger("flowtemp", "FlowTempPlotter")
 _LOG_DIR_NAME = "log_flowtemp"
-_LOG_LINE_RE = re.compile(
-    r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}): "
-    r"(-?\d+\.\d{2}), (-?\d+\.\d{2}), (-?\d+\.\d{2}), (-?\d+\.\d{2}), "
-    r"(-?\d+\.\d{2}), (-?\d+\.\d{2})$"
-)
+_RFM_PLOT_BUFFER_FILE = "plotbuf_flowtemp_rfm.bin"
+_DRC91C_PLOT_BUFFER_FILE = "plotbuf_flowtemp_drc91c.bin"
+WRITE_BINARY_LOG = True  # fixed-record DD.bin next to each DD.txt
+ALIGN_TO_CLOCK = True  # 1 min / 10 min / 1 h buckets on clock boundaries, one DD.txt line per minute
+OFFTHREAD_RENDER = False  # draw plot frames on a RenderWorker thread; the Tk thread only shows finished images
+X_MARGIN = 0.1  # fraction of the data range added on each side of the x axis
+Y_MARGIN = 0.5  # ... and of the y axes
+BACKFILL_GAP_SEC = 3  # last stored RFM sample older than this: catch up from the receiver's /Meas/since
+BACKFILL_LIMIT = 3600  # samples per catch-up request (1 h at 1 s); a longer gap takes several polls
+RFM_FIELDS = ('Tip', 'Shield', 'Bypass', 'Pumping')
+BINARY_GET_VALUE = True  # ask RFM /get_value for the struct-packed float64 sample (common/SampleFormat); older daemons still answer JSON
+X_TICK_FORMATS: Dict[Interval, str] = {
+    Interval.ONE_SECOND: "%H:%M:%S",
+    Interval.ONE_MINUTE: "%H:%M",
+    Interval.TEN_MINUTES: "%m-%d %H:%M",
+    Interval.ONE_HOUR: "%m-%d %H",
+}
+
+
+def padded_limits(low: float, high: float, margin: float) -> tuple:
+    """Axis limits for data in [low, high] with ``margin`` × range on each side (widened if the range is empty)."""
+    low, high = nonsingular(low, high, expander=0.05)
+    pad = (high - low) * margin
+    return low - pad, high + pad
+
+
+class PlotView(NamedTuple):
+    """What one plot frame shows, captured on the Tk thread so the render never reads Tk state."""
+
+    interval: Interval
+    time_rfm: np.ndarray  # local datetime64
+    data_rfm: np.ndarray
+    time_drc91c: np.ndarray
+    data_drc91c: np.ndarray
+    range_rfm: Optional[Tuple[np.ndarray, np.ndarray]]  # window min / max of [time, channels]
+    range_drc91c: Optional[Tuple[np.ndarray, np.ndarray]]
 
 
 class FlowTempPlotter:
@@ -45,22 +87,38 @@ class FlowTempPlotter:
         self.master: tk.Tk = master
         self.master.title("Flow & Temperature Plotter")
         self.master.bind("<Configure>", self.on_resize)
-        self.width: int = 800  # Default width
 
         self.rfm_localserver_port: int = _rfm_localserver_port
         self.drc91c_localserver_port: int = _drc91c_localserver_port
+        # RFM·DRC91C 수신기가 함께 쓰는 세션
+        self.http: requests.Session = requests.Session()
+        self.http.trust_env = False
+
+        self.render_scheduler: RenderScheduler = RenderScheduler(self.master, self._render_frame)
 
         # Create UI components
         self.create_widgets()
-
-        # Deques for storing values
-        self.rfm_deque: VariousTimeDeque = VariousTimeDeque(4)
-        self.drc91c_deque: VariousTimeDeque = VariousTimeDeque(2)
-
-        self.time_rfm_plot: Deque[datetime] = self.rfm_deque.get_time_deque(Interval.ONE_SECOND)
-        self.data_rfm_plot: List[Deque[float]] = self.rfm_deque.get_data_deque(Interval.ONE_SECOND)
-        self.time_drc91c_plot: Deque[datetime] = self.drc91c_deque.get_time_deque(Interval.ONE_SECOND)
-        self.data_drc91c_plot: List[Deque[float]] = self.drc91c_deque.get_data_deque(Interval.ONE_SECOND)
+        self.render_worker: Optional[RenderWorker] = (
+            RenderWorker(self.master, self.canvas, self.update_plot, log=flog.error) if OFFTHREAD_RENDER else None
+        )
+
+        # Ring buffers for storing values, memory-mapped so a restart resumes instantly
+        self.rfm_deque: RollupTimeDeque = RollupTimeDeque(
+            4, storage_path=writable_path(_RFM_PLOT_BUFFER_FILE), aligned=ALIGN_TO_CLOCK
+        )
+        self.drc91c_deque: RollupTimeDeque = RollupTimeDeque(
+            2, storage_path=writable_path(_DRC91C_PLOT_BUFFER_FILE), aligned=ALIGN_TO_CLOCK
+        )
+        self._bucket_times: Dict[Interval, Optional[float]] = {}
+        # 1 min buckets opened by backfilled RFM samples (time, RFM values) until main_loop logs them
+        self._backfilled_minutes: List[Tuple[datetime, List[float]]] = []
+        self.backfill_lock: threading.Lock = threading.Lock()
+
+        self._refresh_plot_buffers()
+        # Channels: RFM 0-3, DRC91C 0-1 (same order as the text log)
+        self.binary_log: BinaryLogWriter = BinaryLogWriter(writable_path(_LOG_DIR_NAME), 6, calibrated=False)
+        self.log_index: LogIndexWriter = LogIndexWriter()
+        self.minute_log: MinuteLogWriter = MinuteLogWriter(("",) * 6)
 
         self.rfm_status_code: str = "Off"
         self.drc91c_status_code: str = "Off"
@@ -69,14 +127,14 @@ class FlowTempPlotter:
 
         flog.info("FlowTempPlotter started")
 
-        loaded_count = self._load_history_from_logs()
-        if loaded_count > 0:
-            flog.info(f"Restored {loaded_count} log record(s) into plot buffers")
-        self._ensure_live_sample_after_history_load()
+        self._restore_plot_buffers()
 
         self.update_interval(None)
-        if len(self.time_rfm_plot) > 2:
-            self.update_plot()
+        if len(self.plot_view.time_rfm) > 2:
+            self._render_frame()
+        if self.render_worker is not None:
+            self.render_worker.start()
+        self.render_scheduler.start()
         self.main_loop()
 
     def create_widgets(self):
@@ -89,10 +147,10 @@ class FlowTempPlotter:
         self.enable_rfm = tk.IntVar()
         self.enable_drc91c = tk.IntVar()
 
-        self.checkbox_rfm = tk.Checkbutton(self.top_frame, text="Enable RFM", variable=self.enable_rfm, command=self.update_plot)
+        self.checkbox_rfm = tk.Checkbutton(self.top_frame, text="Enable RFM", variable=self.enable_rfm, command=self.render_scheduler.request)
         self.checkbox_rfm.pack(side=tk.LEFT)
 
-        self.checkbox_drc91c = tk.Checkbutton(self.top_frame, text="Enable DRC91C", variable=self.enable_drc91c, command=self.update_plot)
+        self.checkbox_drc91c = tk.Checkbutton(self.top_frame, text="Enable DRC91C", variable=self.enable_drc91c, command=self.render_scheduler.request)
         self.checkbox_drc91c.pack(side=tk.LEFT)
 
         self.interval_label = tk.Label(self.top_frame, text="Interval:")
@@ -100,6 +158,7 @@ class FlowTempPlotter:
 
         self.interval_combo = ttk.Combobox(self.top_frame, values=["1 s", "1 min", "10 min", "1 hour"])
         self.interval_combo.current(0)  # Default to 1 s
+        self.plot_interval: Interval = Interval.ONE_SECOND  # fetch_data용 사본
         self.interval_combo.pack(side=tk.LEFT)
         self.interval_combo.bind("<<ComboboxSelected>>", self.update_interval)
 
@@ -109,8 +168,10 @@ class FlowTempPlotter:
 
         # Left canvas for plotting
         self.figure, self.ax = plt.subplots()
-        self.canvas = FigureCanvasTkAgg(self.figure, master=self.bottom_frame)
+        self.canvas = WorkerCanvasTkAgg(self.figure, master=self.bottom_frame)
         self.canvas.get_tk_widget().grid(row=0, column=0, sticky='nsew')
+        self.figure_layout: FigureLayout = FigureLayout(self.master, self.figure, self._resize_settled)
+        self._x_tickers: Dict[Interval, tuple] = {}  # (locator, formatter), reused across redraws
 
         self.ax2 = self.ax.twinx()
 
@@ -121,6 +182,7 @@ class FlowTempPlotter:
         # Data frame
         self.data_frame = tk.Frame(self.right_frame)
         self.data_frame.pack(side=tk.TOP, fill=tk.Y)
+        self.widget_state: WidgetState = WidgetState()  # labels are configured only when their text changes
 
         self.tip_data_label = self.create_value_labels("• Tip", "L/min", self.data_frame, 0)
         self.shield_data_label = self.create_value_labels("• Shield", "L/min", self.data_frame, 1)
@@ -168,25 +230,19 @@ class FlowTempPlotter:
         Args:
             event (tk.Event): The resize event.
         """
-        self.last_width = self.width
-        self.width = event.width
-        if self.last_width != self.width:
+        self.figure_layout.configure(event)
+
+    def _resize_settled(self) -> None:
+        """Called by ``figure_layout`` once the window width has stopped changing."""
+        if self.render_worker is not None:
+            self.render_worker.call(self.resize_figure)
+        else:
             self.resize_figure()
+        self.render_scheduler.request()
 
     def resize_figure(self):
-        """Resize the figure based on the current window width."""
-        new_font_size = max(8, self.width // 75)  # Adjust the divisor as needed
-
-        plt.rcParams.update({
-            'font.size': new_font_size,
-            'axes.labelsize': new_font_size,
-            'axes.titlesize': new_font_size,
-            'xtick.labelsize': new_font_size * 0.8,
-            'ytick.labelsize': new_font_size * 0.8,
-            'legend.fontsize': new_font_size * 0.9,
-        })
-
-        self.figure.tight_layout(pad=1.0)
+        """Apply the width-dependent font sizes and the (cached) layout to the figure."""
+        self.figure_layout.relayout()
 
     def update_interval(self, event: Optional[tk.Event]):
         """Update the interval for data plotting.
@@ -194,15 +250,45 @@ class FlowTempPlotter:
         Args:
             event (Optional[tk.Event]): The event triggering the update.
         """
-        interval = self.get_interval()
-        self.time_rfm_plot = self.rfm_deque.get_time_deque(interval)
-        self.data_rfm_plot = self.rfm_deque.get_data_deque(interval)
-        self.time_drc91c_plot = self.drc91c_deque.get_time_deque(interval)
-        self.data_drc91c_plot = self.drc91c_deque.get_data_deque(interval)
+        self.plot_interval = self.get_interval()
+        self._refresh_plot_buffers()
 
-        if len(self.time_rfm_plot) <= 2:
+        if len(self.plot_view.time_rfm) <= 2:
             return
-        self.update_plot()
+        self.render_scheduler.request()
+
+    def _refresh_plot_buffers(self) -> PlotView:
+        """Copy the selected interval out of both ring buffers for the next frame (Tk thread).
+
+        The interval is read here too, so a frame drawn on the render worker
+        touches no Tk widget.
+
+        Returns:
+            PlotView: The frame's data, also kept as ``plot_view``.
+        """
+        interval = self.get_interval()
+        rfm_times, rfm_data = self.rfm_deque.snapshot(interval)
+        drc91c_times, drc91c_data = self.drc91c_deque.snapshot(interval)
+        # Read after the snapshots, so the axis limits cover every plotted sample (and at most one newer)
+        self.plot_view = PlotView(
+            interval,
+            local_datetime64(rfm_times), rfm_data,
+            local_datetime64(drc91c_times), drc91c_data,
+            self.rfm_deque.window_ranges(interval), self.drc91c_deque.window_ranges(interval),
+        )
+        return self.plot_view
+
+    def _bucket_opened(self, interval: Interval) -> bool:
+        """True once for each new RFM ``interval`` bucket (the first check only records the current one).
+
+        Aligned buckets are stamped with their clock boundary, before the
+        sample that opened them, so the bucket time cannot be compared to now.
+        """
+        times = self.rfm_deque.get_time_deque(interval)
+        last = times[-1] if len(times) > 0 else None
+        opened = interval in self._bucket_times and last != self._bucket_times[interval]
+        self._bucket_times[interval] = last
+        return opened and last is not None
 
     def main_loop(self):
         """Main loop for updating the application state."""
@@ -211,21 +297,20 @@ class FlowTempPlotter:
         self.update_display()
 
         expected_exc_delay = 0.2
-        if (len(self.rfm_deque.time_1s) > 0 and
-                loop_start_time - self.rfm_deque.get_last_time().timestamp() < expected_exc_delay):
-            if self.get_interval() == Interval.ONE_SECOND:
-                self.update_plot()
 
-        if (len(self.rfm_deque.time_1min) > 0 and
-                loop_start_time - self.rfm_deque.get_last_1min_time().timestamp() < expected_exc_delay):
+        with self.backfill_lock:
+            backfilled_until = self._log_backfilled_minutes()
+            minute_opened = self._bucket_opened(Interval.ONE_MINUTE)
+        if minute_opened:
             if self.get_interval() == Interval.ONE_MINUTE:
-                self.update_plot()
-            self.save_log(self.rfm_deque.get_last_1min_time(), self.rfm_deque.get_last_data(), self.drc91c_deque.get_last_data())
+                self.render_scheduler.request()
+            if self.rfm_deque.get_last_1min_time() != backfilled_until:
+                self.save_log(self.rfm_deque.get_last_1min_time(), self.rfm_deque.get_last_data(),
+                              self.drc91c_deque.get_last_data())
 
-        if (len(self.rfm_deque.time_10min) > 0 and
-                loop_start_time - self.rfm_deque.get_last_10min_time().timestamp() < expected_exc_delay):
+        if self._bucket_opened(Interval.TEN_MINUTES):
             if self.get_interval() == Interval.TEN_MINUTES:
-                self.update_plot()
+                self.render_scheduler.request()
             GOOD_STATUS = "200"
             idle_statuses = ("Off", "Connecting")
             if (
@@ -265,10 +350,9 @@ class FlowTempPlotter:
                         f"Temperature controller disconnect alert email failed: {error_msg}"
                     )
 
-        if (len(self.rfm_deque.time_1hour) > 0 and
-                loop_start_time - self.rfm_deque.get_last_1hour_time().timestamp() < expected_exc_delay):
+        if self._bucket_opened(Interval.ONE_HOUR):
             if self.get_interval() == Interval.ONE_HOUR:
-                self.update_plot()
+                self.render_scheduler.request()
 
         loop_end_time = time.time()
         execution_time = loop_end_time - loop_start_time
@@ -339,7 +423,11 @@ class FlowTempPlotter:
             self.rfm_status_code = 'Off'
             return [0, 0, 0, 0]
         try:
-            response = requests.get(f"http://127.0.0.1:{self.rfm_localserver_port}/get_value", timeout=1)
+            response = self.http.get(
+                f"http://127.0.0.1:{self.rfm_localserver_port}/get_value",
+                headers={'Accept': BINARY_TYPE} if BINARY_GET_VALUE else None,
+                timeout=1,
+            )
             self.rfm_status_code = str(response.status_code)
             if response.status_code != 200:
                 self._log_status_change(
@@ -350,9 +438,16 @@ class FlowTempPlotter:
                 )
                 return [0, 0, 0, 0]
 
-            json = response.json()
+            if response.headers.get('Content-Type') == BINARY_TYPE:
+                _, timestamp, values = decode_binary(response.content)
+                if len(values) != len(RFM_FIELDS):
+                    raise ValueError(f"RFM sent {len(values)} values, expected {len(RFM_FIELDS)}")
+                json = None
+            else:
+                json = response.json()
+                timestamp = json['timestamp']
 
-            if time.time() - json['timestamp'] > 5:
+            if time.time() - timestamp > 5:
                 self.rfm_status_code = 'DataTooOld'
                 self._log_status_change(
                     "RFM",
@@ -363,8 +458,7 @@ class FlowTempPlotter:
                 )
                 return [0, 0, 0, 0]
 
-            list_of_str = [json['Tip'], json['Shield'], json['Bypass'], json['Pumping']]
-            result = [float(x) for x in list_of_str]
+            result = list(values) if json is None else [float(json[field]) for field in RFM_FIELDS]
             self._log_status_change(
                 "RFM",
                 self.rfm_status_code,
@@ -426,7 +520,7 @@ class FlowTempPlotter:
             self.drc91c_status_code = 'Off'
             return [0, 0]
         try:
-            response = requests.get(f"http://127.0.0.1:{self.drc91c_localserver_port}/sensor_pair", timeout=1)
+            response = self.http.get(f"http://127.0.0.1:{self.drc91c_localserver_port}/sensor_pair", timeout=1)
             self.drc91c_status_code = str(response.status_code)
             if response.status_code != 200:
                 self._log_status_change(
@@ -503,14 +597,81 @@ class FlowTempPlotter:
             )
         return [0, 0]
 
+    def backfill_rfm(self, since: Optional[float] = None) -> bool:
+        """Store the RFM samples read since the last one stored, if that is ``BACKFILL_GAP_SEC`` old.
+
+        Covers a stalled fetch thread, slow replies and restarts: the receiver
+        keeps its recent samples and returns the newer ones (at most one per
+        second) in one reply. Receiver and plotter share the clock (localhost).
+        The 1 min buckets the samples open are queued for ``main_loop`` to log,
+        without DRC91C values: the temperature controller keeps no history.
+
+        Args:
+            since (Optional[float]): Epoch the restored buffers end at, for the
+                start-up catch-up; that is part of the restore, like the logs,
+                so it runs with RFM disabled too. None continues from the last sample.
+
+        Returns:
+            bool: True if samples were stored, so this poll needs no ``/get_value``.
+        """
+        if since is None:
+            if self.enable_rfm.get() == 0:
+                return False
+            since = self.rfm_deque.get_last_time().timestamp()
+        if time.time() - since < BACKFILL_GAP_SEC:
+            return False
+        try:
+            response = self.http.get(
+                f"http://127.0.0.1:{self.rfm_localserver_port}/Meas/since",
+                params={'ts': since, 'limit': BACKFILL_LIMIT, 'step': 1},
+                timeout=1,
+            )
+            if response.status_code != 200:
+                return False
+            samples = response.json()['samples']
+            rows = [([float(sample[field]) for field in RFM_FIELDS], sample['timestamp']) for sample in samples]
+        except (requests.exceptions.RequestException, ValueError, TypeError, KeyError) as e:
+            flog.caution(f"RFM backfill failed: {e}")
+            return False
+        deque = self.rfm_deque
+        # main_loop takes the lock too, so it sees either none or all of these samples and their minutes
+        with self.backfill_lock:
+            for values, timestamp in rows:
+                bucket = deque.get_last_1min_time()
+                deque.update_data(values, timestamp)
+                if deque.get_last_1min_time() != bucket:
+                    self._backfilled_minutes.append((deque.get_last_1min_time(), deque.get_last_data()))
+        if rows:
+            flog.info(f"RFM backfilled {len(rows)} samples after a {time.time() - since:.0f} s gap")
+        return bool(rows)
+
+    def _log_backfilled_minutes(self) -> Optional[datetime]:
+        """Write the 1 min buckets opened by backfilled RFM samples, oldest first, with DRC91C missing.
+
+        Called by ``main_loop`` with ``backfill_lock`` held, so the log is
+        written on the Tk thread and in time order.
+
+        Returns:
+            Optional[datetime]: The newest bucket written, or None if none were queued.
+        """
+        minutes, self._backfilled_minutes = self._backfilled_minutes, []
+        for minute_time, rfm_data in minutes:
+            self.save_log(minute_time, rfm_data, None)
+        return minutes[-1][0] if minutes else None
+
     def fetch_data(self):
         """Fetch data from RFM and DRC91C devices."""
-        values_rfm = self.get_data_from_rfm()
-        self.rfm_deque.update_data(values_rfm, time.time())
+        if not self.backfill_rfm():
+            values_rfm = self.get_data_from_rfm()
+            self.rfm_deque.update_data(values_rfm, time.time())
 
         values_drc91c = self.get_data_from_drc91c()
         self.drc91c_deque.update_data(values_drc91c, time.time())
 
+        # Only the 1 s view changes with every sample; the others redraw when a bucket opens
+        if self.plot_interval == Interval.ONE_SECOND:
+            self.render_scheduler.request()
+
     def get_interval(self) -> Interval:
         """Get the current interval for data plotting.
 
@@ -545,19 +706,40 @@ class FlowTempPlotter:
 
     def update_display(self):
         """Update the display with the latest data."""
-        self.tip_data_label.config(text=f": {self.rfm_deque.get_last_data()[0]:.2f} L/min")
-        self.shield_data_label.config(text=f": {self.rfm_deque.get_last_data()[1]:.2f} L/min")
-        self.bypass_data_label.config(text=f": {self.rfm_deque.get_last_data()[2]:.2f} L/min")
-        self.pumping_data_label.config(text=f": {self.rfm_deque.get_last_data()[3]:.2f} L/min")
-        self.head_data_label.config(text=f": {self.drc91c_deque.get_last_data()[0]:.2f} K")
-        self.cold_tip_data_label.config(text=f": {self.drc91c_deque.get_last_data()[1]:.2f} K")
-        self.current_time_label.config(text=f": {datetime.now().strftime('%H:%M:%S')}")
-        self.rfm_status_label.config(text=f"{': Connected' if self.rfm_status_code == '200' else self.make_error_sentence(self.rfm_status_code)}")
-        self.drc91c_status_label.config(text=f"{': Connected' if self.drc91c_status_code == '200' else self.make_error_sentence(self.drc91c_status_code)}")
-
-    def update_plot(self):
-        """Update the plot with the latest data."""
-        if len(self.time_rfm_plot) <= 2:
+        state = self.widget_state
+        # Each deque's values are read and formatted once per sample (the generation is read before the data)
+        if state.changed("rfm", self.rfm_deque.generation):
+            tip, shield, bypass, pumping = self.rfm_deque.get_last_data()
+            state.set(self.tip_data_label, text=f": {tip:.2f} L/min")
+            state.set(self.shield_data_label, text=f": {shield:.2f} L/min")
+            state.set(self.bypass_data_label, text=f": {bypass:.2f} L/min")
+            state.set(self.pumping_data_label, text=f": {pumping:.2f} L/min")
+        if state.changed("drc91c", self.drc91c_deque.generation):
+            head, cold_tip = self.drc91c_deque.get_last_data()
+            state.set(self.head_data_label, text=f": {head:.2f} K")
+            state.set(self.cold_tip_data_label, text=f": {cold_tip:.2f} K")
+        state.set(self.current_time_label, text=f": {datetime.now().strftime('%H:%M:%S')}")
+        state.set(self.rfm_status_label, text=f"{': Connected' if self.rfm_status_code == '200' else self.make_error_sentence(self.rfm_status_code)}")
+        state.set(self.drc91c_status_label, text=f"{': Connected' if self.drc91c_status_code == '200' else self.make_error_sentence(self.drc91c_status_code)}")
+
+    def _render_frame(self):
+        """RenderScheduler callback: capture the frame's view, then draw it here or on the render worker."""
+        view = self._refresh_plot_buffers()
+        if self.render_worker is not None:
+            self.render_worker.request(view)
+        else:
+            self.update_plot(view)
+
+    def update_plot(self, view: Optional[PlotView]):
+        """Update the plot with the data captured in ``view``.
+
+        Runs on the render worker when there is one, so it reads nothing but
+        ``view`` and the figure.
+
+        Args:
+            view (Optional[PlotView]): The frame to draw (``None`` before the first).
+        """
+        if view is None or len(view.time_rfm) <= 2:
             return
 
         self.ax.clear()
@@ -565,13 +747,13 @@ class FlowTempPlotter:
 
         marker_size = 3
 
-        self.ax.plot(self.time_rfm_plot, self.data_rfm_plot[0], marker='o', color='green', label="Tip", markersize=marker_size)
-        self.ax.plot(self.time_rfm_plot, self.data_rfm_plot[1], marker='o', color='blue', label="Shield", markersize=marker_size)
-        self.ax.plot(self.time_rfm_plot, self.data_rfm_plot[2], marker='o', color='purple', label="Bypass", markersize=marker_size)
-        self.ax.plot(self.time_rfm_plot, self.data_rfm_plot[3], marker='o', color='skyblue', label="Pumping", markersize=marker_size)
+        self.ax.plot(view.time_rfm, view.data_rfm[0], marker='o', color='green', label="Tip", markersize=marker_size)
+        self.ax.plot(view.time_rfm, view.data_rfm[1], marker='o', color='blue', label="Shield", markersize=marker_size)
+        self.ax.plot(view.time_rfm, view.data_rfm[2], marker='o', color='purple', label="Bypass", markersize=marker_size)
+        self.ax.plot(view.time_rfm, view.data_rfm[3], marker='o', color='skyblue', label="Pumping", markersize=marker_size)
 
-        self.ax2.plot(self.time_drc91c_plot, self.data_drc91c_plot[0], marker='o', color='red', label="Head", markersize=marker_size)
-        self.ax2.plot(self.time_drc91c_plot, self.data_drc91c_plot[1], marker='o', color='orange', label="Cold Tip", markersize=marker_size)
+        self.ax2.plot(view.time_drc91c, view.data_drc91c[0], marker='o', color='red', label="Head", markersize=marker_size)
+        self.ax2.plot(view.time_drc91c, view.data_drc91c[1], marker='o', color='orange', label="Cold Tip", markersize=marker_size)
 
         ax2_color = 'red'
 
@@ -590,13 +772,7 @@ class FlowTempPlotter:
         # ax2의 y축 색상을 변경
         self.ax2.tick_params(axis='y', colors=ax2_color)
 
-        self.ax.relim()
-        # y축 최소값을 0으로 설정
-        if self.ax.get_ylim()[0] < 0:
-            self.ax.set_ylim(bottom=0)  # RFM Plot의 y축 최소값을 0으로 설정
-        if self.ax2.get_ylim()[0] < 0:
-            self.ax2.set_ylim(bottom=0)  # DRC91C Plot의 y축 최소값을 0으로 설정 (필요한 경우)
-        self.ax.autoscale_view()
+        self.set_axes_limits(view)
 
         self.ax.legend(loc='lower left')  # RFM Plot의 legend를 오른쪽 위로 이동
         self.ax2.legend(loc='lower right')  # DRC91C Plot의 legend를 오른쪽 중앙으로 이동
@@ -606,36 +782,44 @@ class FlowTempPlotter:
             label.set_rotation(30)  # 30도 회전
             label.set_horizontalalignment('right')  # 오른쪽 정렬
 
-        self.update_xformatter(self.get_interval())
-        self.set_axes_margin()
+        self.update_xformatter(view.interval)
+        self.figure_layout.apply_fonts()
         self.canvas.draw()
 
-    def set_axes_margin(self):
-        """Set margins for the axes."""
-        self.ax.margins(x=0.1, y=0.5)
-        self.ax2.margins(x=0.1, y=0.5)
+    def set_axes_limits(self, view: PlotView):
+        """Set the axis limits from the deques' window ranges plus margins.
+
+        The ring buffers keep the window min / max of every channel as samples
+        arrive, so no plotted data is rescanned (``relim`` / ``autoscale_view``).
+        The y axes start at 0 at the lowest.
+
+        Args:
+            view (PlotView): The frame being drawn.
+        """
+        ranges = [r for r in (view.range_rfm, view.range_drc91c) if r is not None]
+        x_min = min(low[0] for low, _ in ranges)
+        x_max = max(high[0] for _, high in ranges)
+        self.ax.set_xlim(*local_datetime64(np.array(padded_limits(x_min, x_max, X_MARGIN))))
+        for ax, axis_range in ((self.ax, view.range_rfm), (self.ax2, view.range_drc91c)):
+            if axis_range is not None:
+                low, high = axis_range
+                bottom, top = padded_limits(low[1:].min(), high[1:].max(), Y_MARGIN)
+                ax.set_ylim(max(0.0, bottom), top)
 
     def update_xformatter(self, interval: Interval):
         """Update the x-axis formatter based on the interval.
 
         Args:
             interval (Interval): The interval.
+
+        The locator and formatter are created once per interval; both cache
+        their results, so unchanged views cost no tick computation.
         """
-        def format_date(x, pos=None):
-            date = mdates.num2date(x)
-            if interval == Interval.ONE_SECOND:
-                return date.strftime("%H:%M:%S")
-            elif interval == Interval.ONE_MINUTE:
-                return date.strftime("%H:%M")
-            elif interval == Interval.TEN_MINUTES:
-                return date.strftime("%m-%d %H:%M")
-            elif interval == Interval.ONE_HOUR:
-                return date.strftime("%m-%d %H")
-            else:
+        if interval not in self._x_tickers:
+            if interval not in X_TICK_FORMATS:
                 raise ValueError("Invalid interval")
-
-        locator = CustomDateLocator(interval)
-        formatter = ticker.FuncFormatter(format_date)
+            self._x_tickers[interval] = (CustomDateLocator(interval), CachedDateFormatter(X_TICK_FORMATS[interval]))
+        locator, formatter = self._x_tickers[interval]
 
         self.ax.xaxis.set_major_locator(locator)
         self.ax.xaxis.set_major_formatter(formatter)
@@ -646,55 +830,48 @@ class FlowTempPlotter:
         """Longest time window (N * T) across all interval buffers."""
         return MAXLEN * max(interval.value for interval in Interval)
 
-    def _iter_log_file_paths(self, oldest: datetime):
-        """Yield daily log file paths from ``oldest`` through today."""
-        log_dir = writable_path(_LOG_DIR_NAME)
-        if not os.path.isdir(log_dir):
-            return
-
-        current_day = oldest.date()
-        end_day = datetime.now().date()
-        one_day = timedelta(days=1)
-
-        while current_day <= end_day:
-            path = os.path.join(
-                log_dir,
-                f"{current_day.year:04d}",
-                f"{current_day.month:02d}",
-                f"{current_day.day:02d}.txt",
-            )
-            if os.path.isfile(path):
-                yield path
-            current_day += one_day
-
-    def _parse_log_records(self, since: datetime) -> list[tuple[datetime, list[float], list[float]]]:
-        """Read log files and return (time, rfm, drc91c) samples sorted by time."""
-        records: list[tuple[datetime, list[float], list[float]]] = []
-
-        for path in self._iter_log_file_paths(since):
-            try:
-                with open(path, "r", encoding="utf-8") as log_file:
-                    for line in log_file:
-                        match = _LOG_LINE_RE.match(line.strip())
-                        if not match:
-                            continue
+    def _parse_log_records(
+        self, since: datetime, until: Optional[datetime] = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Read text log files → (epoch times, samples (n, 6): RFM 0-3, DRC91C 0-1) in ``[since, until)``."""
+        try:
+            return read_range("flowtemp", since, until, log_dir=writable_path(_LOG_DIR_NAME))
+        except OSError as e:
+            flog.error(f"Failed to read data log: {e}")
+            return np.empty(0), np.empty((0, 6))
 
-                        dt = datetime.strptime(match.group(1), "%Y-%m-%d %H:%M:%S")
-                        if dt < since:
-                            continue
+    def _read_binary_log(self, since: datetime, until: datetime) -> Optional[np.ndarray]:
+        """Binary data log records in ``[since, until)`` (raw = RFM 0-3, DRC91C 0-1)."""
+        try:
+            return BinaryLogReader(writable_path(_LOG_DIR_NAME)).read(since, until)
+        except (OSError, ValueError) as e:
+            flog.error(f"Failed to read binary data log: {e}")
+            return None
 
-                        rfm = [float(match.group(i)) for i in range(2, 6)]
-                        drc = [float(match.group(i)) for i in range(6, 8)]
-                        records.append((dt, rfm, drc))
-            except OSError as e:
-                flog.error(f"Failed to read data log {path}: {e}")
+    def _restore_plot_buffers(self) -> None:
+        """Fill the plot buffers from the memory-mapped files or the logs, then catch up from the RFM receiver.
 
-        records.sort(key=lambda item: item[0])
-        return records
+        The catch-up starts at the newest stored RFM sample (read before
+        trimming, which drops the 1 s window after a long shutdown), so it runs
+        before the placeholder samples of ``_ensure_live_sample_after_history_load``.
+        """
+        if self.rfm_deque.restored and self.drc91c_deque.restored:
+            stored_until = self.rfm_deque.newest_time()
+            self.rfm_deque.trim()
+            self.drc91c_deque.trim()
+            flog.info("Restored plot buffers from memory-mapped files")
+        else:
+            loaded_count = self._load_history_from_logs()
+            if loaded_count > 0:
+                flog.info(f"Restored {loaded_count} log record(s) into plot buffers")
+            stored_until = self.rfm_deque.newest_time()
+        if stored_until is not None:
+            self.backfill_rfm(since=stored_until)
+        self._ensure_live_sample_after_history_load()
 
     def _ensure_live_sample_after_history_load(self) -> None:
         """Ensure 1 s buffers have a sample for display and fetch updates."""
-        if len(self.rfm_deque.time_1s) == 0:
+        if len(self.rfm_deque.get_time_deque(Interval.ONE_SECOND)) == 0:
             for interval in (Interval.ONE_MINUTE, Interval.TEN_MINUTES, Interval.ONE_HOUR):
                 data_deques = self.rfm_deque.get_data_deque(interval)
                 if len(data_deques[0]) > 0:
@@ -704,7 +881,7 @@ class FlowTempPlotter:
             else:
                 self.rfm_deque.update_data([0] * 4, time.time())
 
-        if len(self.drc91c_deque.time_1s) == 0:
+        if len(self.drc91c_deque.get_time_deque(Interval.ONE_SECOND)) == 0:
             for interval in (Interval.ONE_MINUTE, Interval.TEN_MINUTES, Interval.ONE_HOUR):
                 data_deques = self.drc91c_deque.get_data_deque(interval)
                 if len(data_deques[0]) > 0:
@@ -718,24 +895,35 @@ class FlowTempPlotter:
         """Restore deque buffers from log files within each buffer's N*T window."""
         now = datetime.now()
         since = now - timedelta(seconds=self._history_lookback_seconds())
-        records = self._parse_log_records(since)
-        if not records:
+        rows = self._read_binary_log(since, now + timedelta(seconds=1))
+        # Text logs only for the stretch written before binary logging started
+        text_until = None if rows is None else datetime.fromtimestamp(rows["time"][0])
+        times, values = self._parse_log_records(since, until=text_until)
+        if rows is not None:
+            times = np.concatenate([times, rows["time"]])
+            values = np.concatenate([values, rows["raw"]])
+        if len(times) == 0:
             return 0
 
-        rfm_records = [(dt, rfm) for dt, rfm, _drc in records]
-        drc_records = [(dt, drc) for dt, _rfm, drc in records]
-        self.rfm_deque.load_historical(rfm_records, reference_time=now)
-        self.drc91c_deque.load_historical(drc_records, reference_time=now)
-        return len(records)
+        self.rfm_deque.load_historical_arrays(times, values[:, :4], reference_time=now)
+        # Minutes backfilled from the RFM history have no DRC91C values
+        drc91c = values[:, 4:]
+        measured = ~np.isnan(drc91c).any(axis=1)
+        self.drc91c_deque.load_historical_arrays(times[measured], drc91c[measured], reference_time=now)
+        return len(times)
 
-    def save_log(self, time: datetime, rfm_data: List[float], drc91c_data: List[float]):
+    def save_log(self, time: datetime, rfm_data: List[float], drc91c_data: Optional[List[float]]):
         """Save the log data to a file.
 
         Args:
             time (datetime): The timestamp of the log entry.
             rfm_data (List[float]): The RFM data to log.
-            drc91c_data (List[float]): The DRC91C data to log.
+            drc91c_data (Optional[List[float]]): The DRC91C data to log, or None
+                for a minute backfilled from the RFM history. Its columns are then
+                logged as missing: dashes in the text log, NaN in the binary log,
+                left out of the sidecar statistics.
         """
+        values = list(rfm_data) + (list(drc91c_data) if drc91c_data is not None else [math.nan] * 2)
         year = time.strftime('%Y')
         month = time.strftime('%m')
         day = time.strftime('%d')
@@ -745,12 +933,37 @@ class FlowTempPlotter:
 
         log_file_path = os.path.join(year_month_dir, f"{day}.txt")
 
-        with open(log_file_path, "a", encoding="utf-8") as f:
-            f.write(
-                f"{time.strftime('%Y-%m-%d %H:%M:%S')}: "
-                f"{rfm_data[0]:.2f}, {rfm_data[1]:.2f}, {rfm_data[2]:.2f}, {rfm_data[3]:.2f}, "
-                f"{drc91c_data[0]:.2f}, {drc91c_data[1]:.2f}\n"
-            )
+        if ALIGN_TO_CLOCK:
+            offset = self.minute_log.append(log_file_path, time, values)
+            if offset is None:
+                return  # this minute is already logged
+        else:
+            offset = os.path.getsize(log_file_path) if os.path.exists(log_file_path) else 0
+            with open(log_file_path, "a", encoding="utf-8") as f:
+                fields = ", ".join(GAP_FIELD if math.isnan(value) else f"{value:.2f}" for value in values)
+                f.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')}: {fields}\n")
+
+        try:
+            logged = [round(value, 2) for value in values]
+            self.log_index.record(log_file_path, offset, time, logged)
+        except (OSError, ValueError) as e:
+            flog.error(f"Failed to update data log index: {e}")
+
+        if WRITE_BINARY_LOG:
+            # Status bit 0: RFM, bit 1: DRC91C not delivering good data.
+            # A backfilled minute holds RFM history (good reads) and no DRC91C reading.
+            status = STATUS_OK
+            if drc91c_data is None:
+                status |= 2
+            else:
+                if self.rfm_status_code != "200":
+                    status |= 1
+                if self.drc91c_status_code != "200":
+                    status |= 2
+            try:
+                self.binary_log.append(time, values, status=status)
+            except (OSError, ValueError) as e:
+                flog.error(f"Failed to write binary data log: {e}")
 
     def _on_close(self) -> None:
         """Handle window close: clean up matplotlib then force-exit.
@@ -761,6 +974,14 @@ class FlowTempPlotter:
         PyInstaller --noconsole builds).  os._exit() then bypasses the rest of
         Python's shutdown sequence entirely, guaranteeing the process exits.
         """
+        self.render_scheduler.stop()
+        flog.info(f"Plot frames: {self.render_scheduler.counts()}")
+        if self.render_worker is not None:
+            self.render_worker.stop()
+            flog.info(f"Render worker frames: {self.render_worker.counts()}")
+        self.rfm_deque.flush()
+        self.drc91c_deque.flush()
+        self.http.close()
         plt.close('all')
         self.master.destroy()
         os._exit(0)
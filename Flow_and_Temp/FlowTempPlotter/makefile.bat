@@ -1 +1 @@
-python -m PyInstaller --onefile --noconsole -n=FlowTempPlotter --icon=.\FlowTempPlotter.ico --add-data "FlowTempPlotter.ico;." --paths=..\..\common --hidden-import=FuncLogger --hidden-import=paths .\FlowTempPlotter.py
+python -m PyInstaller --onefile --noconsole -n=FlowTempPlotter --icon=.\FlowTempPlotter.ico --add-data "FlowTempPlotter.ico;." --paths=..\..\common --hidden-import=FuncLogger --hidden-import=paths --hidden-import=RingBuffer --hidden-import=BinaryLog --hidden-import=LogParser --hidden-import=LogIndex --hidden-import=LogQuery --hidden-import=MinuteLog --hidden-import=RenderScheduler --hidden-import=RenderWorker --hidden-import=FigureLayout --hidden-import=DateTicks --hidden-import=WidgetState --hidden-import=SampleFormat .\FlowTempPlotter.py
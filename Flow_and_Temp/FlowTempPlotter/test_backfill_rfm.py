@@ -0,0 +1,97 @@
+"""
+Restart catch-up of the RFM flows: the backfilled minutes are logged without DRC91C temperatures.
+
+Run with pytest from this directory.
+"""
+
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "common"))
+
+import FlowTempPlotter as M
+from BinaryLog import BinaryLogReader, BinaryLogWriter
+from LogIndex import LogIndexWriter, load_summary
+from MinuteLog import GAP_FIELD, MinuteLogWriter
+from RingBuffer import RollupTimeDeque
+
+
+class _Response:
+    status_code = 200
+
+    def __init__(self, samples):
+        self._samples = samples
+
+    def json(self):
+        return {"samples": self._samples, "more": False}
+
+
+class _Receiver:
+    """Stands in for the HTTP session: RFM ``/Meas/since`` returns the samples newer than ``ts``."""
+
+    def __init__(self, timestamps):
+        self.timestamps = timestamps
+
+    def get(self, url, params=None, timeout=None):
+        assert url.endswith("/Meas/since")
+        samples = [t for t in self.timestamps if t > params["ts"]][:params["limit"]]
+        return _Response([{**{field: 1.5 for field in M.RFM_FIELDS}, "timestamp": t} for t in samples])
+
+
+class _SilentLog:
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+def test_backfilled_minutes_do_not_carry_the_current_temperature(monkeypatch, tmp_path):
+    monkeypatch.setattr(M, "writable_path", lambda *parts: os.path.join(str(tmp_path), *parts))
+    monkeypatch.setattr(M, "flog", _SilentLog())
+    start = (int(time.time()) // 60 - 10) * 60
+    for name, channels in (("rfm.bin", 4), ("drc91c.bin", 2)):
+        stored = RollupTimeDeque(channels, storage_path=str(tmp_path / name), aligned=True)
+        stored.clear()
+        for second in range(30):
+            stored.update_data([1.0] * channels, start + second)
+        stored.flush()
+        del stored
+
+    plotter = M.FlowTempPlotter.__new__(M.FlowTempPlotter)
+    plotter.rfm_deque = RollupTimeDeque(4, storage_path=str(tmp_path / "rfm.bin"), aligned=True)
+    plotter.drc91c_deque = RollupTimeDeque(2, storage_path=str(tmp_path / "drc91c.bin"), aligned=True)
+    plotter._backfilled_minutes = []
+    plotter.backfill_lock = M.threading.Lock()
+    plotter.binary_log = BinaryLogWriter(str(tmp_path / M._LOG_DIR_NAME), 6, calibrated=False)
+    plotter.log_index = LogIndexWriter()
+    plotter.minute_log = MinuteLogWriter(("",) * 6)
+    plotter.rfm_status_code = plotter.drc91c_status_code = "200"
+    plotter.rfm_localserver_port = 0
+    plotter.http = _Receiver([float(start + second) for second in range(210)])
+    plotter._restore_plot_buffers()
+    # The temperature controller is read again once the plotter runs
+    plotter.drc91c_deque.update_data([77.0, 40.0], time.time())
+
+    assert plotter._log_backfilled_minutes() == datetime.fromtimestamp(start + 180)
+
+    minutes = [start + 60, start + 120, start + 180]
+    rows = BinaryLogReader(str(tmp_path / M._LOG_DIR_NAME)).read(
+        datetime.fromtimestamp(start), datetime.fromtimestamp(start + 240))
+    assert rows["time"].tolist() == minutes
+    assert rows["raw"][:, :4].tolist() == [[1.5] * 4] * 3
+    assert np.isnan(rows["raw"][:, 4:]).all()
+    assert rows["status"].tolist() == [2] * 3  # DRC91C missing, RFM good
+    for minute in minutes:
+        stamp = datetime.fromtimestamp(minute)
+        log_path = os.path.join(str(tmp_path), M._LOG_DIR_NAME, stamp.strftime("%Y"), stamp.strftime("%m"),
+                                f"{stamp.strftime('%d')}.txt")
+        with open(log_path, encoding="utf-8") as f:
+            line = next(line for line in f if line.startswith(stamp.strftime("%Y-%m-%d %H:%M:%S")))
+        assert line.rstrip().endswith(f"000001.50, {GAP_FIELD}, {GAP_FIELD}")
+    # No temperature in the sidecar statistics either
+    summary = load_summary(log_path)
+    assert summary.missing[4:] == [summary.rows] * 2
+    assert np.isnan(summary.maximum[4:]).all()
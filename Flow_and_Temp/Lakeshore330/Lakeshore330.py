@@ -3,7 +3,8 @@ import json
 import atexit
 import os
 import sys
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+import threading
 import time
 
 _COMMON_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "common"))
@@ -12,6 +13,7 @@ if _COMMON_DIR not in sys.path:
 
 from FuncLogger import FuncLogger
 from paths import writable_path
+from ReceiverHTTP import KeepAliveHandler
 
 flog = FuncLogger("flowtemp", "Lakeshore330")
 
@@ -46,22 +48,21 @@ class Lakeshore330:
         tip_temp = tip_temp + " K"
         return head_temp, tip_temp
 
-class SensorHandler(BaseHTTPRequestHandler):
+class SensorHandler(KeepAliveHandler):
     lakeshore = None  # 전역 변수로 Lakeshore330 인스턴스를 저장할 변수
+    device_lock = threading.Lock()  # 연결마다 스레드가 따로 돌므로 GPIB 요청은 한 번에 하나씩
 
     def do_GET(self):
         if self.path == '/sensor_pair':
             try:
-                valueA, valueB = self.lakeshore.get_sensor_value_pair()
+                with self.device_lock:
+                    valueA, valueB = self.lakeshore.get_sensor_value_pair()
                 response = {
                     'valueA': valueA,
                     'valueB': valueB,
                     'timestamp': time.time()
                 }
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps(response).encode())
+                self.send_json(response)
             except Exception as e:
                 flog.error(f"sensor_pair handler error: {e}")
                 self.send_error(500, str(e))
@@ -92,7 +93,7 @@ if __name__ == '__main__':
     # Lakeshore330 인스턴스를 핸들러 클래스의 클래스 변수로 설정
     SensorHandler.lakeshore = Lakeshore330(device_address)
 
-    server = HTTPServer(('0.0.0.0', port), SensorHandler)
+    server = ThreadingHTTPServer(('0.0.0.0', port), SensorHandler)
     print(f'Server running on port {port}')
     flog.info(f"HTTP server started on port {port}")
     try:
@@ -7,7 +7,7 @@ import threading
 import time
 import tkinter as tk
 from datetime import datetime
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from http.server import ThreadingHTTPServer
 
 import numpy as np
 
@@ -18,9 +18,11 @@ if _COMMON_DIR not in sys.path:
 from channel import ChannelName
 from FuncLogger import FuncLogger
 from paths import bundle_path, writable_path
+from ReceiverHTTP import KeepAliveHandler
 from rfm_controller import COLUMNNUM, RFMController, ToggleState
 from rfm_errors import RFMError, RFMSerialTimeout
 from schedularwindow import SchedularWindow
+from WidgetState import CanvasScene, WidgetState
 
 flog = FuncLogger("flowtemp", "RFMdaemon")
 
@@ -86,6 +88,9 @@ class RFMApp:
         self.flowSetPointBkgColors = [COLOR_BLACK] * COLUMNNUM
         self.channelBkgColors = [COLOR_BLACK] * COLUMNNUM
         self.schedular_window = None
+        # Only changed texts, colours and button geometry are sent to Tk on each tick
+        self.widget_state = WidgetState()
+        self.flow_texts = [f"{0.0:.2f}"] * COLUMNNUM
         # Dedupe identical consecutive status lines (serial timeout spam).
         self._last_status_key = None
         self._status_line_count = 0
@@ -148,15 +153,6 @@ class RFMApp:
         level = "CAUTION" if isinstance(err, RFMSerialTimeout) else "ERROR"
         self.append_status(level, f"{title}: {err}")
 
-    # --- HTTP-facing properties (keep old attribute names for RFMHandler) ---
-    @property
-    def last_flow_values(self):
-        return self.ctrl.get_last_flow_values()
-
-    @property
-    def last_read_time(self):
-        return self.ctrl.get_last_read_time()
-
     def setup_ui(self):
         total_h = HEIGHT + STATUS_DEFAULT_HEIGHT
         self.master.geometry(f"{self.width}x{total_h}")
@@ -187,6 +183,7 @@ class RFMApp:
             highlightthickness=0,
         )
         self.canvas.pack(fill=tk.BOTH, expand=True)
+        self.scene = CanvasScene(self.canvas)
 
         status_bar = tk.Frame(self.status_frame, bg="#1a1a1a")
         status_bar.pack(fill=tk.BOTH, expand=True)
@@ -239,40 +236,48 @@ class RFMApp:
             resize_ratio_x = self.width / (COLUMNNUM * COLUMNWIDTH)
             resize_ratio_y = self.height / HEIGHT
             for i in range(COLUMNNUM):
-                self.switchs_toggle[i].place(
+                self.widget_state.place(
+                    self.switchs_toggle[i],
                     x=(SWITCH_XOFFSET + i * COLUMNWIDTH) * resize_ratio_x,
                     y=SWITCH_YOFFSET * resize_ratio_y,
                     width=SWITCH_WIDTH * resize_ratio_x,
                     height=SWITCH_HEIGHT * resize_ratio_y,
                 )
-            self.reset_button.place(
+            self.widget_state.place(
+                self.reset_button,
                 x=RESET_XOFFSET * resize_ratio_x,
                 y=RESET_YOFFSET * resize_ratio_y,
                 width=RESET_WIDTH * resize_ratio_x,
                 height=RESET_HEIGHT * resize_ratio_y,
             )
-            self.schedular_button.place(
+            self.widget_state.place(
+                self.schedular_button,
                 x=SCHEDULAR_XOFFSET * resize_ratio_x,
                 y=SCHEDULAR_YOFFSET * resize_ratio_y,
                 width=SCHEDULAR_WIDTH * resize_ratio_x,
                 height=SCHEDULAR_HEIGHT * resize_ratio_y,
             )
-            self.mini_toggle.place(
+            self.widget_state.place(
+                self.mini_toggle,
                 x=MINITOGGLE_XOFFSET * resize_ratio_x,
                 y=MINITOGGLE_YOFFSET * resize_ratio_y,
                 width=MINITOGGLE_WIDTH * resize_ratio_x,
                 height=MINITOGGLE_HEIGHT * resize_ratio_y,
             )
         else:
-            self.reset_button.place(x=RESET_XOFFSET, y=RESET_YOFFSET, width=RESET_WIDTH, height=RESET_HEIGHT)
-            self.schedular_button.place(
-                x=SCHEDULAR_XOFFSET, y=SCHEDULAR_YOFFSET, width=SCHEDULAR_WIDTH, height=SCHEDULAR_HEIGHT
+            self.widget_state.place(
+                self.reset_button, x=RESET_XOFFSET, y=RESET_YOFFSET, width=RESET_WIDTH, height=RESET_HEIGHT
+            )
+            self.widget_state.place(
+                self.schedular_button,
+                x=SCHEDULAR_XOFFSET, y=SCHEDULAR_YOFFSET, width=SCHEDULAR_WIDTH, height=SCHEDULAR_HEIGHT,
             )
-            self.mini_toggle.place(
-                x=MINITOGGLE_XOFFSET, y=MINITOGGLE_YOFFSET, width=MINITOGGLE_WIDTH, height=MINITOGGLE_HEIGHT
+            self.widget_state.place(
+                self.mini_toggle,
+                x=MINITOGGLE_XOFFSET, y=MINITOGGLE_YOFFSET, width=MINITOGGLE_WIDTH, height=MINITOGGLE_HEIGHT,
             )
             for btn in self.switchs_toggle:
-                btn.place_forget()
+                self.widget_state.place_forget(btn)
 
     def setup_bindings(self):
         self.master.bind("<Key>", self.key_pressed)
@@ -292,11 +297,12 @@ class RFMApp:
         self.master.after(UPDATE_INTERVAL_MS, self.main_loop)
 
     def update(self):
-        self.draw()
         if self.ctrl.consume_clear_status_dedupe():
             self.clear_status_dedupe()
         flow_values = self.ctrl.get_last_flow_values()
-        self.displayFlowValues([f"{x:.2f}" for x in flow_values])
+        if self.widget_state.changed("flow_values", flow_values):
+            self.flow_texts = [f"{x:.2f}" for x in flow_values]
+        self.draw()
         if self.schedular_window is not None:
             try:
                 self.ctrl.handle_schedular(
@@ -307,12 +313,15 @@ class RFMApp:
                 self.show_status_error(e, title="Schedular Error")
 
     def draw(self):
-        self.master.configure(bg=COLOR_BLACK)
-        self.control_frame.configure(bg=COLOR_BLACK)
+        self.widget_state.set(self.master, bg=COLOR_BLACK)
+        self.widget_state.set(self.control_frame, bg=COLOR_BLACK)
         self.width = max(self.control_frame.winfo_width(), 1)
         self.height = max(self.control_frame.winfo_height(), 1)
+        self.scene.begin()
         self.fillEntryBkgColor()
         self.displayTexts()
+        self.displayFlowValues(self.flow_texts)
+        self.scene.finish()
         self.place_buttons()
 
     def on_control_resize(self, event):
@@ -394,18 +403,17 @@ class RFMApp:
         self.schedular_window.show()
 
     def fillEntryBkgColor(self):
-        self.canvas.delete("all")
         if not self.mn:
             for i in range(COLUMNNUM):
                 x1 = (60 + i * COLUMNWIDTH) * self.width / (COLUMNNUM * COLUMNWIDTH)
                 y1 = 167 * self.height / HEIGHT
                 x2 = x1 + 160 * self.width / (COLUMNNUM * COLUMNWIDTH)
                 y2 = y1 + 18 * self.height / HEIGHT
-                self.canvas.create_rectangle(x1, y1, x2, y2, fill=self.flowSetPointBkgColors[i], outline="")
+                self.scene.rectangle(("setpoint_bkg", i), x1, y1, x2, y2, fill=self.flowSetPointBkgColors[i], outline="")
 
                 y1 = 337 * self.height / HEIGHT
                 y2 = y1 + 18 * self.height / HEIGHT
-                self.canvas.create_rectangle(x1, y1, x2, y2, fill=self.channelBkgColors[i], outline="")
+                self.scene.rectangle(("channel_bkg", i), x1, y1, x2, y2, fill=self.channelBkgColors[i], outline="")
 
     def displayTexts(self):
         COLUMNNAME = [
@@ -423,12 +431,13 @@ class RFMApp:
             font_size = int(FONT_SIZE * resize_ratio_tot)
             font = ("Calibri Light", font_size)
 
-            self.canvas.create_text(0, resize_ratio_y * 125, text=line, fill="white", font=font, anchor="w")
-            self.canvas.create_text(0, resize_ratio_y * 210, text=line, fill="white", font=font, anchor="w")
-            self.canvas.create_text(0, resize_ratio_y * 305, text=line, fill="white", font=font, anchor="w")
+            self.scene.text(("line", 0), 0, resize_ratio_y * 125, text=line, fill="white", font=font, anchor="w")
+            self.scene.text(("line", 1), 0, resize_ratio_y * 210, text=line, fill="white", font=font, anchor="w")
+            self.scene.text(("line", 2), 0, resize_ratio_y * 305, text=line, fill="white", font=font, anchor="w")
 
             for i in range(COLUMNNUM):
-                self.canvas.create_text(
+                self.scene.text(
+                    ("channel", i),
                     resize_ratio_x * (10 + i * COLUMNWIDTH),
                     resize_ratio_y * 20,
                     text=f"({COLUMNNAME[i]}) Ch  {c.channels[i].value}",
@@ -436,7 +445,8 @@ class RFMApp:
                     font=font,
                     anchor="w",
                 )
-                self.canvas.create_text(
+                self.scene.text(
+                    ("sensing", i),
                     resize_ratio_x * (10 + i * COLUMNWIDTH),
                     resize_ratio_y * 55,
                     text="Sensing Output",
@@ -444,7 +454,8 @@ class RFMApp:
                     font=font,
                     anchor="w",
                 )
-                self.canvas.create_text(
+                self.scene.text(
+                    ("setting_input", i),
                     resize_ratio_x * (10 + i * COLUMNWIDTH),
                     resize_ratio_y * 150,
                     text="Setting Input",
@@ -452,7 +463,8 @@ class RFMApp:
                     font=font,
                     anchor="w",
                 )
-                self.canvas.create_text(
+                self.scene.text(
+                    ("setpoint_input", i),
                     resize_ratio_x * (10 + i * COLUMNWIDTH),
                     resize_ratio_y * 175,
                     text=f"Input: {c.flowSetPoint_Entry[i]}",
@@ -460,7 +472,8 @@ class RFMApp:
                     font=font,
                     anchor="w",
                 )
-                self.canvas.create_text(
+                self.scene.text(
+                    ("setpoint", i),
                     resize_ratio_x * i * COLUMNWIDTH,
                     resize_ratio_y * 200,
                     text=f"  {c.flowSetPoints_Shown[i]}",
@@ -468,7 +481,8 @@ class RFMApp:
                     font=font,
                     anchor="w",
                 )
-                self.canvas.create_text(
+                self.scene.text(
+                    ("setting_channel", i),
                     resize_ratio_x * (10 + i * COLUMNWIDTH),
                     resize_ratio_y * 325,
                     text=f"Setting {COLUMNNAME[i]} Ch.",
@@ -476,7 +490,8 @@ class RFMApp:
                     font=font,
                     anchor="w",
                 )
-                self.canvas.create_text(
+                self.scene.text(
+                    ("channel_input", i),
                     resize_ratio_x * (10 + i * COLUMNWIDTH),
                     resize_ratio_y * 345,
                     text=f"Input: {c.channelsEntry[i]}",
@@ -487,7 +502,8 @@ class RFMApp:
         else:
             font = ("Calibri Light", FONT_SIZE)
             for i in range(COLUMNNUM):
-                self.canvas.create_text(
+                self.scene.text(
+                    ("channel", i),
                     10 + i * COLUMNWIDTH,
                     20,
                     text=f"({COLUMNNAME[i]}) Ch  {c.channels[i].value}",
@@ -495,7 +511,8 @@ class RFMApp:
                     font=font,
                     anchor="w",
                 )
-                self.canvas.create_text(
+                self.scene.text(
+                    ("sensing", i),
                     10 + i * COLUMNWIDTH,
                     55,
                     text="Sensing Output",
@@ -512,7 +529,8 @@ class RFMApp:
             font_size = int(FONT_SIZE * resize_ratio_tot)
             font = ("Calibri Light", font_size)
             for i in range(COLUMNNUM):
-                self.canvas.create_text(
+                self.scene.text(
+                    ("flow", i),
                     resize_ratio_x * (10 + i * COLUMNWIDTH),
                     resize_ratio_y * 80,
                     text=flowValues[i],
@@ -523,7 +541,8 @@ class RFMApp:
         else:
             font = ("Calibri Light", FONT_SIZE)
             for i in range(COLUMNNUM):
-                self.canvas.create_text(
+                self.scene.text(
+                    ("flow", i),
                     10 + i * COLUMNWIDTH,
                     80,
                     text=flowValues[i],
@@ -736,25 +755,20 @@ if __name__ == "__main__":
             config_file_path
         )
 
-    class RFMHandler(SimpleHTTPRequestHandler):
+    class RFMHandler(KeepAliveHandler):
         def do_GET(self):
-            if self.path == "/get_value":
+            path, _, query = self.path.partition("?")
+            if path == "/get_value":
                 if "rfmapp" not in globals() or rfmapp is None:
                     self.send_error(404, "Application not ready")
                     return
-
-                self.send_response(200)
-                self.send_header("Content-type", "application/json")
-                self.end_headers()
-
-                response = {
-                    "Tip": rfmapp.last_flow_values[0],
-                    "Shield": rfmapp.last_flow_values[1],
-                    "Bypass": rfmapp.last_flow_values[2],
-                    "Pumping": rfmapp.last_flow_values[3],
-                    "timestamp": rfmapp.last_read_time,
-                }
-                self.wfile.write(json.dumps(response).encode())
+                # One reference read: values and timestamp always come from the same frame
+                self.send_snapshot(rfmapp.ctrl.snapshot)
+            elif path == "/Meas/since":
+                if "rfmapp" not in globals() or rfmapp is None:
+                    self.send_error(404, "Application not ready")
+                    return
+                self.send_since(rfmapp.ctrl.history, query)
             else:
                 self.send_error(404)
 
@@ -800,7 +814,7 @@ if __name__ == "__main__":
 
     def run_server():
         try:
-            server = HTTPServer(("localhost", localserver_port), RFMHandler)
+            server = ThreadingHTTPServer(("localhost", localserver_port), RFMHandler)
             flog.info(f"HTTP server started on localhost:{localserver_port}")
             server.serve_forever()
         except Exception as e:
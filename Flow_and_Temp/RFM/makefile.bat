@@ -1 +1 @@
-python -m PyInstaller --onefile -n=MKS247Creceiver --icon=.\MFC.ico --add-data "MFC.ico;." --hidden-import=threading --hidden-import=http.server --hidden-import=socketserver --paths=..\..\common --hidden-import=FuncLogger --hidden-import=paths --hidden-import=rfm_controller --hidden-import=rfm_errors --hidden-import=RFMserial --hidden-import=channel --hidden-import=schedularwindow .\RFMdaemon.py
+python -m PyInstaller --onefile -n=MKS247Creceiver --icon=.\MFC.ico --add-data "MFC.ico;." --hidden-import=threading --hidden-import=http.server --hidden-import=socketserver --paths=..\..\common --hidden-import=FuncLogger --hidden-import=paths --hidden-import=rfm_controller --hidden-import=rfm_errors --hidden-import=RFMserial --hidden-import=channel --hidden-import=schedularwindow --hidden-import=WidgetState --hidden-import=ReceiverHTTP --hidden-import=SampleHistory --hidden-import=SampleFormat .\RFMdaemon.py
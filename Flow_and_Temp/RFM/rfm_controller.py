@@ -11,9 +11,13 @@ from RFMserial import RFMserial
 from channel import Channel, convert_int_to_channel
 from schedularwindow import Action
 from FuncLogger import FuncLogger
+from ReceiverHTTP import Snapshot
+from SampleHistory import SampleHistory
 from rfm_errors import RFMControllerError, RFMError, RFMSerialError, RFMSerialTimeout
 
 COLUMNNUM = 4
+# Column names as served over HTTP (/get_value, /Meas/since)
+FLOW_FIELDS: Final = ("Tip", "Shield", "Bypass", "Pumping")
 # (level, message) for the GUI status pane — levels: INFO / CAUTION / ERROR / CRITICAL
 UiEvent = Tuple[str, str]
 # Minimum seconds between reader-loop iterations (UI stays free; serial I/O is off-thread).
@@ -64,6 +68,9 @@ class RFMController:
         self._read_ok_count = 0
         self._read_log_every = 50  # avoid flooding flog
         self._ui_events: List[UiEvent] = []
+        # Every successful read, for /Meas/since catch-up by the plotter
+        self.history = SampleHistory(FLOW_FIELDS)
+        self._snapshot_sequence = 0
 
         self.flog.info(
             f"Controller init: port={port} serial_on={serial_on} "
@@ -156,6 +163,13 @@ class RFMController:
         with self._lock:
             return self.last_read_time
 
+    def _publish_snapshot(self) -> None:
+        """Replace ``snapshot`` (served at /get_value) with the current values. Holds _lock."""
+        record = dict(zip(FLOW_FIELDS, self.last_flow_values))
+        record["timestamp"] = self.last_read_time
+        self._snapshot_sequence += 1
+        self.snapshot = Snapshot.of(record, self._snapshot_sequence, self.last_flow_values)
+
     def consume_clear_status_dedupe(self) -> bool:
         """True once after a successful read (GUI may clear status-line dedupe)."""
         with self._lock:
@@ -232,6 +246,7 @@ class RFMController:
             self.channels = [Channel.CH_UNKNOWN] * COLUMNNUM
             self.channelsEntry = [""] * COLUMNNUM
             self.last_flow_values = [0.0] * COLUMNNUM
+            self._publish_snapshot()
         self.flog.info("Channel state reset")
 
     def get_time_in_min(self) -> int:
@@ -323,6 +338,8 @@ class RFMController:
                     flow_values[i] = 0.0
             self.last_read_time = time.time()
             self.last_flow_values = flow_values
+            self._publish_snapshot()
+            self.history.append(self.last_read_time, flow_values)
             self._read_ok_count += 1
             if self._read_ok_count == 1 or self._read_ok_count % self._read_log_every == 0:
                 self.flog.info(
@@ -3,7 +3,7 @@ import os
 import sys
 import threading
 import time
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from http.server import ThreadingHTTPServer
 from typing import Any, Optional
 
 import numpy as np
@@ -15,6 +15,8 @@ if _COMMON_DIR not in sys.path:
 
 from FuncLogger import FuncLogger
 from paths import writable_path
+from ReceiverHTTP import KeepAliveHandler, SampleStream, Snapshot
+from SampleHistory import SampleHistory
 
 flog = FuncLogger("pressurelevel", "ArduinoADCReceiver")
 
@@ -107,6 +109,13 @@ class SerialMediator:
         self.plant_volume: Optional[float] = None
         self.purifier_pressure: Optional[float] = None
         self.last_read_time = time.time()
+        # What /Meas serves: replaced as a whole per frame, so handlers never see a half-updated frame
+        self.sequence = 0
+        self.snapshot = Snapshot.of(self.measurement(), self.sequence, self.values())
+
+        # Every processed frame is pushed to /Meas/stream subscribers and kept for /Meas/since
+        self.stream = SampleStream()
+        self.history = SampleHistory(("P_st", "P_pl", "V_pl", "P_pur"), decimals=3)
 
         # Connection management
         self.is_running = True
@@ -133,6 +142,7 @@ class SerialMediator:
     def close_resources(self):
         """Safely close all resources."""
         self.is_running = False
+        self.stream.close()
         if self.arduino is not None and self.arduino.is_open:
             self.arduino.close()
 
@@ -183,10 +193,30 @@ class SerialMediator:
             self.update_measurement("purifier_pressure", P_pur_bit, self.cal_pressure_purifier)
 
             self.last_read_time = time.time()
+            self.sequence += 1
+            values = self.values()
+            self.snapshot = Snapshot.of(self.measurement(), self.sequence, values)
+            self.history.append(self.last_read_time, values)
+            if self.stream.subscribers:
+                self.stream.publish(self.snapshot.body)
 
         except ValueError as e:
             flog.caution(f"Error processing serial data: {e}")
 
+    def values(self) -> tuple[Optional[float], ...]:
+        """Latest filtered values in ``/Meas`` field order, unrounded."""
+        return (self.storage_pressure, self.plant_pressure, self.plant_volume, self.purifier_pressure)
+
+    def measurement(self) -> dict[str, Any]:
+        """Latest filtered values as a ``/Meas`` record; read the attributes on the serial thread only."""
+        return {
+            "P_st": None if self.storage_pressure is None else f"{self.storage_pressure:.3f}",
+            "P_pl": None if self.plant_pressure is None else f"{self.plant_pressure:.3f}",
+            "V_pl": None if self.plant_volume is None else f"{self.plant_volume:.3f}",
+            "P_pur": None if self.purifier_pressure is None else f"{self.purifier_pressure:.3f}",
+            "timestamp": self.last_read_time,
+        }
+
     def run(self) -> None:
         """Main loop for serial communication."""
         last_flush_time = time.time()
@@ -222,37 +252,37 @@ class SerialMediator:
                 time.sleep(self.reconnect_delay)
 
 
-def main():
-    config = load_config()
-    mediator = SerialMediator(config)
-    localserver_port = config["localserver_port"]
+def make_request_handler(mediator: SerialMediator) -> type[KeepAliveHandler]:
+    """HTTP handler class serving ``mediator``'s latest values at ``/Meas``, every frame at ``/Meas/stream``
+    and the recent frames at ``/Meas/since``."""
 
-    class SimpleHTTPRequestHandler(BaseHTTPRequestHandler):
+    class SimpleHTTPRequestHandler(KeepAliveHandler):
         def do_GET(self):
-            if self.path == "/Meas":
-                self.send_response(200)
-                self.send_header("Content-Type", "application/json")
-                self.end_headers()
-
-                data = {
-                    "P_st": None if mediator.storage_pressure is None else f"{mediator.storage_pressure:.3f}",
-                    "P_pl": None if mediator.plant_pressure is None else f"{mediator.plant_pressure:.3f}",
-                    "V_pl": None if mediator.plant_volume is None else f"{mediator.plant_volume:.3f}",
-                    "P_pur": None if mediator.purifier_pressure is None else f"{mediator.purifier_pressure:.3f}",
-                    "timestamp": mediator.last_read_time,
-                }
-
-                self.wfile.write(json.dumps(data).encode())
+            path, _, query = self.path.partition("?")
+            if path == "/Meas":
+                self.send_snapshot(mediator.snapshot)
+            elif path == "/Meas/stream":
+                self.send_event_stream(mediator.stream)
+            elif path == "/Meas/since":
+                self.send_since(mediator.history, query)
             else:
-                self.send_response(404)
-                self.end_headers()
+                self.send_error(404)
 
         def log_message(self, format, *args):
             return
 
+    return SimpleHTTPRequestHandler
+
+
+def main():
+    config = load_config()
+    mediator = SerialMediator(config)
+    localserver_port = config["localserver_port"]
+
     def run_simple_server():
         server_address = ("", localserver_port)
-        httpd = HTTPServer(server_address, SimpleHTTPRequestHandler)
+        # Threaded: each kept-alive plotter connection holds a handler thread
+        httpd = ThreadingHTTPServer(server_address, make_request_handler(mediator))
         print(f"[HTTP] Server started on localhost:{localserver_port}")
         flog.info(f"HTTP server started on localhost:{localserver_port}")
         httpd.serve_forever()
@@ -1 +1 @@
-python -m PyInstaller --onefile -n=ArduinoADCReceiver --icon=.\guage.ico --add-data "guage.ico;." --paths=..\..\common --hidden-import=FuncLogger --hidden-import=paths .\ArduinoADCReceiver.py
+python -m PyInstaller --onefile -n=ArduinoADCReceiver --icon=.\guage.ico --add-data "guage.ico;." --paths=..\..\common --hidden-import=FuncLogger --hidden-import=paths --hidden-import=ReceiverHTTP --hidden-import=SampleHistory --hidden-import=SampleFormat .\ArduinoADCReceiver.py
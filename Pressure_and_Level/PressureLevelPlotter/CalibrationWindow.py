@@ -123,10 +123,9 @@ class CalibrationWindow(tk.Toplevel):
             )
             return
 
-        self.plotter.calibrations[self.channel_index] = {
+        self.plotter.update_calibration(self.channel_index, {
             "orig1": orig1,
             "calib1": calib1,
             "orig2": orig2,
             "calib2": calib2,
-        }
-        self.plotter._save_config()
+        })
@@ -1,64 +1,39 @@
-import matplotlib.dates as mdates
-from matplotlib.ticker import Locator
-from datetime import timedelta
+import math
+from matplotlib.dates import AutoDateLocator
+from DateTicks import IntervalDateLocator, SECONDS_PER_DAY
 from VariousTimeDeque import Interval
 
-class CustomDateLocator(Locator):
+# (tick step, start alignment) in seconds
+_TICK_SPACING = {
+    Interval.ONE_SECOND: (20, 20),
+    Interval.ONE_MINUTE: (20 * 60, 20 * 60),
+    Interval.TEN_MINUTES: (120 * 60, 60 * 60),
+    Interval.ONE_HOUR: (10 * 3600, 10 * 3600),
+}
+MIN_SPAN_SECONDS = 5
+MAX_TICKS = 1000
+
+def _whole_seconds(value):
+    return math.floor(round(value * SECONDS_PER_DAY, 6))
+
+class CustomDateLocator(IntervalDateLocator):
     def __init__(self, interval: Interval):
         self.interval: Interval = interval
+        super().__init__(*_TICK_SPACING[interval])
 
-    def __call__(self):
+    def _compute(self, vmin, vmax):
         try:
-            vmin, vmax = self.axis.get_view_interval()
-
-            start = mdates.num2date(vmin).replace(microsecond=0, tzinfo=None)
-            end = mdates.num2date(vmax).replace(microsecond=0, tzinfo=None)
-            
-            # 시간 범위가 너무 짧은 경우 처리
-            time_diff = (end - start).total_seconds()
-            
-            if time_diff < 5:  # 5초 미만이면 기본 locator 사용
-                from matplotlib.dates import AutoDateLocator
+            # 시간 범위가 너무 짧거나 눈금이 너무 많으면 기본 locator 사용
+            span = _whole_seconds(vmax) - _whole_seconds(vmin)
+            if span < MIN_SPAN_SECONDS:
                 return AutoDateLocator().tick_values(vmin, vmax)
-            
-            if self.interval == Interval.ONE_SECOND:
-                start = start.replace(second=start.second - start.second % 20)
-            elif self.interval == Interval.ONE_MINUTE:
-                start = start.replace(minute=start.minute - start.minute % 20, second=0)
-            elif self.interval == Interval.TEN_MINUTES:
-                start = start.replace(minute=start.minute - start.minute % 120, second=0)
-            elif self.interval == Interval.ONE_HOUR:
-                start = start.replace(hour=start.hour - start.hour % 10, minute=0, second=0)
-            
-            dates = []
-            current = start
-            max_iterations = 1000  # 무한 루프 방지
-            iteration_count = 0
-            
-            while current <= end and iteration_count < max_iterations:
-                dates.append(current)
-                iteration_count += 1
-                
-                if self.interval == Interval.ONE_SECOND:
-                    current += timedelta(seconds=20)
-                elif self.interval == Interval.ONE_MINUTE:
-                    current += timedelta(minutes=20)
-                elif self.interval == Interval.TEN_MINUTES:
-                    current += timedelta(minutes=120)
-                elif self.interval == Interval.ONE_HOUR:
-                    current += timedelta(hours=10)
-            
-            if iteration_count >= max_iterations:
-                from matplotlib.dates import AutoDateLocator
+            ticks = super()._compute(vmin, vmax)
+            if len(ticks) >= MAX_TICKS:
                 return AutoDateLocator().tick_values(vmin, vmax)
-            
-            result = [mdates.date2num(date) for date in dates]
-            return result
-            
+            return ticks
         except Exception:
             # 에러 발생 시 기본 locator 사용
             try:
-                from matplotlib.dates import AutoDateLocator
                 return AutoDateLocator().tick_values(vmin, vmax)
             except Exception:
-                return []
\ No newline at end of file
+                return []
@@ -1,21 +1,20 @@
 from datetime import datetime, timedelta
 import json
+import math
 import os
-import re
 import sys
 import threading
 import time
 import tkinter as tk
 from tkinter import ttk
+from typing import NamedTuple, Optional, Tuple
+import numpy as np
 import requests
 
 # matplotlib 백엔드를 명시적으로 설정
 import matplotlib
 matplotlib.use('TkAgg')
-import matplotlib.dates as mdates
 import matplotlib.pyplot as plt
-from matplotlib import ticker
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 _COMMON_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "common"))
 if _COMMON_DIR not in sys.path:
@@ -23,21 +22,41 @@ if _COMMON_DIR not in sys.path:
 
 from CalibrationWindow import CalibrationWindow, CHANNEL_KEYS
 from CustomDateLocator import CustomDateLocator
+from DateTicks import CachedDateFormatter
 from PressureLevelSetting import PressureLevelSetting
-from VariousTimeDeque import VariousTimeDeque, Interval, MAXLEN
+from VariousTimeDeque import Interval, MAXLEN
 from CustomMail import send_mail
 from FuncLogger import FuncLogger
+from RingBuffer import CalibratedTimeDeque, local_datetime64
+from BinaryLog import STATUS_OK, BinaryLogReader, BinaryLogWriter
+from LogIndex import LogIndexWriter
+from LogQuery import read_range
+from MinuteLog import MinuteLogWriter
+from RenderScheduler import RenderScheduler
+from SampleFormat import BINARY_TYPE, decode_binary
+from RenderWorker import RenderWorker, WorkerCanvasTkAgg
+from FigureLayout import FigureLayout
+from WidgetState import WidgetState
 from paths import bundle_path, writable_path
 
 _LOG_DIR_NAME = "log_pressurelevel"
+_PLOT_BUFFER_FILE = "plotbuf_pressurelevel.bin"
 flog = FuncLogger("pressurelevel", "PressureLevelPlotter")
-_LOG_LINE_RE = re.compile(
-    r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}): "
-    r"(-?\d+\.\d{2}) L, (-?\d+\.\d{2}) psi, (-?\d+\.\d{2}) psi, (-?\d+\.\d{2}) psi$"
-)
 
 # 테스트 모드 설정 (True로 설정하면 시뮬레이션 데이터 사용)
 IS_TEST = False
+WRITE_BINARY_LOG = True  # fixed-record DD.bin next to each DD.txt
+ALIGN_TO_CLOCK = True  # 1 min / 10 min / 1 h buckets on clock boundaries, one DD.txt line per minute
+BLIT_X_HEADROOM = 0.1  # x room kept right of the data so frames blit until the window must move
+OFFTHREAD_RENDER = False  # draw plot frames on a RenderWorker thread; the Tk thread only shows finished images
+STREAM_SAMPLES = False  # subscribe to the receiver's /Meas/stream and store every frame (~2 Hz) instead of polling /Meas at 1 Hz
+STREAM_RETRY_SEC = 10  # while the stream is unavailable, poll for this long before subscribing again
+STREAM_READ_TIMEOUT = 5  # s without any event (the receiver sends a heartbeat every second) before reconnecting
+ARDUINO_URL = "http://127.0.0.1:5003"
+BACKFILL_GAP_SEC = 3  # last stored sample older than this: catch up from the receiver's /Meas/since
+BACKFILL_LIMIT = 3600  # samples per catch-up request (1 h at 1 s); a longer gap takes several polls
+ARDUINO_FIELDS = ('P_st', 'P_pl', 'V_pl', 'P_pur')
+BINARY_MEAS = True  # ask /Meas for the struct-packed float64 sample (common/SampleFormat); older receivers still answer JSON
 
 AUTO_RAISE_INTERVAL_SEC = 30 if IS_TEST else 30 * 60  # 30 s (test) / 30 min (production)
 
@@ -47,25 +66,88 @@ _CALIBRATION_DEFAULT = [
     for _ in range(4)
 ]
 
+PEAK_WIDTH = 4  # samples each side of a local max/min, also the moving-average half width
+PEAK_THRESHOLD = 0.1  # psi the smoothed window must span for its centre to count
+X_TICK_FORMATS = {
+    Interval.ONE_SECOND: "%H:%M:%S",
+    Interval.ONE_MINUTE: "%H:%M",
+    Interval.TEN_MINUTES: "%H:%M",
+    Interval.ONE_HOUR: "%m-%d %H:%M",
+}
+
+
+def local_extrema(data, width: int = PEAK_WIDTH, threshold: float = PEAK_THRESHOLD):
+    """Indices of the local maxima and minima of ``data`` after a moving average.
+
+    Each sample is averaged with up to ``width`` neighbours on each side (fewer
+    at the ends). An index in ``[width, n - width)`` is a peak (valley) when
+    its smoothed value is the max (min) of the ``2 * width + 1`` window around
+    it and that window spans more than ``threshold``. Returns two index arrays.
+    """
+    data = np.asarray(data, dtype=np.float64)
+    n = len(data)
+    if n < 2 * width + 1:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+
+    index = np.arange(n)
+    lo = np.maximum(index - width, 0)
+    hi = np.minimum(index + width + 1, n)
+    sums = np.concatenate(([0.0], np.cumsum(data)))
+    smooth = (sums[hi] - sums[lo]) / (hi - lo)
+
+    windows = np.lib.stride_tricks.sliding_window_view(smooth, 2 * width + 1)
+    high = windows.max(axis=1)
+    low = windows.min(axis=1)
+    centre = smooth[width:n - width]
+    wide = high - low > threshold
+    return np.flatnonzero((centre == high) & wide) + width, np.flatnonzero((centre == low) & wide) + width
+
+
+class PlotView(NamedTuple):
+    """What one plot frame shows, captured on the Tk thread so the render never reads Tk state."""
+
+    interval: Interval
+    is_plot: Tuple[bool, ...]
+    show_peaks: bool
+    key: tuple  # (interval, deque generation) the buffers were copied at
+    times: np.ndarray  # local datetime64
+    data: np.ndarray
+    calibrated: np.ndarray
+    time_range: Optional[np.ndarray]  # window min / max time, local datetime64
+    calibrated_max: Optional[np.ndarray]  # window max of each calibrated channel
+
 
 class PressureLevelPlotter:
     def __init__(self, master):
         self.master = master
         self.master.title("Pressure & Level Plotter")
         self.master.bind("<Configure>", self.on_resize)
-        self.width = 800  # Default width
+
+        # 플롯 다시 그리기는 프레임마다 최대 한 번
+        self.render_scheduler = RenderScheduler(self.master, self._render_frame)
 
         # Create UI components
         self.create_widgets()
-
-        # Deques for storing values
-        self.arduino_deque = VariousTimeDeque(4) # 0: P_st, 1: P_pl, 2: V_pl, 3: P_pr
-
-        self.time_arduino_plot = self.arduino_deque.get_time_deque(Interval.ONE_SECOND)
-        self.data_arduino_plot = self.arduino_deque.get_data_deque(Interval.ONE_SECOND)
+        self.render_worker = (
+            RenderWorker(self.master, self.canvas, self.safe_update_plot, log=flog.error) if OFFTHREAD_RENDER else None
+        )
+
+        # Ring buffers for storing values, memory-mapped so a restart resumes instantly.
+        # Raw channels 0: P_st, 1: P_pl, 2: V_pl, 3: P_pr, each with a calibrated copy.
+        self.arduino_deque = CalibratedTimeDeque(4, storage_path=writable_path(_PLOT_BUFFER_FILE), aligned=ALIGN_TO_CLOCK)
+        self._bucket_times = {}
+        # 1 min buckets opened by backfilled samples, as save_log arguments, until main_loop writes them
+        self._backfilled_minutes = []
+        self.backfill_lock = threading.Lock()
+        self.binary_log = BinaryLogWriter(writable_path(_LOG_DIR_NAME), 4)
+        self.log_index = LogIndexWriter()
+        self.minute_log = MinuteLogWriter((" L", " psi", " psi", " psi"))
 
         self.arduino_status_code = "Off"
         self._last_logged_arduino_status = None
+        # 수신기 폴링용 세션 (연결 재사용)
+        self.http = requests.Session()
+        self.http.trust_env = False
 
         # Email alert notification window (non-modal)
         self.email_alert_window = None
@@ -78,17 +160,19 @@ class PressureLevelPlotter:
         self.calibrations = _config["calibrations"]
         self.last_positions = _config["channel_order"]
         self.is_plot = _config["channel_visible"]
+        self._compile_calibration()
+        self._refresh_plot_buffers()
 
         flog.info("PressureLevelPlotter started")
 
-        loaded_count = self._load_history_from_logs()
-        if loaded_count > 0:
-            flog.info(f"Restored {loaded_count} log record(s) into plot buffers")
-        self._ensure_live_sample_after_history_load()
+        self._restore_plot_buffers()
 
         self.update_interval(None)
-        if len(self.time_arduino_plot) > 2:
-            self.update_plot()
+        if len(self.plot_view.times) > 2:
+            self._render_frame()
+        if self.render_worker is not None:
+            self.render_worker.start()
+        self.render_scheduler.start()
         self.main_loop()
 
     def create_widgets(self) -> None:
@@ -104,7 +188,7 @@ class PressureLevelPlotter:
         self.checkbox_arduino = tk.Checkbutton(self.top_frame, text="Enable Arduino", variable=self.enable_arduino, command=self.on_arduino_checkbox_change)
         self.checkbox_arduino.pack(side=tk.LEFT)
 
-        self.checkbox_localmaxmin = tk.Checkbutton(self.top_frame, text="Local Max/Min", variable=self.enable_localmaxmin, command=self.update_plot)
+        self.checkbox_localmaxmin = tk.Checkbutton(self.top_frame, text="Local Max/Min", variable=self.enable_localmaxmin, command=self.render_scheduler.request)
         self.checkbox_localmaxmin.pack(side=tk.LEFT)
 
         self.checkbox_auto_raise = tk.Checkbutton(self.top_frame, text="Auto Raise (30 min)", variable=self.enable_auto_raise)
@@ -115,6 +199,7 @@ class PressureLevelPlotter:
 
         self.interval_combo = ttk.Combobox(self.top_frame, values=["1 s", "1 min", "10 min", "1 hour"])
         self.interval_combo.current(0)  # Default to 1 s
+        self.plot_interval = Interval.ONE_SECOND  # 수집 스레드가 읽는 인터벌 (update_interval에서 갱신)
         self.interval_combo.pack(side=tk.LEFT)
         self.interval_combo.bind("<<ComboboxSelected>>", self.update_interval)
 
@@ -127,11 +212,26 @@ class PressureLevelPlotter:
 
         # Left canvas for plotting
         self.figure, self.ax = plt.subplots()
-        self.canvas = FigureCanvasTkAgg(self.figure, master=self.bottom_frame)
+        self.canvas = WorkerCanvasTkAgg(self.figure, master=self.bottom_frame)
         self.canvas.get_tk_widget().grid(row=0, column=0, sticky='nsew')
+        self.figure_layout = FigureLayout(self.master, self.figure, self._resize_settled)
 
         self.ax2: plt.Axes = self.ax.twinx()
 
+        # Retained plot state: data lines and peak markers are redrawn by blitting
+        self._plot_lines = []
+        self._peak_pool = []  # (value label, dashed line, time label) per marker, reused every frame
+        self._peak_count = 0
+        self._peak_specs = []
+        self._x_tickers = {}  # interval -> (locator, formatter), reused across redraws
+        self._extrema_key = None
+        self._extrema = None
+        self._plot_state = None
+        self._plot_xlim = None
+        self._plot_background = None
+        self._marker_background = None
+        self.canvas.mpl_connect("draw_event", self._on_canvas_draw)
+
         # Right frame for displaying values and status
         self.right_frame = tk.Frame(self.bottom_frame, width=150)  # Fixed width for right_frame
         self.right_frame.grid(row=0, column=1, sticky='nsew')
@@ -139,6 +239,7 @@ class PressureLevelPlotter:
         # Data frame
         self.data_frame = tk.Frame(self.right_frame)
         self.data_frame.pack(side=tk.TOP, fill=tk.Y)
+        self.widget_state = WidgetState()  # labels are configured only when their text changes
 
         self.label_name_unit_pairs: list[tuple[str, str]] = [
             ("• V_plant", "L"),
@@ -178,35 +279,65 @@ class PressureLevelPlotter:
         return [name_label, value_label]
 
     def on_resize(self, event):
-        # Get the new width of the window
-        self.last_width = self.width
-        self.width = event.width
-        if self.last_width != self.width:
+        self.figure_layout.configure(event)
+
+    def _resize_settled(self):
+        """Called by ``figure_layout`` once the window width has stopped changing."""
+        if self.render_worker is not None:
+            self.render_worker.call(self.resize_figure)
+        else:
             self.resize_figure()
+        self.render_scheduler.request()
 
     def resize_figure(self):
-        # Adjust font size based on the new width
-        new_font_size = max(8, self.width // 75)  # Adjust the divisor as needed
-
-        plt.rcParams.update({
-            'font.size': new_font_size,
-            'axes.labelsize': new_font_size,
-            'axes.titlesize': new_font_size,
-            'xtick.labelsize': new_font_size * 0.8,
-            'ytick.labelsize': new_font_size * 0.8,
-            'legend.fontsize': new_font_size * 0.9,
-        })
-
-        self.figure.tight_layout(pad=1.0)
+        self.figure_layout.relayout()
+        self._plot_state = None  # new font sizes apply to rebuilt ticks and legends
 
     def update_interval(self, event):
-        interval = self.get_interval()
-        self.time_arduino_plot = self.arduino_deque.get_time_deque(interval)
-        self.data_arduino_plot = self.arduino_deque.get_data_deque(interval)
+        self.plot_interval = self.get_interval()
+        self._refresh_plot_buffers()
 
-        if len(self.time_arduino_plot) <= 2:
+        if len(self.plot_view.times) <= 2:
             return
-        self.update_plot()
+        self.render_scheduler.request()
+
+    def _refresh_plot_buffers(self) -> PlotView:
+        """Copy the selected interval out of the ring buffer for the next frame (Tk thread).
+
+        The fetch thread keeps appending, so the plot works on a snapshot with
+        times converted to local ``datetime64`` for matplotlib. The interval,
+        channel visibility and the local max/min switch are read here too, so
+        a frame drawn on the render worker touches no Tk variable.
+        """
+        interval = self.get_interval()
+        # Read before the snapshot: the data is never older than the generation it is cached under
+        key = (interval, self.arduino_deque.generation)
+        times, data, calibrated = self.arduino_deque.calibrated_snapshot(interval)
+        # Window min / max of [time, calibrated channels], kept by the deque as samples arrive.
+        # Read after the snapshot, so the limits cover every plotted sample (and at most one newer).
+        ranges = self.arduino_deque.window_ranges(interval)
+        time_range = calibrated_max = None
+        if ranges is not None:
+            low, high = ranges
+            time_range = local_datetime64(np.array([low[0], high[0]]))
+            calibrated_max = high[1:]
+        self.plot_view = PlotView(
+            interval, tuple(self.is_plot), self.enable_localmaxmin.get() == 1, key,
+            local_datetime64(times), data, calibrated, time_range, calibrated_max,
+        )
+        return self.plot_view
+
+    def _bucket_opened(self, interval: Interval) -> bool:
+        """True once for each new ``interval`` bucket (the first check only records the current one).
+
+        Aligned buckets are stamped with their clock boundary, before the
+        sample that opened them, so the bucket time cannot be compared to now.
+        """
+        times = self.arduino_deque.get_time_deque(interval)
+        last = times[-1] if len(times) > 0 else None
+        opened = interval in self._bucket_times and last != self._bucket_times[interval]
+        self._bucket_times[interval] = last
+        return opened and last is not None
 
     def main_loop(self):
         loop_start_time = time.time()
@@ -221,21 +352,20 @@ class PressureLevelPlotter:
         self.update_display()
 
         expected_exc_delay = 0.2
-        if (len(self.arduino_deque.time_1s) > 0 and
-                loop_start_time - self.arduino_deque.get_last_time().timestamp() < expected_exc_delay):
-            if self.get_interval() == Interval.ONE_SECOND:
-                self.update_plot()
 
-        if (len(self.arduino_deque.time_1min) > 0 and
-                loop_start_time - self.arduino_deque.get_last_1min_time().timestamp() < expected_exc_delay):
+        with self.backfill_lock:
+            backfilled_until = self._log_backfilled_minutes()
+            minute_opened = self._bucket_opened(Interval.ONE_MINUTE)
+        if minute_opened:
             if self.get_interval() == Interval.ONE_MINUTE:
-                self.update_plot()
-            self.save_log(self.arduino_deque.get_last_1min_time(), self.arduino_deque.get_last_data())
+                self.render_scheduler.request()
+            if self.arduino_deque.get_last_1min_time() != backfilled_until:
+                self.save_log(self.arduino_deque.get_last_1min_time(), self.arduino_deque.get_last_data(),
+                              self.arduino_deque.get_last_calibrated())
 
-        if (len(self.arduino_deque.time_10min) > 0 and
-                loop_start_time - self.arduino_deque.get_last_10min_time().timestamp() < expected_exc_delay):
+        if self._bucket_opened(Interval.TEN_MINUTES):
             if self.get_interval() == Interval.TEN_MINUTES:
-                self.update_plot()
+                self.render_scheduler.request()
             # Arduino 상태 체크를 더 안전하게 (활성화되어 있을 때만)
             if (self.enable_arduino.get() == 1 and 
                 self.arduino_status_code != 200 and 
@@ -259,10 +389,10 @@ class PressureLevelPlotter:
             # 압력 체크를 더 안전하게 (활성화되어 있을 때만)
             if self.enable_arduino.get() == 1:
                 try:
-                    last_data = self.arduino_deque.get_last_data()
-                    if len(last_data) >= 4:
-                        p_plant = self.apply_calibration(1, last_data[1])
-                        p_storage = self.apply_calibration(0, last_data[0])
+                    last_calibrated = self.arduino_deque.get_last_calibrated()
+                    if len(last_calibrated) >= 4:
+                        p_plant = last_calibrated[1]
+                        p_storage = last_calibrated[0]
                         if p_plant > 3.0 or p_storage > 9.0:
                             now = datetime.now()
                             date_str = now.strftime("%Y-%m-%d %H:%M:%S")
@@ -300,10 +430,9 @@ class PressureLevelPlotter:
                 except (IndexError, TypeError) as e:
                     flog.error(f"Error checking pressure: {e}")
 
-        if (len(self.arduino_deque.time_1hour) > 0 and
-                loop_start_time - self.arduino_deque.get_last_1hour_time().timestamp() < expected_exc_delay):
+        if self._bucket_opened(Interval.ONE_HOUR):
             if self.get_interval() == Interval.ONE_HOUR:
-                self.update_plot()
+                self.render_scheduler.request()
 
         loop_end_time = time.time()
         execution_time = loop_end_time - loop_start_time
@@ -314,8 +443,16 @@ class PressureLevelPlotter:
         self.master.after(next_execution_delay, self.main_loop)
 
     def fetch_loop(self):
+        next_stream_time = 0.0
         while True:
             try:
+                if (STREAM_SAMPLES and not IS_TEST and self.enable_arduino.get() == 1
+                        and time.time() >= next_stream_time):
+                    # 구독 모드: 스트림이 끝나거나 끊기면 STREAM_RETRY_SEC 동안 1초 폴링으로 돌아간다
+                    self.follow_stream()
+                    next_stream_time = time.time() + STREAM_RETRY_SEC
+                    continue
+
                 loop_start_time = time.time()
 
                 # 항상 fetch_data를 호출하여 플롯 업데이트가 되도록 함
@@ -420,86 +557,80 @@ class PressureLevelPlotter:
         except Exception as e:
             flog.error(f"Failed to save plotter_config.json: {e}")
 
-    def apply_calibration(self, channel_index: int, raw: float) -> float:
-        cal = self.calibrations[channel_index]
-        orig1, calib1 = cal["orig1"], cal["calib1"]
-        orig2, calib2 = cal["orig2"], cal["calib2"]
-        if orig1 == orig2:
-            return raw
-        slope = (calib2 - calib1) / (orig2 - orig1)
-        return slope * raw + (calib1 - slope * orig1)
-
-    def reverse_calibration(self, channel_index: int, calibrated: float) -> float:
-        """Convert a logged (calibrated) value back to raw for deque storage."""
-        cal = self.calibrations[channel_index]
-        orig1, calib1 = cal["orig1"], cal["calib1"]
-        orig2, calib2 = cal["orig2"], cal["calib2"]
-        if orig1 == orig2:
-            return calibrated
-        slope = (calib2 - calib1) / (orig2 - orig1)
-        if slope == 0:
-            return calibrated
-        offset = calib1 - slope * orig1
-        return (calibrated - offset) / slope
+    def _compile_calibration(self) -> None:
+        """Turn ``self.calibrations`` into per-channel slope / offset arrays and recalibrate the deque once."""
+        orig1, calib1, orig2, calib2 = (
+            np.array([cal[key] for cal in self.calibrations], dtype=np.float64)
+            for key in ("orig1", "calib1", "orig2", "calib2")
+        )
+        degenerate = orig1 == orig2  # identity map
+        span = np.where(degenerate, 1.0, orig2 - orig1)
+        self._cal_slope = np.where(degenerate, 1.0, (calib2 - calib1) / span)
+        self._cal_offset = np.where(degenerate, 0.0, calib1 - self._cal_slope * orig1)
+        self.arduino_deque.set_calibration(self._cal_slope, self._cal_offset)
+
+    def update_calibration(self, channel_index: int, calibration: dict) -> None:
+        """
+        CalibrationWindow에서 적용한 캘리브레이션을 저장하고, 버퍼의 calibrated 값을 한 번 다시 계산합니다.
+        """
+        self.calibrations[channel_index] = calibration
+        self._compile_calibration()
+        self._save_config()
+        self.render_scheduler.request()
+
+    def reverse_calibration(self, channel_index, calibrated):
+        """Convert logged (calibrated) values back to raw for deque storage."""
+        slope = self._cal_slope[channel_index]
+        offset = self._cal_offset[channel_index]
+        flat = slope == 0
+        return np.where(flat, calibrated, (calibrated - offset) / np.where(flat, 1.0, slope))
 
     def _history_lookback_seconds(self) -> int:
         """Longest time window (N * T) across all interval buffers."""
         return MAXLEN * max(interval.value for interval in Interval)
 
-    def _iter_log_file_paths(self, oldest: datetime):
-        """Yield daily log file paths from ``oldest`` through today."""
-        log_dir = writable_path(_LOG_DIR_NAME)
-        if not os.path.isdir(log_dir):
-            return
-
-        current_day = oldest.date()
-        end_day = datetime.now().date()
-        one_day = timedelta(days=1)
-
-        while current_day <= end_day:
-            path = os.path.join(
-                log_dir,
-                f"{current_day.year:04d}",
-                f"{current_day.month:02d}",
-                f"{current_day.day:02d}.txt",
-            )
-            if os.path.isfile(path):
-                yield path
-            current_day += one_day
+    def _parse_log_records(
+        self, since: datetime, until: datetime | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Read text log files → (epoch times, raw deque samples (n, 4)) in ``[since, until)``."""
+        try:
+            times, logged = read_range("pressurelevel", since, until, log_dir=writable_path(_LOG_DIR_NAME))
+        except OSError as e:
+            flog.error(f"Failed to read data log: {e}")
+            return np.empty(0), np.empty((0, 4))
+
+        # Log order: V_pl, P_pl, P_st, P_pur → deque: P_st, P_pl, V_pl, P_pur
+        calibrated = logged[:, [2, 1, 0, 3]]
+        raw = self.reverse_calibration(np.arange(4), calibrated)
+        return times, raw.reshape(len(times), 4)
+
+    def _read_binary_log(self, since: datetime, until: datetime) -> np.ndarray | None:
+        """Binary data log records in ``[since, until)``; raw values need no reverse calibration."""
+        try:
+            return BinaryLogReader(writable_path(_LOG_DIR_NAME)).read(since, until)
+        except (OSError, ValueError) as e:
+            flog.error(f"Failed to read binary data log: {e}")
+            return None
 
-    def _parse_log_records(self, since: datetime) -> list[tuple[datetime, list[float]]]:
-        """Read log files and return raw deque samples sorted by time."""
-        records: list[tuple[datetime, list[float]]] = []
+    def _restore_plot_buffers(self) -> None:
+        """Fill the plot buffers from the memory-mapped file or the logs, then catch up from the receiver.
 
-        for path in self._iter_log_file_paths(since):
-            try:
-                with open(path, "r", encoding="utf-8") as log_file:
-                    for line in log_file:
-                        match = _LOG_LINE_RE.match(line.strip())
-                        if not match:
-                            continue
-
-                        dt = datetime.strptime(match.group(1), "%Y-%m-%d %H:%M:%S")
-                        if dt < since:
-                            continue
-
-                        v_pl = float(match.group(2))
-                        p_pl = float(match.group(3))
-                        p_st = float(match.group(4))
-                        p_pur = float(match.group(5))
-
-                        # Log order: V_pl, P_pl, P_st, P_pur → deque: P_st, P_pl, V_pl, P_pur
-                        calibrated = [p_st, p_pl, v_pl, p_pur]
-                        raw = [
-                            self.reverse_calibration(i, calibrated[i])
-                            for i in range(4)
-                        ]
-                        records.append((dt, raw))
-            except OSError as e:
-                flog.error(f"Failed to read data log {path}: {e}")
-
-        records.sort(key=lambda item: item[0])
-        return records
+        The catch-up starts at the newest stored sample (read before trimming,
+        which drops the 1 s window after a long shutdown), so it runs before
+        the placeholder sample of ``_ensure_live_sample_after_history_load``.
+        """
+        if self.arduino_deque.restored:
+            stored_until = self.arduino_deque.newest_time()
+            self.arduino_deque.trim()
+            flog.info(f"Restored plot buffers from {_PLOT_BUFFER_FILE}")
+        else:
+            loaded_count = self._load_history_from_logs()
+            if loaded_count > 0:
+                flog.info(f"Restored {loaded_count} log record(s) into plot buffers")
+            stored_until = self.arduino_deque.newest_time()
+        if stored_until is not None:
+            self.backfill(since=stored_until)
+        self._ensure_live_sample_after_history_load()
 
     def _ensure_live_sample_after_history_load(self) -> None:
         """Ensure the 1 s buffer has a sample for display and fetch updates.
@@ -507,7 +638,7 @@ class PressureLevelPlotter:
         Log restore may fill coarser buffers while the 1 s window (N×1 s) stays
         empty when the latest log entry is older than that window.
         """
-        if len(self.arduino_deque.time_1s) > 0:
+        if len(self.arduino_deque.get_time_deque(Interval.ONE_SECOND)) > 0:
             return
 
         for interval in (Interval.ONE_MINUTE, Interval.TEN_MINUTES, Interval.ONE_HOUR):
@@ -523,12 +654,18 @@ class PressureLevelPlotter:
         """Restore deque buffers from log files within each buffer's N*T window."""
         now = datetime.now()
         since = now - timedelta(seconds=self._history_lookback_seconds())
-        records = self._parse_log_records(since)
-        if not records:
+        rows = self._read_binary_log(since, now + timedelta(seconds=1))
+        # Text logs only for the stretch written before binary logging started
+        text_until = None if rows is None else datetime.fromtimestamp(rows["time"][0])
+        times, values = self._parse_log_records(since, until=text_until)
+        if rows is not None:
+            times = np.concatenate([times, rows["time"]])
+            values = np.concatenate([values, rows["raw"]])
+        if len(times) == 0:
             return 0
 
-        self.arduino_deque.load_historical(records, reference_time=now)
-        return len(records)
+        self.arduino_deque.load_historical_arrays(times, values, reference_time=now)
+        return len(times)
 
     def get_simulation_data(self):
         """테스트용 시뮬레이션 데이터 생성"""
@@ -607,7 +744,9 @@ class PressureLevelPlotter:
         # 실제 Arduino 데이터 가져오기 (기존 코드)
         try:
             # timeout을 더 길게 설정하여 연결 안정성 향상
-            response = requests.get("http://127.0.0.1:5003/Meas", timeout=3)
+            response = self.http.get(
+                f"{ARDUINO_URL}/Meas", headers={'Accept': BINARY_TYPE} if BINARY_MEAS else None, timeout=3
+            )
             self.arduino_status_code = response.status_code
 
             if response.status_code != 200:
@@ -616,39 +755,9 @@ class PressureLevelPlotter:
                 )
                 return [0, 0, 0, 0]
 
-            json_data = response.json()
-
-            # 타임스탬프 검증을 더 안전하게
-            if 'timestamp' not in json_data:
-                self.arduino_status_code = 'InvalidData'
-                self._log_arduino_status("Invalid Arduino data format (missing timestamp)")
-                return [0, 0, 0, 0]
-
-            if time.time() - json_data['timestamp'] > 5:
-                self.arduino_status_code = 'DataTooOld'
-                self._log_arduino_status("Arduino data is too old", level="caution")
-                return [0, 0, 0, 0]
-
-            # 데이터 파싱을 더 안전하게
-            required_fields = ['P_st', 'P_pl', 'V_pl', 'P_pur']
-            if not all(field in json_data for field in required_fields):
-                self.arduino_status_code = 'MissingData'
-                self._log_arduino_status("Arduino response missing required fields")
-                return [0, 0, 0, 0]
-
-            list_of_str = [json_data['P_st'], json_data['P_pl'], json_data['V_pl'], json_data['P_pur']]
-
-            # 문자열 파싱을 더 안전하게
-            try:
-                result = [float(x.split(' ')[0]) for x in list_of_str]
-                if self._last_logged_arduino_status != 200:
-                    flog.info("Arduino data fetch OK")
-                    self._last_logged_arduino_status = 200
-                return result
-            except (ValueError, IndexError) as e:
-                self.arduino_status_code = 'ParseError'
-                self._log_arduino_status(f"Arduino data parse error: {e}")
-                return [0, 0, 0, 0]
+            if response.headers.get('Content-Type') == BINARY_TYPE:
+                return self._parse_arduino_binary(response.content)
+            return self._parse_arduino_data(response.json())
 
         except requests.exceptions.ConnectionError as e:
             self.arduino_status_code = 'ConnectionError'
@@ -668,13 +777,169 @@ class PressureLevelPlotter:
 
         return [0, 0, 0, 0]
 
+    def _parse_arduino_data(self, json_data) -> list:
+        """Values from one ``/Meas`` reply or stream event; ``[0, 0, 0, 0]`` (and a status code) if unusable."""
+        # 타임스탬프 검증을 더 안전하게
+        if 'timestamp' not in json_data:
+            self.arduino_status_code = 'InvalidData'
+            self._log_arduino_status("Invalid Arduino data format (missing timestamp)")
+            return [0, 0, 0, 0]
+
+        if time.time() - json_data['timestamp'] > 5:
+            self.arduino_status_code = 'DataTooOld'
+            self._log_arduino_status("Arduino data is too old", level="caution")
+            return [0, 0, 0, 0]
+
+        # 데이터 파싱을 더 안전하게
+        if not all(field in json_data for field in ARDUINO_FIELDS):
+            self.arduino_status_code = 'MissingData'
+            self._log_arduino_status("Arduino response missing required fields")
+            return [0, 0, 0, 0]
+
+        # 문자열 파싱을 더 안전하게
+        try:
+            result = self._arduino_values(json_data)
+        except (ValueError, IndexError, AttributeError) as e:
+            self.arduino_status_code = 'ParseError'
+            self._log_arduino_status(f"Arduino data parse error: {e}")
+            return [0, 0, 0, 0]
+        return self._arduino_data_ok(result)
+
+    def _parse_arduino_binary(self, body: bytes) -> list:
+        """Values from a struct-packed ``/Meas`` reply, checked like :meth:`_parse_arduino_data`."""
+        try:
+            _, timestamp, values = decode_binary(body)
+        except ValueError as e:
+            self.arduino_status_code = 'InvalidData'
+            self._log_arduino_status(f"Invalid Arduino data format ({e})")
+            return [0, 0, 0, 0]
+
+        if time.time() - timestamp > 5:
+            self.arduino_status_code = 'DataTooOld'
+            self._log_arduino_status("Arduino data is too old", level="caution")
+            return [0, 0, 0, 0]
+
+        if len(values) != len(ARDUINO_FIELDS):
+            self.arduino_status_code = 'MissingData'
+            self._log_arduino_status(f"Arduino response has {len(values)} values, expected {len(ARDUINO_FIELDS)}")
+            return [0, 0, 0, 0]
+
+        # NaN: the receiver has no filtered value yet (null in the JSON record)
+        if any(math.isnan(value) for value in values):
+            self.arduino_status_code = 'ParseError'
+            self._log_arduino_status("Arduino data parse error: no value yet")
+            return [0, 0, 0, 0]
+        return self._arduino_data_ok(list(values))
+
+    def _arduino_data_ok(self, result: list) -> list:
+        self.arduino_status_code = 200
+        if self._last_logged_arduino_status != 200:
+            flog.info("Arduino data fetch OK")
+            self._last_logged_arduino_status = 200
+        return result
+
+    @staticmethod
+    def _arduino_values(json_data) -> list:
+        return [float(json_data[field].split(' ')[0]) for field in ARDUINO_FIELDS]
+
+    def backfill(self, since: Optional[float] = None) -> bool:
+        """Store the frames the receiver read since the last stored sample, if that is ``BACKFILL_GAP_SEC`` old.
+
+        Covers a stalled fetch thread, slow replies and restarts: the receiver
+        keeps its recent frames and returns the newer ones, at most one per
+        second, in one reply. Receiver and plotter share the clock (localhost).
+        At start-up ``since`` is where the restored buffers end; that catch-up
+        is part of the restore, like the logs, so it runs with Arduino
+        disabled too. The 1 min buckets the frames open are queued for
+        ``main_loop`` to log. True if frames were stored, so this poll needs
+        no ``/Meas``.
+        """
+        if IS_TEST:
+            return False
+        if since is None:
+            if self.enable_arduino.get() == 0:
+                return False
+            since = self.arduino_deque.get_last_time().timestamp()
+        if time.time() - since < BACKFILL_GAP_SEC:
+            return False
+        try:
+            response = self.http.get(
+                f"{ARDUINO_URL}/Meas/since",
+                params={'ts': since, 'limit': BACKFILL_LIMIT, 'step': 1},
+                timeout=3,
+            )
+            if response.status_code != 200:
+                return False
+            # Frames from before the filter had a value carry None; skip those
+            rows = [(self._arduino_values(sample), sample['timestamp'])
+                    for sample in response.json()['samples'] if None not in sample.values()]
+        except (requests.exceptions.RequestException, ValueError, AttributeError, KeyError) as e:
+            self._log_arduino_status(f"Arduino backfill failed: {e}", level="caution")
+            return False
+        deque = self.arduino_deque
+        # main_loop takes the lock too, so it sees either none or all of these samples and their minutes
+        with self.backfill_lock:
+            for values, timestamp in rows:
+                bucket = deque.get_last_1min_time()
+                deque.update_data(values, timestamp)
+                if deque.get_last_1min_time() != bucket:
+                    self._backfilled_minutes.append(
+                        (deque.get_last_1min_time(), deque.get_last_data(), deque.get_last_calibrated()))
+        if rows:
+            flog.info(f"Arduino backfilled {len(rows)} samples after a {time.time() - since:.0f} s gap")
+            if self.plot_interval == Interval.ONE_SECOND:
+                self.render_scheduler.request()
+        return bool(rows)
+
+    def _log_backfilled_minutes(self) -> Optional[datetime]:
+        """Write the 1 min buckets opened by backfilled frames, oldest first; returns the newest, if any.
+
+        Called by ``main_loop`` with ``backfill_lock`` held, so the log is
+        written on the Tk thread and in time order.
+        """
+        minutes, self._backfilled_minutes = self._backfilled_minutes, []
+        for minute in minutes:
+            self.save_log(*minute)
+        return minutes[-1][0] if minutes else None
+
+    def follow_stream(self) -> None:
+        """Store every frame pushed on the receiver's ``/Meas/stream`` until it ends, fails or Arduino is disabled."""
+        try:
+            with self.http.get(f"{ARDUINO_URL}/Meas/stream", stream=True, timeout=(1, STREAM_READ_TIMEOUT)) as response:
+                if response.status_code != 200:
+                    # Older receivers have no stream; keep polling
+                    self._log_arduino_status(f"Arduino stream unavailable: HTTP {response.status_code}", level="caution")
+                    return
+                last_sample = time.time()
+                for line in response.iter_lines(chunk_size=None):
+                    if self.enable_arduino.get() == 0:
+                        return
+                    if line.startswith(b"data:"):
+                        self.store_sample(self._parse_arduino_data(json.loads(line[5:])))
+                        last_sample = time.time()
+                    elif line.startswith(b":") and time.time() - last_sample >= 1:
+                        # Heartbeat without frames: the receiver is up but its serial side is silent.
+                        # Store a zero sample once a second, as polling /Meas would.
+                        self.arduino_status_code = 'DataTooOld'
+                        self._log_arduino_status("Arduino data is too old", level="caution")
+                        self.store_sample([0, 0, 0, 0])
+                        last_sample = time.time()
+        except requests.exceptions.RequestException as e:
+            self._log_arduino_status(f"Arduino stream interrupted: {e}", level="caution")
+        except ValueError as e:
+            self.arduino_status_code = 'ParseError'
+            self._log_arduino_status(f"Arduino stream parse error: {e}")
+
     def fetch_data(self):
-        values_arduino = self.get_data_from_arduino()
+        if not self.backfill():
+            self.store_sample(self.get_data_from_arduino())
+
+    def store_sample(self, values_arduino):
         self.arduino_deque.update_data(values_arduino, time.time())
 
-        # 샘플이 있으면 플롯 업데이트 (채널 수가 아니라 1s 버퍼 길이 기준)
-        if len(self.arduino_deque.time_1s) > 0:
-            self.master.after(0, self.safe_update_plot)
+        # 1 s 화면만 샘플마다 다시 그린다 (다른 인터벌은 새 버킷이 열릴 때 main_loop가 요청)
+        if self.plot_interval == Interval.ONE_SECOND:
+            self.render_scheduler.request()
 
     def get_interval(self):
         interval_str = self.interval_combo.get()
@@ -697,70 +962,101 @@ class PressureLevelPlotter:
 
     def update_display(self):
         data_order = [2, 1, 0, 3]
-        last_raw = self.arduino_deque.get_last_data()
-        for i, position in enumerate(self.last_positions):
-            self.name_labels[i].config(text=self.label_name_unit_pairs[position][0])
-            deque_ch = data_order[position]
-            calibrated = self.apply_calibration(deque_ch, last_raw[deque_ch])
-            self.value_labels[i].config(text=f": {calibrated:.2f} {self.label_name_unit_pairs[position][1]}")
-        self.current_time_label.config(text=f": {datetime.now().strftime('%H:%M:%S')}")
-        self.arduino_status_label.config(text=f"{': Connected' if self.arduino_status_code == 200 else self.make_error_sentence(self.arduino_status_code)}")
-
-    def update_plot(self):
-        # 더 강력한 데이터 검증
-        if not hasattr(self, 'time_arduino_plot') or not hasattr(self, 'data_arduino_plot'):
-            flog.error("Plot data is not initialized")
-            return
-
-        if len(self.time_arduino_plot) <= 2:
+        state = self.widget_state
+        # Values are formatted once per sample (the generation is read before the data)
+        if state.changed("values", (self.arduino_deque.generation, tuple(self.last_positions))):
+            last_calibrated = self.arduino_deque.get_last_calibrated()
+            for i, position in enumerate(self.last_positions):
+                name, unit = self.label_name_unit_pairs[position]
+                state.set(self.name_labels[i], text=name)
+                state.set(self.value_labels[i], text=f": {last_calibrated[data_order[position]]:.2f} {unit}")
+        state.set(self.current_time_label, text=f": {datetime.now().strftime('%H:%M:%S')}")
+        state.set(self.arduino_status_label, text=f"{': Connected' if self.arduino_status_code == 200 else self.make_error_sentence(self.arduino_status_code)}")
+
+    def update_plot(self, view: PlotView):
+        """Draw ``view`` (captured by ``_refresh_plot_buffers``); runs on the render worker when there is one."""
+        if len(view.times) <= 2:
             return
 
         # 데이터가 비어있는지 확인
-        if not self.data_arduino_plot or any(len(data) == 0 for data in self.data_arduino_plot):
+        if len(view.data) == 0 or any(len(data) == 0 for data in view.data):
             return
 
         # 데이터 길이 검증
-        if len(self.data_arduino_plot) < 4:
+        if len(view.data) < 4:
             flog.error("Data arrays are insufficient")
             return
 
         # 각 데이터 배열의 길이 검증
-        for i, data in enumerate(self.data_arduino_plot):
+        for i, data in enumerate(view.data):
             if len(data) == 0:
                 flog.error(f"Data array {i} is empty")
                 return
-            if len(data) != len(self.time_arduino_plot):
+            if len(data) != len(view.times):
                 flog.error(f"Data array {i} length mismatches time array")
                 return
 
+        # Calibrated copy kept next to the raw channels by the deque
+        channel_max = view.calibrated_max
+
+        # 안전한 max_pressure 계산 (calibrated, 활성화된 채널만 고려)
+        try:
+            pressure_channels = [ch for visible, ch in zip(view.is_plot[1:], (1, 0, 3)) if visible]
+            if pressure_channels:
+                max_pressure = max(10, float(channel_max[pressure_channels].max()))
+            else:
+                max_pressure = 10
+        except ValueError:
+            max_pressure = 10
+            flog.caution("Could not calculate max_pressure, using default value")
+
+        # 안전한 y축 범위 설정 (calibrated, 활성화된 채널만 고려)
+        try:
+            if view.is_plot[0]:
+                max_volume = max(100, float(channel_max[2]))
+            else:
+                max_volume = 100
+        except ValueError:
+            max_volume = 100
+            flog.caution("Could not calculate max_volume, using default value")
+
+        # Axes, ticks and legends only change with these or the x window; otherwise blit the data
+        state = (view.interval, view.is_plot, max_volume, max_pressure)
+        if state == self._plot_state and self._x_window_fits(view):
+            self._update_plot_lines(view, max_pressure)
+        else:
+            self._plot_state = state
+            self._redraw_plot(view, max_volume, max_pressure)
+
+    def _redraw_plot(self, view: PlotView, max_volume: float, max_pressure: float) -> None:
+        """Rebuild the axes, data lines, grid, legends and locators, then draw the whole figure."""
+        calibrated = view.calibrated
         self.ax.clear()
         self.ax2.clear()
+        self._plot_lines = []
+        self._peak_pool = []
+        self._peak_count = 0
+        self._peak_specs = []
 
         marker_size = 3
 
-        # Build calibrated copies (raw deque → calibrated list, per channel)
-        calibrated = [
-            [self.apply_calibration(ch, v) for v in self.data_arduino_plot[ch]]
-            for ch in range(4)
-        ]
-
         # is_plot 설정에 따라 각 채널 플롯 여부 결정
         # Volume (V_plant) - channel 2, label_name_unit_pairs[0]
-        if self.is_plot[0]:
-            self.ax.plot(self.time_arduino_plot, calibrated[2], marker='o', color='blue', label="Volume", markersize=marker_size)
+        if view.is_plot[0]:
+            self._plot_lines += self.ax.plot(view.times, calibrated[2], marker='o', color='blue', label="Volume", markersize=marker_size)
 
         # Pressure 그래프들
         # P_plant - channel 1, label_name_unit_pairs[1]
-        if self.is_plot[1]:
-            self.ax2.plot(self.time_arduino_plot, calibrated[1], marker='o', color='green', label="P_plant", markersize=marker_size)
+        if view.is_plot[1]:
+            self._plot_lines += self.ax2.plot(view.times, calibrated[1], marker='o', color='green', label="P_plant", markersize=marker_size)
 
         # P_storage - channel 0, label_name_unit_pairs[2]
-        if self.is_plot[2]:
-            self.ax2.plot(self.time_arduino_plot, calibrated[0], marker='o', color='red', label="P_storage", markersize=marker_size)
+        if view.is_plot[2]:
+            self._plot_lines += self.ax2.plot(view.times, calibrated[0], marker='o', color='red', label="P_storage", markersize=marker_size)
 
         # P_purifier - channel 3, label_name_unit_pairs[3]
-        if self.is_plot[3]:
-            self.ax2.plot(self.time_arduino_plot, calibrated[3], marker='o', color='skyblue', label="P_purifier", markersize=marker_size)
+        if view.is_plot[3]:
+            self._plot_lines += self.ax2.plot(view.times, calibrated[3], marker='o', color='skyblue', label="P_purifier", markersize=marker_size)
         ax2_color = 'red'
 
         self.ax.set_xlabel("")
@@ -778,53 +1074,26 @@ class PressureLevelPlotter:
         # ax2의 y축 색상을 변경
         self.ax2.tick_params(axis='y', colors=ax2_color)
 
-        # 안전한 max_pressure 계산 (calibrated, 활성화된 채널만 고려)
-        try:
-            pressure_values = []
-            if self.is_plot[1]:
-                pressure_values.extend(calibrated[1])
-            if self.is_plot[2]:
-                pressure_values.extend(calibrated[0])
-            if self.is_plot[3]:
-                pressure_values.extend(calibrated[3])
-
-            if pressure_values:
-                max_pressure = max(10, max(pressure_values))
-            else:
-                max_pressure = 10
-        except ValueError:
-            max_pressure = 10
-            flog.caution("Could not calculate max_pressure, using default value")
-
-        if self.enable_localmaxmin.get() == 1:
-            self.draw_local_maxmin(self.ax2, max_pressure, calibrated)
-
-        # 안전한 y축 범위 설정 (calibrated, 활성화된 채널만 고려)
-        try:
-            if self.is_plot[0]:
-                max_volume = max(100, max(calibrated[2]))
-            else:
-                max_volume = 100
-        except ValueError:
-            max_volume = 100
-            flog.caution("Could not calculate max_volume, using default value")
+        self._draw_peaks(view, max_pressure)
 
         self.ax.set_ylim(0, max_volume)
         self.ax2.set_ylim(0, max_pressure)
 
         # 활성화된 채널의 데이터만 고려하여 x축 범위 설정
-        if len(self.time_arduino_plot) > 0 and any(self.is_plot):
+        self._plot_xlim = None
+        if len(view.times) > 0 and any(view.is_plot):
             # 활성화된 채널의 시간 범위만 사용
-            x_min = min(self.time_arduino_plot)
-            x_max = max(self.time_arduino_plot)
+            x_min, x_max = view.time_range
 
             # autoscale_view()의 마진 로직을 수동으로 구현 (약 5% 여백)
             x_range = x_max - x_min
-            if x_range.total_seconds() > 0:  # timedelta를 초 단위로 변환하여 비교
+            if x_range > np.timedelta64(0, 's'):
                 margin = 0.05  # 5% 여백
                 x_margin = x_range * margin
-                self.ax.set_xlim(x_min - x_margin, x_max + x_margin)
-                self.ax2.set_xlim(x_min - x_margin, x_max + x_margin)
+                # Extra room on the right lets the next frames blit before the window must move
+                self._plot_xlim = (x_min - x_margin, x_max + x_margin + x_range * BLIT_X_HEADROOM)
+                self.ax.set_xlim(*self._plot_xlim)
+                self.ax2.set_xlim(*self._plot_xlim)
             else:
                 # 데이터가 하나뿐인 경우 기본 범위 설정
                 self.ax.autoscale_view()
@@ -836,13 +1105,17 @@ class PressureLevelPlotter:
         self.ax.legend(loc='lower left')
         self.ax2.legend(loc='upper left')
 
+        # Legend handles copy the animated flag, so the lines become animated only after the legends
+        for line in self._plot_lines:
+            line.set_animated(True)
+
         # x축 눈금 글자 대각선으로 회전
         for label in self.ax.get_xticklabels():
             label.set_rotation(30)  # 30도 회전
             label.set_horizontalalignment('right')  # 오른쪽 정렬
 
         try:
-            self.update_xformatter(self.get_interval())
+            self.update_xformatter(view.interval)
         except Exception as e:
             flog.error(f"x-axis formatter setup error: {e}")
 
@@ -851,89 +1124,140 @@ class PressureLevelPlotter:
         except Exception as e:
             flog.error(f"axes margin setup error: {e}")
 
+        self.figure_layout.apply_fonts()
         if not self.safe_canvas_draw():
             flog.caution("Canvas update failed; skipping plot update")
+            self._plot_state = None
+
+    def _x_window_fits(self, view: PlotView) -> bool:
+        """True while the data stays inside the cached x limits, keeping the 5% margin on the right."""
+        if self._plot_xlim is None:
+            return False
+        x_min, x_max = view.time_range
+        x_range = x_max - x_min
+        x_margin = x_range * 0.05
+        left, right = self._plot_xlim
+        return (left <= x_min and x_max + x_margin <= right
+                and x_min - left <= x_margin + x_range * BLIT_X_HEADROOM)
+
+    def _update_plot_lines(self, view: PlotView, max_pressure: float) -> None:
+        """Move the existing data lines to the new samples and blit them over the cached background."""
+        channels = [channel for visible, channel in zip(view.is_plot, (2, 1, 0, 3)) if visible]
+        for line, channel in zip(self._plot_lines, channels):
+            line.set_data(view.times, view.calibrated[channel])
+        if self._draw_peaks(view, max_pressure):
+            self._marker_background = None
+
+        if self._plot_background is None:
+            self.safe_canvas_draw()
+            return
+        try:
+            self._restore_marker_layer()
+            for line in self._plot_lines:
+                self.figure.draw_artist(line)
+            self.canvas.blit(self.figure.bbox)
+        except Exception as e:
+            flog.error(f"Plot blit failed: {e}")
+            self._plot_state = None
+
+    def _restore_marker_layer(self) -> None:
+        """Restore the background with the peak markers on it, rendering the markers only when they changed.
+
+        Text is the slowest artist to rasterize, so the markers are drawn once
+        onto the background and that layer is copied for the following frames.
+        """
+        if self._marker_background is None:
+            self.canvas.restore_region(self._plot_background)
+            for marker in self._peak_pool[:self._peak_count]:
+                for artist in marker:
+                    self.figure.draw_artist(artist)
+            self._marker_background = self.canvas.copy_from_bbox(self.figure.bbox)
+        else:
+            self.canvas.restore_region(self._marker_background)
+
+    def _draw_peaks(self, view: PlotView, max_pressure: float) -> bool:
+        """Move the pooled local max/min markers onto this frame's extrema; returns whether any marker changed.
+
+        The markers are animated so the cached background stays clean.
+        """
+        specs = []
+        if view.show_peaks:
+            specs = self.draw_local_maxmin(max_pressure, view)
+        if specs == self._peak_specs:
+            return False
+        for index, (when, label_y, text, color) in enumerate(specs):
+            value, line, stamp = self._peak_marker(index)
+            value.set_text(text)
+            value.xy = value.xyann = (when, label_y)
+            line.set_data([when, when], [0, max_pressure])
+            stamp.set_text(when.item().strftime("%H:%M:%S"))
+            stamp.xy = (when, 0)
+            stamp.xyann = (when, -1)
+            for artist in (value, line, stamp):
+                artist.set_color(color)
+                artist.set_visible(True)
+        for marker in self._peak_pool[len(specs):self._peak_count]:
+            for artist in marker:
+                artist.set_visible(False)
+        self._peak_specs = specs
+        self._peak_count = len(specs)
+        return True
+
+    def _on_canvas_draw(self, event) -> None:
+        """After every full draw (ours or a Tk resize), cache the background and paint the data on it."""
+        self._plot_background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._marker_background = None
+        self._restore_marker_layer()
+        for line in self._plot_lines:
+            self.figure.draw_artist(line)
 
     def find_peaks(self, data):
-        threshold = 0.1
-        width = 4
-        window_size = 2 * width + 1
-
-        # data smoothing
-        data_notdeque = list(data)
-        data_smooth = [
-            sum(data_notdeque[max(i - width, 0):min(i + width + 1, len(data_notdeque))]) / (min(i + width + 1, len(data_notdeque)) - max(i - width, 0))
-            for i in range(len(data_notdeque))
-        ]
-
-        # find peaks
-        peaks = [
-            i for i in range(width, len(data_smooth) - width)
-            if data_smooth[i] == max(data_smooth[i - width:i + width + 1]) and
-            max(data_smooth[i - width:i + width + 1]) - min(data_smooth[i - width:i + width + 1]) > threshold
-        ]
-
-        return peaks
-
-    def draw_local_maxmin(self, ax, max_pressure, calibrated_data: list[list[float]]):
+        return local_extrema(data)[0].tolist()
+
+    def _cached_extrema(self, key: tuple, p_pl: np.ndarray, p_st: np.ndarray):
+        """Peaks/valleys of P_pl and P_st, scanned once per plotted buffer generation (``key``)."""
+        if self._extrema_key != key:
+            self._extrema = (local_extrema(p_pl), local_extrema(p_st))
+            self._extrema_key = key
+        return self._extrema
+
+    def _peak_marker(self, index: int):
+        """The pooled (value label, dashed line, time label) for the ``index``-th marker of this frame."""
+        while len(self._peak_pool) <= index:
+            fontsize = self.figure_layout.sizes["font"]
+            value = self.ax2.annotate('', (0, 0), textcoords="data", ha='left', alpha=0.8,
+                                      fontweight='bold', fontsize=fontsize, animated=True)
+            line, = self.ax2.plot([], [], '--', alpha=0.5, animated=True)
+            stamp = self.ax2.annotate('', (0, 0), textcoords="data", xytext=(0, -1), ha='right', alpha=0.8,
+                                      fontweight='bold', fontsize=fontsize, rotation=30, animated=True)
+            self._peak_pool.append((value, line, stamp))
+        return self._peak_pool[index]
+
+    def draw_local_maxmin(self, max_pressure, view: PlotView) -> list:
+        """Markers for the local maxima / minima of P_pl (green) and P_st (red).
+
+        Returns one ``(time, label y, label text, color)`` per marker; markers
+        are keyed by time, so they compare equal while the window only scrolls.
+        """
         # 데이터가 충분한지 확인 (raw deque 길이 기준)
-        if len(self.data_arduino_plot[1]) < 10:
-            return
-
-        p_pl = calibrated_data[1]
-        p_st = calibrated_data[0]
-
-        # Find local maxima and minima for plant pressure
-        peaks = self.find_peaks(p_pl)
-        valleys = self.find_peaks([-x for x in p_pl])
-
-        for peak in peaks:
-            if peak < len(self.time_arduino_plot) and peak < len(p_pl) and peak < len(p_st):
-                ax.annotate(f'P_pl = {p_pl[peak]:.2f} psi\nP_st = {p_st[peak]:.2f} psi',
-                                (self.time_arduino_plot[peak], min(p_pl[peak], max_pressure) - 1),
-                                textcoords="data", ha='left', color='green', alpha=0.8, fontweight='bold')
-                ax.plot([self.time_arduino_plot[peak], self.time_arduino_plot[peak]], [0, max_pressure], 'g--', alpha=0.5)
-                ax.annotate(f'{self.time_arduino_plot[peak].strftime("%H:%M:%S")}',
-                                (self.time_arduino_plot[peak], 0),
-                                textcoords="data", xytext=(self.time_arduino_plot[peak], -1),
-                                ha='right', color='green', alpha=0.8, fontweight='bold', rotation=30)
-
-        for valley in valleys:
-            if valley < len(self.time_arduino_plot) and valley < len(p_pl) and valley < len(p_st):
-                ax.annotate(f'P_pl = {p_pl[valley]:.2f} psi\nP_st = {p_st[valley]:.2f} psi',
-                                (self.time_arduino_plot[valley], max(p_pl[valley], 0) + 1),
-                                textcoords="data", ha='left', color='green', alpha=0.8, fontweight='bold')
-                ax.plot([self.time_arduino_plot[valley], self.time_arduino_plot[valley]], [0, max_pressure], 'g--', alpha=0.5)
-                ax.annotate(f'{self.time_arduino_plot[valley].strftime("%H:%M:%S")}',
-                                (self.time_arduino_plot[valley], 0),
-                                textcoords="data", xytext=(self.time_arduino_plot[valley], -1),
-                                ha='right', color='green', alpha=0.8, fontweight='bold', rotation=30)
-
-        # Find local maxima and minima for storage pressure
-        peaks = self.find_peaks(p_st)
-        valleys = self.find_peaks([-x for x in p_st])
-
-        for peak in peaks:
-            if peak < len(self.time_arduino_plot) and peak < len(p_pl) and peak < len(p_st):
-                ax.annotate(f'P_pl = {p_pl[peak]:.2f} psi\nP_st = {p_st[peak]:.2f} psi',
-                                (self.time_arduino_plot[peak], min(p_st[peak], max_pressure) - 1),
-                                textcoords="data", ha='left', color='red', alpha=0.8, fontweight='bold')
-                ax.plot([self.time_arduino_plot[peak], self.time_arduino_plot[peak]], [0, max_pressure], 'r--', alpha=0.5)
-                ax.annotate(f'{self.time_arduino_plot[peak].strftime("%H:%M:%S")}',
-                                (self.time_arduino_plot[peak], 0),
-                                textcoords="data", xytext=(self.time_arduino_plot[peak], -1),
-                                ha='right', color='red', alpha=0.8, fontweight='bold', rotation=30)
-
-        for valley in valleys:
-            if valley < len(self.time_arduino_plot) and valley < len(p_pl) and valley < len(p_st):
-                ax.annotate(f'P_pl = {p_pl[valley]:.2f} psi\nP_st = {p_st[valley]:.2f} psi',
-                                (self.time_arduino_plot[valley], max(p_st[valley], 0) + 1),
-                                textcoords="data", ha='left', color='red', alpha=0.8, fontweight='bold')
-                ax.plot([self.time_arduino_plot[valley], self.time_arduino_plot[valley]], [0, max_pressure], 'r--', alpha=0.5)
-                ax.annotate(f'{self.time_arduino_plot[valley].strftime("%H:%M:%S")}',
-                                (self.time_arduino_plot[valley], 0),
-                                textcoords="data", xytext=(self.time_arduino_plot[valley], -1),
-                                ha='right', color='red', alpha=0.8, fontweight='bold', rotation=30)
+        if len(view.data[1]) < 10:
+            return []
+
+        p_pl = view.calibrated[1]
+        p_st = view.calibrated[0]
+        (pl_peaks, pl_valleys), (st_peaks, st_valleys) = self._cached_extrema(view.key, p_pl, p_st)
+        length = min(len(view.times), len(p_pl), len(p_st))
+
+        specs = []
+        for series, color, peaks, valleys in ((p_pl, 'green', pl_peaks, pl_valleys),
+                                              (p_st, 'red', st_peaks, st_valleys)):
+            for index, is_peak in [(i, True) for i in peaks] + [(i, False) for i in valleys]:
+                if index >= length:
+                    continue
+                label_y = min(series[index], max_pressure) - 1 if is_peak else max(series[index], 0) + 1
+                specs.append((view.times[index], label_y,
+                              f'P_pl = {p_pl[index]:.2f} psi\nP_st = {p_st[index]:.2f} psi', color))
+        return specs
 
     def set_axes_margin(self):
         try:
@@ -945,32 +1269,22 @@ class PressureLevelPlotter:
             flog.error(f"set_axes_margin() error: {e}")
 
     def update_xformatter(self, interval: Interval):
-        def format_date(x, pos=None):
+        # 인터벌별 locator/formatter는 한 번만 만들고 재사용 (눈금 위치·글자는 각자 캐시)
+        if interval not in self._x_tickers:
             try:
-                date = mdates.num2date(x)
-                if interval == Interval.ONE_SECOND:
-                    result = date.strftime("%H:%M:%S")
-                elif interval == Interval.ONE_HOUR:
-                    result = date.strftime("%m-%d %H:%M")
-                else:
-                    result = date.strftime("%H:%M")
-                return result
+                locator = CustomDateLocator(interval)
             except Exception as e:
-                flog.error(f"format_date() error: {e}")
-                return ""
-
-        try:
-            locator = CustomDateLocator(interval)
-        except Exception as e:
-            flog.error(f"CustomDateLocator creation error: {e}")
-            from matplotlib.dates import AutoDateLocator
-            locator = AutoDateLocator()
+                flog.error(f"CustomDateLocator creation error: {e}")
+                from matplotlib.dates import AutoDateLocator
+                locator = AutoDateLocator()
 
-        try:
-            formatter = ticker.FuncFormatter(format_date)
-        except Exception as e:
-            flog.error(f"FuncFormatter creation error: {e}")
-            return
+            try:
+                formatter = CachedDateFormatter(X_TICK_FORMATS[interval])
+            except Exception as e:
+                flog.error(f"CachedDateFormatter creation error: {e}")
+                return
+            self._x_tickers[interval] = (locator, formatter)
+        locator, formatter = self._x_tickers[interval]
 
         try:
             self.ax.xaxis.set_major_locator(locator)
@@ -994,9 +1308,8 @@ class PressureLevelPlotter:
         except Exception as e:
             flog.error(f"autofmt_xdate() error: {e}")
 
-    def save_log(self, time: datetime, arduino_data):
-        # Apply calibration before logging
-        cal = [self.apply_calibration(i, arduino_data[i]) for i in range(4)]
+    def save_log(self, time: datetime, arduino_data, cal):
+        # cal: calibrated copy of arduino_data (from the deque)
 
         year = time.strftime('%Y')
         month = time.strftime('%m')
@@ -1007,8 +1320,28 @@ class PressureLevelPlotter:
 
         log_file_path = os.path.join(year_month_dir, f"{day}.txt")
 
-        with open(log_file_path, "a", encoding="utf-8") as f:
-            f.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')}: {cal[2]:.2f} L, {cal[1]:.2f} psi, {cal[0]:.2f} psi, {cal[3]:.2f} psi\n")
+        if ALIGN_TO_CLOCK:
+            offset = self.minute_log.append(log_file_path, time, [cal[2], cal[1], cal[0], cal[3]])
+            if offset is None:
+                return  # this minute is already logged
+        else:
+            offset = os.path.getsize(log_file_path) if os.path.exists(log_file_path) else 0
+            with open(log_file_path, "a", encoding="utf-8") as f:
+                f.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')}: {cal[2]:.2f} L, {cal[1]:.2f} psi, {cal[0]:.2f} psi, {cal[3]:.2f} psi\n")
+
+        try:
+            logged = [round(cal[i], 2) for i in (2, 1, 0, 3)]
+            self.log_index.record(log_file_path, offset, time, logged)
+        except (OSError, ValueError) as e:
+            flog.error(f"Failed to update data log index: {e}")
+
+        if WRITE_BINARY_LOG:
+            # Status bit 0: Arduino not delivering good data
+            status = STATUS_OK if self.arduino_status_code == 200 else 1
+            try:
+                self.binary_log.append(time, arduino_data, cal, status)
+            except (OSError, ValueError) as e:
+                flog.error(f"Failed to write binary data log: {e}")
 
     def open_setting(self):
         """
@@ -1032,17 +1365,18 @@ class PressureLevelPlotter:
         self.is_plot = is_plot
         self._save_config()
 
-        # 설정 변경 시 즉시 플롯 업데이트
-        if len(self.time_arduino_plot) > 2:
-            self.update_plot()
+        # 설정 변경 시 다음 프레임에 플롯 업데이트
+        if len(self.plot_view.times) > 2:
+            self.render_scheduler.request()
 
     def safe_canvas_draw(self):
         """
         안전한 canvas 업데이트를 위한 함수
         """
         try:
-            # GUI 이벤트 처리
-            self.master.update_idletasks()
+            # GUI 이벤트 처리 (render worker 스레드에서는 Tk를 건드리지 않음)
+            if self.render_worker is None:
+                self.master.update_idletasks()
             
             # canvas 업데이트
             self.canvas.draw()
@@ -1075,8 +1409,8 @@ class PressureLevelPlotter:
             self.update_display()
 
             # 플롯 업데이트는 데이터가 있을 때만 (Arduino 상태와 관계없이)
-            if len(self.time_arduino_plot) > 2:
-                self.update_plot()
+            if len(self.plot_view.times) > 2:
+                self.render_scheduler.request()
 
         except Exception as e:
             flog.error(f"Arduino checkbox change error: {e}")
@@ -1092,20 +1426,26 @@ class PressureLevelPlotter:
         except Exception as e:
             flog.error(f"immediate_data_fetch() error: {e}")
 
-    def safe_update_plot(self):
+    def _render_frame(self):
+        """RenderScheduler callback: capture the frame's view, then draw it here or on the render worker."""
+        try:
+            view = self._refresh_plot_buffers()
+        except Exception as e:
+            flog.error(f"Plot buffer refresh error: {e}")
+            return
+        if self.render_worker is not None:
+            self.render_worker.request(view)
+        else:
+            self.safe_update_plot(view)
+
+    def safe_update_plot(self, view: Optional[PlotView]):
         """
-        GUI 스레드에서 안전하게 플롯을 업데이트하는 함수
+        캡처된 view로 플롯을 안전하게 업데이트하는 함수 (render worker가 있으면 그 스레드에서 실행)
         """
         try:
-            # 데이터 간격 업데이트
-            interval = self.get_interval()
-            
-            self.time_arduino_plot = self.arduino_deque.get_time_deque(interval)
-            self.data_arduino_plot = self.arduino_deque.get_data_deque(interval)
-            
             # 플롯 업데이트
-            if len(self.time_arduino_plot) > 2:
-                self.update_plot()
+            if view is not None and len(view.times) > 2:
+                self.update_plot(view)
         except Exception as e:
             flog.error(f"safe_update_plot() error: {e}")
 
@@ -1118,6 +1458,13 @@ class PressureLevelPlotter:
         PyInstaller --noconsole builds).  os._exit() then bypasses the rest of
         Python's shutdown sequence entirely, guaranteeing the process exits.
         """
+        self.render_scheduler.stop()
+        flog.info(f"Plot frames: {self.render_scheduler.counts()}")
+        if self.render_worker is not None:
+            self.render_worker.stop()
+            flog.info(f"Render worker frames: {self.render_worker.counts()}")
+        self.arduino_deque.flush()
+        self.http.close()
         plt.close('all')
         self.master.destroy()
         os._exit(0)
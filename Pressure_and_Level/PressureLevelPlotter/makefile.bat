@@ -1 +1 @@
-python -m PyInstaller --onefile --noconsole -n=PressureLevelPlotter --icon=.\PressureLevelPlotter.ico --add-data "PressureLevelPlotter.ico;." --paths=..\..\common --hidden-import=FuncLogger --hidden-import=paths .\PressureLevelPlotter.py
+python -m PyInstaller --onefile --noconsole -n=PressureLevelPlotter --icon=.\PressureLevelPlotter.ico --add-data "PressureLevelPlotter.ico;." --paths=..\..\common --hidden-import=FuncLogger --hidden-import=paths --hidden-import=RingBuffer --hidden-import=BinaryLog --hidden-import=LogParser --hidden-import=LogIndex --hidden-import=LogQuery --hidden-import=MinuteLog --hidden-import=RenderScheduler --hidden-import=RenderWorker --hidden-import=FigureLayout --hidden-import=DateTicks --hidden-import=WidgetState --hidden-import=SampleFormat .\PressureLevelPlotter.py
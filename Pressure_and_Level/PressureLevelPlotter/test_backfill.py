@@ -0,0 +1,114 @@
+"""
+Restart catch-up: restore the plot buffer from disk, backfill from the receiver, log the minutes.
+
+Run with pytest from this directory.
+"""
+
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "common"))
+
+import PressureLevelPlotter as M
+from BinaryLog import BinaryLogReader, BinaryLogWriter
+from LogIndex import LogIndexWriter, load_summary
+from MinuteLog import MinuteLogWriter
+from RingBuffer import CalibratedTimeDeque
+from VariousTimeDeque import Interval
+
+
+class _Response:
+    status_code = 200
+
+    def __init__(self, samples):
+        self._samples = samples
+
+    def json(self):
+        return {"samples": self._samples, "more": False}
+
+
+class _Receiver:
+    """Stands in for the HTTP session: ``/Meas/since`` returns the frames newer than ``ts``."""
+
+    def __init__(self, timestamps):
+        self.timestamps = timestamps
+        self.requested_since = None
+
+    def get(self, url, params=None, timeout=None):
+        assert url.endswith("/Meas/since")
+        self.requested_since = params["ts"]
+        frames = [t for t in self.timestamps if t > params["ts"]][:params["limit"]]
+        return _Response([
+            {**{field: f"{t - self.timestamps[0]:.2f} psi" for field in M.ARDUINO_FIELDS}, "timestamp": t}
+            for t in frames
+        ])
+
+
+class _Scheduler:
+    def request(self):
+        pass
+
+
+class _SilentLog:
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+def _plotter(monkeypatch, tmp_path, receiver):
+    monkeypatch.setattr(M, "writable_path", lambda *parts: os.path.join(str(tmp_path), *parts))
+    monkeypatch.setattr(M, "flog", _SilentLog())
+    plotter = M.PressureLevelPlotter.__new__(M.PressureLevelPlotter)
+    plotter.arduino_deque = CalibratedTimeDeque(4, storage_path=str(tmp_path / "buffer.bin"), aligned=True)
+    plotter._bucket_times = {}
+    plotter._backfilled_minutes = []
+    plotter.backfill_lock = M.threading.Lock()
+    plotter.binary_log = BinaryLogWriter(str(tmp_path / M._LOG_DIR_NAME), 4)
+    plotter.log_index = LogIndexWriter()
+    plotter.minute_log = MinuteLogWriter((" L", " psi", " psi", " psi"))
+    plotter.arduino_status_code = 200
+    plotter.http = receiver
+    plotter.plot_interval = Interval.ONE_SECOND
+    plotter.render_scheduler = _Scheduler()
+    return plotter
+
+
+def test_restart_catches_up_from_the_stored_samples_and_logs_the_backfilled_minutes(monkeypatch, tmp_path):
+    start = (int(time.time()) // 60 - 10) * 60
+    stored = CalibratedTimeDeque(4, storage_path=str(tmp_path / "buffer.bin"), aligned=True)
+    stored.clear()
+    for second in range(30):
+        stored.update_data([0.0] * 4, start + second)
+    stored.flush()
+    del stored
+
+    # The receiver kept reading while the plotter was down, until 3 min 30 s after start
+    receiver = _Receiver([float(start + second) for second in range(210)])
+    plotter = _plotter(monkeypatch, tmp_path, receiver)
+    assert plotter.arduino_deque.restored
+    plotter._restore_plot_buffers()
+
+    assert receiver.requested_since == start + 29
+    # No placeholder sample at now: the 1 s buffer ends at the receiver's newest frame
+    assert plotter.arduino_deque.newest_time() == start + 209
+    assert plotter.arduino_deque.get_time_deque(Interval.ONE_SECOND)[-1] == start + 209
+
+    # main_loop writes the queued minutes on the Tk thread
+    assert plotter._log_backfilled_minutes() == datetime.fromtimestamp(start + 180)
+    assert plotter._backfilled_minutes == []
+
+    minutes = [start + 60, start + 120, start + 180]
+    rows = BinaryLogReader(str(tmp_path / M._LOG_DIR_NAME)).read(
+        datetime.fromtimestamp(start), datetime.fromtimestamp(start + 240))
+    assert rows["time"].tolist() == minutes
+    assert rows["raw"][:, 0].tolist() == [60.0, 120.0, 180.0]
+    for minute in minutes:
+        stamp = datetime.fromtimestamp(minute)
+        log_path = os.path.join(str(tmp_path), M._LOG_DIR_NAME, stamp.strftime("%Y"), stamp.strftime("%m"),
+                                f"{stamp.strftime('%d')}.txt")
+        with open(log_path, encoding="utf-8") as f:
+            lines = [line for line in f if line.startswith(stamp.strftime("%Y-%m-%d %H:%M:%S"))]
+        assert len(lines) == 1 and f"{minute - start:.2f}" in lines[0]
+    assert load_summary(log_path).last == datetime.fromtimestamp(minutes[-1]).strftime("%Y-%m-%d %H:%M:%S")
@@ -0,0 +1,103 @@
+"""Benchmark: fast LogParser vs. the per-line regex + strptime history parser.
+
+Writes a few weeks of synthetic 1 min PressureLevel logs to a temporary
+directory and times both parsers over the plotter's history window (N × 1 h)
+and over the whole span.
+
+    python bench/bench_log_parser.py [--days 21]
+"""
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+
+import numpy as np
+
+from LogParser import LogParser
+from RingBuffer import MAXLEN
+
+_LOG_LINE_RE = re.compile(
+    r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}): "
+    r"(-?\d+\.\d{2}) L, (-?\d+\.\d{2}) psi, (-?\d+\.\d{2}) psi, (-?\d+\.\d{2}) psi$"
+)
+
+
+def write_logs(log_dir: str, end: datetime, days: int) -> list[str]:
+    rng = np.random.default_rng(0)
+    paths = []
+    start = (end - timedelta(days=days)).replace(hour=0, minute=0, second=0)
+    for day in range(days + 1):
+        day_start = start + timedelta(days=day)
+        path = os.path.join(log_dir, f"{day_start:%Y%m%d}.txt")
+        values = rng.normal([70.0, 1.5, 6.0, 1.2], [5.0, 0.2, 0.5, 0.1], size=(1440, 4))
+        with open(path, "w", encoding="utf-8") as f:
+            for minute, (v, p1, p2, p3) in enumerate(values):
+                dt = day_start + timedelta(minutes=minute, seconds=15)
+                f.write(f"{dt:%Y-%m-%d %H:%M:%S}: {v:.2f} L, {p1:.2f} psi, {p2:.2f} psi, {p3:.2f} psi\n")
+        paths.append(path)
+    return paths
+
+
+def legacy_parse(paths: list[str], since: datetime):
+    """The history restore parser before LogParser (regex + strptime per line, then sort)."""
+    records = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as log_file:
+            for line in log_file:
+                match = _LOG_LINE_RE.match(line.strip())
+                if not match:
+                    continue
+                dt = datetime.strptime(match.group(1), "%Y-%m-%d %H:%M:%S")
+                if dt < since:
+                    continue
+                records.append((dt, [float(match.group(i)) for i in range(2, 6)]))
+    records.sort(key=lambda item: item[0])
+    return records
+
+
+def best_of(func, repeat: int = 3) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=21)
+    args = parser.parse_args()
+
+    fast = LogParser(4, units=(" L", " psi"), line_re=_LOG_LINE_RE)
+    end = datetime.now()
+    with tempfile.TemporaryDirectory() as log_dir:
+        paths = write_logs(log_dir, end, args.days)
+        windows = {
+            f"history window ({MAXLEN} h)": end - timedelta(hours=MAXLEN),
+            f"all {args.days} days": end - timedelta(days=args.days + 1),
+        }
+        for label, since in windows.items():
+            # Same files the plotter would open for this window
+            selected = [p for p in paths if os.path.basename(p)[:8] >= f"{since:%Y%m%d}"]
+            legacy = legacy_parse(selected, since)
+            times, values = fast.parse_files(selected, since)
+            assert len(times) == len(legacy)
+            assert np.allclose(values, [raw for _, raw in legacy])
+
+            slow_s = best_of(lambda: legacy_parse(selected, since))
+            fast_s = best_of(lambda: fast.parse_files(selected, since))
+            print(
+                f"{label:>26}: {len(times):7d} lines  legacy {slow_s * 1e3:8.1f} ms  "
+                f"LogParser {fast_s * 1e3:7.1f} ms  speedup {slow_s / fast_s:5.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
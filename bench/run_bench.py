@@ -0,0 +1,583 @@
+"""Headless benchmark suite for the monitoring hot paths.
+
+    python bench/run_bench.py                # run and compare with bench/baseline.json
+    python bench/run_bench.py --save         # run and store the results as the baseline
+    python bench/run_bench.py -k deque       # only cases whose name contains "deque"
+
+Every case reports the best time per operation over ``--repeat`` runs. A case
+slower than ``baseline × --threshold`` is flagged as a regression and the run
+exits with status 1. Baselines are machine-specific: save one before an
+optimisation and compare after it on the same machine.
+
+Plotter-side modules (``VariousTimeDeque``, ``CustomDateLocator``,
+``find_peaks``) are the PressureLevelPlotter copies. Cases whose optional
+dependency is not installed are reported as skipped.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import http.client
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from http.server import HTTPServer, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+_BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+_ROOT = os.path.dirname(_BENCH_DIR)
+for _path in (
+    os.path.join(_ROOT, "common"),
+    os.path.join(_ROOT, "Pressure_and_Level", "PressureLevelPlotter"),
+    os.path.join(_ROOT, "Pressure_and_Level", "ArduinoADCReceiver"),
+    os.path.join(_ROOT, "Current_Monitor", "CurrentReceiver"),
+    os.path.join(_ROOT, "Flow_and_Temp", "RFM"),
+):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+import numpy as np
+
+BASELINE_PATH = os.path.join(_BENCH_DIR, "baseline.json")
+DEFAULT_THRESHOLD = 1.3
+MAXLEN_SIZES = (100, 1000, 10000)
+
+# A case factory returns (run, ops): ``run()`` performs ``ops`` operations.
+Case = Callable[[], Tuple[Callable[[], object], int]]
+_CASES: Dict[str, Case] = {}
+
+
+def case(name: str) -> Callable[[Case], Case]:
+    def register(factory: Case) -> Case:
+        _CASES[name] = factory
+        return factory
+    return register
+
+
+class Skip(Exception):
+    """Raised by a case factory whose dependency is unavailable."""
+
+
+@contextlib.contextmanager
+def _various_maxlen(maxlen: int) -> Iterator[object]:
+    """``VariousTimeDeque`` module with its ``MAXLEN`` temporarily set to ``maxlen``."""
+    import VariousTimeDeque as module
+
+    saved = module.MAXLEN
+    module.MAXLEN = maxlen
+    try:
+        yield module
+    finally:
+        module.MAXLEN = saved
+
+
+def _samples(count: int, numdata: int = 4, step: float = 1.0) -> Tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(0)
+    times = 1_700_000_000.0 + np.arange(count) * step
+    return times, rng.normal(size=(count, numdata))
+
+
+# --- ring buffers ----------------------------------------------------------
+
+def _various_update_case(maxlen: int) -> Case:
+    def factory():
+        times, values = _samples(10_000)
+        timestamps, rows = times.tolist(), values.tolist()
+
+        def run():
+            with _various_maxlen(maxlen) as module:
+                deque = module.VariousTimeDeque(4)
+                for t, row in zip(timestamps, rows):
+                    deque.update_data(row, t)
+        return run, len(rows)
+    return factory
+
+
+def _rollup_update_case(maxlen: int) -> Case:
+    def factory():
+        from RingBuffer import RollupTimeDeque
+
+        times, values = _samples(10_000)
+        timestamps, rows = times.tolist(), values.tolist()
+
+        def run():
+            deque = RollupTimeDeque(4, maxlen=maxlen)
+            for t, row in zip(timestamps, rows):
+                deque.update_data(row, t)
+        return run, len(rows)
+    return factory
+
+
+def _history(maxlen: int) -> Tuple[np.ndarray, np.ndarray, datetime]:
+    """1 min samples covering the longest (1 h × maxlen) window, capped at 100k."""
+    count = min(maxlen * 60, 100_000)
+    times, values = _samples(count, step=60.0)
+    return times, values, datetime.fromtimestamp(times[-1])
+
+
+def _various_load_case(maxlen: int) -> Case:
+    def factory():
+        times, values, reference = _history(maxlen)
+        records = [(datetime.fromtimestamp(t), row) for t, row in zip(times.tolist(), values.tolist())]
+
+        def run():
+            with _various_maxlen(maxlen) as module:
+                module.VariousTimeDeque(4).load_historical(records, reference_time=reference)
+        return run, len(records)
+    return factory
+
+
+def _rollup_load_case(maxlen: int) -> Case:
+    def factory():
+        from RingBuffer import RollupTimeDeque
+
+        times, values, reference = _history(maxlen)
+        deque = RollupTimeDeque(4, maxlen=maxlen)
+
+        def run():
+            deque.load_historical_arrays(times, values, reference_time=reference)
+        return run, len(times)
+    return factory
+
+
+def _window_ranges_case(maxlen: int) -> Case:
+    """Axis limits of a full window: O(channels) however long the window is."""
+    def factory():
+        from RingBuffer import RollupTimeDeque
+
+        times, values, reference = _history(maxlen)
+        deque = RollupTimeDeque(4, maxlen=maxlen)
+        deque.load_historical_arrays(times, values, reference_time=reference)
+        return (lambda: deque.window_ranges(60)), 1
+    return factory
+
+
+for _maxlen in MAXLEN_SIZES:
+    case(f"VariousTimeDeque.update_data[maxlen={_maxlen}]")(_various_update_case(_maxlen))
+    case(f"RollupTimeDeque.update_data[maxlen={_maxlen}]")(_rollup_update_case(_maxlen))
+    case(f"VariousTimeDeque.load_historical[maxlen={_maxlen}]")(_various_load_case(_maxlen))
+    case(f"RollupTimeDeque.load_historical_arrays[maxlen={_maxlen}]")(_rollup_load_case(_maxlen))
+    case(f"RollupTimeDeque.window_ranges[maxlen={_maxlen}]")(_window_ranges_case(_maxlen))
+
+
+# --- history log parsers ---------------------------------------------------
+
+_LOG_DAYS = 7
+_log_dir: Optional[str] = None
+
+
+def _log_tree() -> Tuple[str, datetime]:
+    """A week of 1 min pressure/level logs in ``log_pressurelevel`` layout (created once)."""
+    global _log_dir
+    end = datetime(2024, 11, 8, 12, 0)
+    if _log_dir is None:
+        _log_dir = tempfile.mkdtemp(prefix="bench_logs_")
+        rng = np.random.default_rng(0)
+        day = end - timedelta(days=_LOG_DAYS)
+        day = day.replace(hour=0, minute=0)
+        while day <= end:
+            path = os.path.join(_log_dir, f"{day:%Y}", f"{day:%m}", f"{day:%d}.txt")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            values = rng.normal([70.0, 1.5, 6.0, 1.2], [5.0, 0.2, 0.5, 0.1], size=(1440, 4))
+            with open(path, "w", encoding="utf-8") as f:
+                for minute, (v, p1, p2, p3) in enumerate(values):
+                    dt = day + timedelta(minutes=minute, seconds=15)
+                    f.write(f"{dt:%Y-%m-%d %H:%M:%S}: {v:.2f} L, {p1:.2f} psi, {p2:.2f} psi, {p3:.2f} psi\n")
+            day += timedelta(days=1)
+    return _log_dir, end
+
+
+def _log_paths(log_dir: str) -> List[str]:
+    return sorted(
+        os.path.join(root, name) for root, _dirs, files in os.walk(log_dir) for name in files if name.endswith(".txt")
+    )
+
+
+@case(f"legacy regex history parser[days={_LOG_DAYS}]")
+def _legacy_parser():
+    from bench_log_parser import legacy_parse
+
+    log_dir, end = _log_tree()
+    paths = _log_paths(log_dir)
+    since = end - timedelta(days=_LOG_DAYS)
+    count = len(legacy_parse(paths, since))
+    return (lambda: legacy_parse(paths, since)), count
+
+
+@case(f"LogParser.parse_files[days={_LOG_DAYS}]")
+def _log_parser():
+    from LogQuery import FORMATS
+
+    log_dir, end = _log_tree()
+    paths = _log_paths(log_dir)
+    since = end - timedelta(days=_LOG_DAYS)
+    parser = FORMATS["pressurelevel"].parser
+    count = len(parser.parse_files(paths, since)[0])
+    return (lambda: parser.parse_files(paths, since)), count
+
+
+@case(f"LogQuery.read_range[days={_LOG_DAYS}]")
+def _log_query():
+    from LogQuery import read_range
+
+    log_dir, end = _log_tree()
+    since = end - timedelta(days=_LOG_DAYS)
+    count = len(read_range("pressurelevel", since, end, log_dir=log_dir)[0])
+    return (lambda: read_range("pressurelevel", since, end, log_dir=log_dir)), count
+
+
+# --- RFM serial parsing ----------------------------------------------------
+
+def _flow_lines(count: int) -> List[str]:
+    rng = np.random.default_rng(0)
+    adc = rng.integers(0, 4096, size=(count, 8))
+    flags = rng.integers(0, 10, size=(count, 2))
+    return ["".join(f"{x:04d}" for x in row) + "".join(f"{x:01d}" for x in flag) for row, flag in zip(adc, flags)]
+
+
+@case("RFMserial.is_valid_flow_line")
+def _valid_flow_line():
+    from RFMserial import is_valid_flow_line
+
+    lines = _flow_lines(10_000) + ["", "12ab", "1" * 33]
+
+    def run():
+        for line in lines:
+            is_valid_flow_line(line)
+    return run, len(lines)
+
+
+@case("RFMController.parse_flow_serial_buffer")
+def _parse_flow_buffer():
+    from rfm_controller import RFMController
+
+    controller = SimpleNamespace(pc_input_max=99, arduino_read_max=4095)
+    lines = _flow_lines(10_000)
+    parse = RFMController.parse_flow_serial_buffer
+
+    def run():
+        for line in lines:
+            parse(controller, line)
+    return run, len(lines)
+
+
+# --- plotting helpers ------------------------------------------------------
+
+def _find_peaks_case(maxlen: int) -> Case:
+    def factory():
+        from PressureLevelPlotter import PressureLevelPlotter
+
+        rng = np.random.default_rng(0)
+        data = (np.sin(np.linspace(0, 12 * np.pi, maxlen)) + rng.normal(0, 0.05, maxlen)).tolist()
+        return (lambda: PressureLevelPlotter.find_peaks(None, data)), 1
+    return factory
+
+
+def _date_locator_case(interval_name: str) -> Case:
+    def factory():
+        import matplotlib.dates as mdates
+        from matplotlib.figure import Figure
+
+        from CustomDateLocator import CustomDateLocator
+        from VariousTimeDeque import Interval, MAXLEN
+
+        interval = Interval[interval_name]
+        end = datetime(2024, 11, 8, 12, 0)
+        start = end - timedelta(seconds=MAXLEN * interval.value)
+        ax = Figure().add_subplot()
+        ax.set_xlim(mdates.date2num(start), mdates.date2num(end))
+        locator = CustomDateLocator(interval)
+        ax.xaxis.set_major_locator(locator)
+        return locator, 1
+    return factory
+
+
+def _date_locator_live_case(interval_name: str) -> Case:
+    """A live plot: the view moves by one sample per frame, so no two calls hit the same cache entry."""
+    def factory():
+        import matplotlib.dates as mdates
+
+        from CustomDateLocator import CustomDateLocator
+        from VariousTimeDeque import Interval, MAXLEN
+
+        interval = Interval[interval_name]
+        end = mdates.date2num(datetime(2024, 11, 8, 12, 0))
+        span = MAXLEN * interval.value / 86400
+        frame = interval.value / 86400
+        locator = CustomDateLocator(interval)
+        frames = iter(range(10**9))
+
+        def run():
+            shift = next(frames) * frame
+            locator.tick_values(end - span + shift, end + shift)
+        return run, 1
+    return factory
+
+
+for _maxlen in MAXLEN_SIZES:
+    case(f"PressureLevelPlotter.find_peaks[n={_maxlen}]")(_find_peaks_case(_maxlen))
+for _interval in ("ONE_SECOND", "ONE_MINUTE", "TEN_MINUTES", "ONE_HOUR"):
+    case(f"CustomDateLocator.__call__[{_interval}]")(_date_locator_case(_interval))
+    case(f"CustomDateLocator.tick_values[{_interval},live]")(_date_locator_live_case(_interval))
+
+
+# --- log viewer decimation ------------------------------------------------
+
+_DECIMATION_SAMPLES = 1_000_000  # about two years of 1 min flow/temperature rows
+_DECIMATION_PIXELS = 1000
+
+
+def _decimation_series() -> Tuple[np.ndarray, np.ndarray]:
+    times, values = _samples(_DECIMATION_SAMPLES, numdata=6, step=60.0)
+    return times, np.cumsum(values, axis=0)
+
+
+@case("Decimation.MinMaxPyramid[n=1000000]")
+def _pyramid_build():
+    from Decimation import MinMaxPyramid
+
+    times, values = _decimation_series()
+    return (lambda: MinMaxPyramid(times, values)), 1
+
+
+def _decimation_select_case(method: str) -> Case:
+    def factory():
+        from Decimation import MinMaxPyramid
+
+        times, values = _decimation_series()
+        pyramid = MinMaxPyramid(times, values)
+        # A zoom sequence from the full range down to a few hours
+        spans = [(times[-1] - times[0]) * 0.5 ** k for k in range(12)]
+        centre = times[0] + (times[-1] - times[0]) * 0.37
+
+        def run():
+            for span in spans:
+                pyramid.select(centre - span / 2, centre + span / 2, _DECIMATION_PIXELS, method=method)
+        return run, len(spans)
+    return factory
+
+
+for _method in ("minmax", "lttb"):
+    case(f"Decimation.select[{_method}]")(_decimation_select_case(_method))
+
+
+# --- receiver HTTP handlers ------------------------------------------------
+
+_REQUESTS_PER_CLIENT = 200
+
+
+def _serve(handler_class) -> HTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler_class)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _get(port: int, path: str, count: int, keep_alive: bool) -> None:
+    connection = None
+    for _ in range(count):
+        if connection is None:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        connection.request("GET", path)
+        response = connection.getresponse()
+        response.read()
+        if response.status != 200:
+            raise RuntimeError(f"GET {path} returned {response.status}")
+        if not keep_alive or response.will_close:
+            connection.close()
+            connection = None
+    if connection is not None:
+        connection.close()
+
+
+def _http_case(make_server: Callable[[], HTTPServer], path: str, clients: int, keep_alive: bool = False) -> Case:
+    def factory():
+        server = make_server()
+        port = server.server_address[1]
+
+        def run():
+            # Default handlers log each request to stderr
+            with contextlib.redirect_stderr(io.StringIO()):
+                threads = [
+                    threading.Thread(target=_get, args=(port, path, _REQUESTS_PER_CLIENT, keep_alive))
+                    for _ in range(clients)
+                ]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+        return run, clients * _REQUESTS_PER_CLIENT
+    return factory
+
+
+def _adc_server() -> HTTPServer:
+    try:
+        import ArduinoADCReceiver as receiver
+    except ImportError as e:
+        raise Skip(str(e)) from None
+    mediator = receiver.SerialMediator(dict(receiver._DEFAULT_CONFIG))
+    mediator.process_serial_data("196,259,1070,115\n")
+    return _serve(receiver.make_request_handler(mediator))
+
+
+def _current_server() -> HTTPServer:
+    try:
+        import CurrentReceiver as receiver
+    except ImportError as e:
+        raise Skip(str(e)) from None
+    mediator = receiver.SerialMediator()
+    mediator.process_serial_data("757\n")
+    return _serve(receiver.make_request_handler(mediator))
+
+
+for _clients in (1, 8):
+    case(f"ArduinoADCReceiver GET /Meas[clients={_clients}]")(_http_case(_adc_server, "/Meas", _clients))
+    case(f"CurrentReceiver GET /Meas[clients={_clients}]")(_http_case(_current_server, "/Meas", _clients))
+    case(f"ArduinoADCReceiver GET /Meas[clients={_clients},keepalive]")(
+        _http_case(_adc_server, "/Meas", _clients, keep_alive=True)
+    )
+    case(f"CurrentReceiver GET /Meas[clients={_clients},keepalive]")(
+        _http_case(_current_server, "/Meas", _clients, keep_alive=True)
+    )
+
+
+def _meas_decode_case(binary: bool) -> Case:
+    """Plotter side of one ADC ``/Meas`` reply: the JSON record parse vs the struct-packed fast path."""
+    def factory():
+        try:
+            import ArduinoADCReceiver as receiver
+        except ImportError as e:
+            raise Skip(str(e)) from None
+        from SampleFormat import decode_binary
+
+        mediator = receiver.SerialMediator(dict(receiver._DEFAULT_CONFIG))
+        mediator.process_serial_data("196,259,1070,115\n")
+        fields = ("P_st", "P_pl", "V_pl", "P_pur")
+        replies = [mediator.snapshot.binary_body if binary else mediator.snapshot.body] * 10_000
+
+        def run():
+            for body in replies:
+                if binary:
+                    list(decode_binary(body)[2])
+                else:
+                    record = json.loads(body)
+                    [float(record[field].split(" ")[0]) for field in fields]
+        return run, len(replies)
+    return factory
+
+
+case("ArduinoADCReceiver /Meas decode[json]")(_meas_decode_case(False))
+case("ArduinoADCReceiver /Meas decode[binary]")(_meas_decode_case(True))
+
+
+# --- runner ----------------------------------------------------------------
+
+@dataclass
+class Result:
+    name: str
+    seconds_per_op: Optional[float]
+    skipped: Optional[str] = None
+
+
+def measure(name: str, repeat: int) -> Result:
+    try:
+        run, ops = _CASES[name]()
+    except (Skip, ImportError) as e:
+        return Result(name, None, skipped=str(e))
+    run()  # warm-up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return Result(name, min(timings) / ops)
+
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit} "
+    return f"{seconds / 1e-9:8.2f} ns "
+
+
+def load_baseline(path: str) -> Dict[str, float]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)["results"]
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def save_baseline(path: str, results: List[Result]) -> None:
+    data = {
+        "machine": f"{platform.system()} {platform.machine()} / {platform.processor() or 'unknown cpu'}",
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "results": {r.name: r.seconds_per_op for r in results if r.seconds_per_op is not None},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the monitoring hot-path benchmarks.")
+    parser.add_argument("-k", "--filter", default="", help="only run cases whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per case (best is kept)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON (default: bench/baseline.json)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"regression when slower than baseline × this (default {DEFAULT_THRESHOLD})")
+    parser.add_argument("--save", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--list", action="store_true", help="list the cases and exit")
+    args = parser.parse_args(argv)
+
+    names = [name for name in _CASES if args.filter.lower() in name.lower()]
+    if args.list:
+        print("\n".join(names))
+        return 0
+
+    baseline = {} if args.save else load_baseline(args.baseline)
+    results, regressions = [], []
+    width = max(map(len, names), default=0)
+    print(f"{'case':<{width}}  {'per op':>12}  {'baseline':>12}  ratio")
+    for name in names:
+        result = measure(name, args.repeat)
+        results.append(result)
+        if result.skipped is not None:
+            print(f"{name:<{width}}  skipped ({result.skipped})")
+            continue
+        line = f"{name:<{width}}  {_format_time(result.seconds_per_op)}"
+        reference = baseline.get(name)
+        if reference:
+            ratio = result.seconds_per_op / reference
+            line += f"  {_format_time(reference)}  {ratio:5.2f}x"
+            if ratio > args.threshold:
+                line += "  REGRESSION"
+                regressions.append(name)
+        print(line, flush=True)
+
+    if args.save:
+        if args.filter:
+            # Keep the other cases' numbers when refreshing a subset
+            merged = load_baseline(args.baseline)
+            merged.update({r.name: r.seconds_per_op for r in results if r.seconds_per_op is not None})
+            results = [Result(name, seconds) for name, seconds in merged.items()]
+        save_baseline(args.baseline, results)
+        print(f"Saved baseline to {args.baseline}")
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.threshold}x baseline")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+"""Fixed-record binary data logs written alongside the daily text logs.
+
+``log_<subsystem>/YYYY/MM/DD.bin`` holds a 16-byte header followed by packed
+records of ``(time float64 epoch s, raw[n], cal[n], status uint8)``, or
+``(time, raw[n], status)`` for subsystems that log no calibrated values. Records
+are appended in time order, so the time column doubles as the index: the
+reader memory-maps a day file, binary-searches the requested range and copies
+that slice out as NumPy arrays — no per-line parsing.
+
+``status`` is a bitmask with bit *i* set when device *i* of the plotter was not
+delivering good data when the record was written.
+
+A day file whose header does not match the writer's layout (e.g. written by an
+older version with a ``cal`` column) is renamed to ``DD.old.bin`` and a fresh
+``DD.bin`` is started, so an upgrade mid-day does not fail every append. The
+text log still covers the renamed part of the day.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+from datetime import datetime, timedelta
+from typing import Iterator, Optional, Union
+
+import numpy as np
+
+_MAGIC = b"JSHBLOG1"
+# magic, numdata, bytes per channel value, flags, record size
+_HEADER = struct.Struct("<8sHBBI")
+HEADER_SIZE = _HEADER.size
+# Header flag: records carry no ``cal`` column (files before the flag have one)
+_FLAG_RAW_ONLY = 0x01
+
+STATUS_OK = 0
+
+
+def record_dtype(numdata: int, value_dtype=np.float32, calibrated: bool = True) -> np.dtype:
+    """Packed record layout for ``numdata`` channels, with or without the ``cal`` column."""
+    value_dtype = np.dtype(value_dtype).newbyteorder("<")
+    fields = [("time", "<f8"), ("raw", value_dtype, (numdata,))]
+    if calibrated:
+        fields.append(("cal", value_dtype, (numdata,)))
+    fields.append(("status", "u1"))
+    return np.dtype(fields)
+
+
+def day_path(log_dir: str, day: datetime) -> str:
+    return os.path.join(log_dir, day.strftime("%Y"), day.strftime("%m"), f"{day.strftime('%d')}.bin")
+
+
+def _read_header(file) -> np.dtype:
+    header = file.read(HEADER_SIZE)
+    if len(header) != HEADER_SIZE:
+        raise ValueError("Truncated binary log header")
+    magic, numdata, value_size, flags, record_size = _HEADER.unpack(header)
+    if magic != _MAGIC:
+        raise ValueError("Not a binary data log")
+    value_dtype = {4: np.float32, 8: np.float64}[value_size]
+    dtype = record_dtype(numdata, value_dtype, calibrated=not flags & _FLAG_RAW_ONLY)
+    if dtype.itemsize != record_size:
+        raise ValueError("Binary log record size mismatch")
+    return dtype
+
+
+class BinaryLogWriter:
+    """Append fixed-size records to ``<log_dir>/YYYY/MM/DD.bin``.
+
+    With ``calibrated=False`` the records hold only the raw values, for
+    subsystems whose logged values are not calibrated on this side.
+    """
+
+    def __init__(self, log_dir: str, numdata: int, value_dtype=np.float32, calibrated: bool = True):
+        self.log_dir = log_dir
+        self.numdata = numdata
+        self.calibrated = calibrated
+        self.dtype = record_dtype(numdata, value_dtype, calibrated)
+        self._record = np.zeros(1, dtype=self.dtype)
+        self._checked_path: Optional[str] = None
+
+    def _header(self) -> bytes:
+        value_size = self.dtype["raw"].base.itemsize
+        flags = 0 if self.calibrated else _FLAG_RAW_ONLY
+        return _HEADER.pack(_MAGIC, self.numdata, value_size, flags, self.dtype.itemsize)
+
+    def _prepare(self, path: str) -> None:
+        """Validate an existing day file once: set it aside if its layout differs, drop a torn trailing record."""
+        if self._checked_path == path:
+            return
+        if os.path.isfile(path) and os.path.getsize(path) > 0:
+            with open(path, "r+b") as file:
+                try:
+                    same_layout = _read_header(file) == self.dtype
+                except ValueError:
+                    same_layout = False
+                if same_layout:
+                    body = os.path.getsize(path) - HEADER_SIZE
+                    if body % self.dtype.itemsize:
+                        file.truncate(HEADER_SIZE + body - body % self.dtype.itemsize)
+            if not same_layout:
+                os.replace(path, _set_aside_path(path))
+        self._checked_path = path
+
+    def append(
+        self,
+        timestamp: Union[datetime, float],
+        raw,
+        calibrated=None,
+        status: int = STATUS_OK,
+    ) -> None:
+        if isinstance(timestamp, datetime):
+            day, epoch = timestamp, timestamp.timestamp()
+        else:
+            day, epoch = datetime.fromtimestamp(timestamp), float(timestamp)
+
+        record = self._record[0]
+        record["time"] = epoch
+        record["raw"] = raw
+        if self.calibrated:
+            record["cal"] = raw if calibrated is None else calibrated
+        elif calibrated is not None:
+            raise ValueError("This binary log has no calibrated column")
+        record["status"] = status
+
+        path = day_path(self.log_dir, day)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._prepare(path)
+        with open(path, "ab") as file:
+            if file.tell() == 0:
+                file.write(self._header())
+            file.write(self._record.tobytes())
+
+
+def _set_aside_path(path: str) -> str:
+    """First free ``DD.old.bin``, ``DD.old2.bin``, ... next to ``path``."""
+    stem = os.path.splitext(path)[0]
+    target, n = f"{stem}.old.bin", 1
+    while os.path.exists(target):
+        n += 1
+        target = f"{stem}.old{n}.bin"
+    return target
+
+
+class BinaryLogReader:
+    """Time-range reads over ``<log_dir>/YYYY/MM/DD.bin`` files."""
+
+    def __init__(self, log_dir: str):
+        self.log_dir = log_dir
+
+    def open_day(self, day: datetime) -> Optional[np.ndarray]:
+        """Memory-map one day file as a record array, or ``None`` if absent/empty."""
+        path = day_path(self.log_dir, day)
+        if not os.path.isfile(path):
+            return None
+        with open(path, "rb") as file:
+            dtype = _read_header(file)
+        count = (os.path.getsize(path) - HEADER_SIZE) // dtype.itemsize
+        if count <= 0:
+            return None
+        return np.memmap(path, dtype=dtype, mode="r", offset=HEADER_SIZE, shape=(count,))
+
+    def iter_days(self, start: datetime, end: datetime) -> Iterator[np.ndarray]:
+        """Yield the records of each day file in ``[start, end)``, oldest first (copies)."""
+        start_epoch, end_epoch = start.timestamp(), end.timestamp()
+        day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+        while day <= end:
+            records = self.open_day(day)
+            if records is not None:
+                times = records["time"]
+                lo = int(np.searchsorted(times, start_epoch, side="left"))
+                hi = int(np.searchsorted(times, end_epoch, side="left"))
+                if hi > lo:
+                    yield np.array(records[lo:hi])
+                del records
+            day += timedelta(days=1)
+
+    def read(self, start: datetime, end: datetime) -> Optional[np.ndarray]:
+        """All records with ``start <= time < end`` as one record array.
+
+        Fields: ``time`` (epoch s), ``raw`` / ``cal`` (shape (k, numdata); no
+        ``cal`` in raw-only logs) and ``status``. Returns ``None`` when no binary log covers the range.
+        """
+        chunks = list(self.iter_days(start, end))
+        if not chunks:
+            return None
+        if len({chunk.dtype for chunk in chunks}) > 1:
+            # Days written before and after a switch to raw-only records share every column but ``cal``
+            raw_only = record_dtype(chunks[0]["raw"].shape[1], chunks[0].dtype["raw"].base, calibrated=False)
+            if any(chunk.dtype.descr[:2] != raw_only.descr[:2] for chunk in chunks):
+                raise ValueError("Binary logs in range have different record layouts")
+            chunks = [_without_cal(chunk, raw_only) for chunk in chunks]
+        return np.concatenate(chunks)
+
+
+def _without_cal(records: np.ndarray, dtype: np.dtype) -> np.ndarray:
+    if "cal" not in records.dtype.names:
+        return records
+    out = np.empty(len(records), dtype=dtype)
+    for name in dtype.names:
+        out[name] = records[name]
+    return out
@@ -0,0 +1,83 @@
+"""Cached date tick locator and formatter for the plotters' time axes.
+
+The plotters put ticks every ``step`` seconds, starting from the view minimum
+rounded down to a multiple of ``align`` seconds since (wall-clock) midnight.
+:class:`IntervalDateLocator` computes those positions arithmetically in
+matplotlib date units (days) instead of walking ``datetime`` objects, and
+remembers the result per view interval, so redrawing an unchanged view costs
+a dictionary lookup. :class:`CachedDateFormatter` remembers the label of each
+tick position. Create both once per interval and reuse them across redraws
+(``Axes.clear`` resets the axis' locator, so set them again after clearing).
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Dict, Optional, Tuple
+
+import matplotlib.dates as mdates
+import numpy as np
+from matplotlib.ticker import Formatter, Locator
+
+SECONDS_PER_DAY = 86400
+CACHE_SIZE = 256
+
+
+def interval_ticks(vmin: float, vmax: float, step: float, align: float) -> np.ndarray:
+    """Tick positions (days) every ``step`` s from ``vmin`` rounded down to ``align`` s within its day, up to ``vmax``."""
+    # num2date resolves to microseconds; rounding keeps tick boundaries exact
+    start = round(vmin * SECONDS_PER_DAY, 6)
+    end = round(vmax * SECONDS_PER_DAY, 6)
+    start = math.floor(start) - math.floor(start) % SECONDS_PER_DAY % align
+    if end < start:
+        return np.empty(0)
+    count = int((end - start) // step) + 1
+    return (start + step * np.arange(count)) / SECONDS_PER_DAY
+
+
+class IntervalDateLocator(Locator):
+    """Ticks every ``step`` seconds aligned to ``align`` seconds, memoised per view interval."""
+
+    def __init__(self, step: float, align: Optional[float] = None):
+        self.step = step
+        self.align = step if align is None else align
+        self.hits = 0
+        self._cache: Dict[Tuple[float, float], np.ndarray] = {}
+
+    def __call__(self) -> np.ndarray:
+        vmin, vmax = self.axis.get_view_interval()
+        return self.tick_values(vmin, vmax)
+
+    def tick_values(self, vmin: float, vmax: float) -> np.ndarray:
+        if vmax < vmin:
+            vmin, vmax = vmax, vmin
+        key = (vmin, vmax)
+        ticks = self._cache.get(key)
+        if ticks is not None:
+            self.hits += 1
+            return ticks
+        ticks = self._compute(vmin, vmax)
+        if len(self._cache) >= CACHE_SIZE:
+            self._cache.clear()
+        self._cache[key] = ticks
+        return ticks
+
+    def _compute(self, vmin: float, vmax: float) -> np.ndarray:
+        return interval_ticks(vmin, vmax, self.step, self.align)
+
+
+class CachedDateFormatter(Formatter):
+    """``strftime(fmt)`` tick labels, each position formatted once."""
+
+    def __init__(self, fmt: str):
+        self.fmt = fmt
+        self._labels: Dict[float, str] = {}
+
+    def __call__(self, x: float, pos: Optional[int] = None) -> str:
+        label = self._labels.get(x)
+        if label is None:
+            label = mdates.num2date(x).strftime(self.fmt)
+            if len(self._labels) >= CACHE_SIZE:
+                self._labels.clear()
+            self._labels[x] = label
+        return label
@@ -0,0 +1,169 @@
+"""Level-of-detail decimation for plotting long time series.
+
+Weeks of 1 min logs are tens of thousands of points per channel, far more than
+the axes have pixels. :class:`MinMaxPyramid` precomputes, for every level
+``k``, the index of the minimum and of the maximum sample of each channel in
+each block of ``2**k`` samples. A query for the visible x range picks the
+level whose blocks are about one pixel wide and returns those indices, so a
+zoom or pan costs O(pixels) instead of O(samples) and every pixel column is
+still drawn from its own extremes (single-sample spikes survive).
+``method="lttb"`` instead runs Largest-Triangle-Three-Buckets over a finer
+level, which keeps the trace shape with fewer vertical strokes.
+
+:class:`DecimatedLines` keeps matplotlib lines decimated to their axes' view
+and re-selects on every zoom, pan or resize.
+"""
+
+from __future__ import annotations
+
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+METHODS = ("minmax", "lttb")
+POINTS_PER_PIXEL = 2
+
+
+def lttb(x: np.ndarray, y: np.ndarray, count: int) -> np.ndarray:
+    """Indices of ``count`` points of ``y(x)`` chosen by Largest-Triangle-Three-Buckets.
+
+    The first and last points are kept; every bucket in between keeps the
+    point that forms the largest triangle with the previously kept point and
+    the mean of the next bucket.
+    """
+    n = len(x)
+    if count >= n or count < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, count - 1).astype(np.intp)
+    lo, hi = edges[:-1], edges[1:]
+    sums_x = np.concatenate(([0.0], np.cumsum(x)))
+    sums_y = np.concatenate(([0.0], np.cumsum(y)))
+    # Mean of the following bucket (the last point for the last bucket)
+    next_x = np.append(((sums_x[hi] - sums_x[lo]) / (hi - lo))[1:], x[-1]).tolist()
+    next_y = np.append(((sums_y[hi] - sums_y[lo]) / (hi - lo))[1:], y[-1]).tolist()
+
+    chosen = np.empty(count, dtype=np.intp)
+    chosen[0], chosen[-1] = 0, n - 1
+    xs, ys = x.tolist(), y.tolist()
+    a = 0
+    for bucket, (start, stop) in enumerate(zip(lo.tolist(), hi.tolist())):
+        ax, ay = xs[a], ys[a]
+        dx, dy = ax - next_x[bucket], next_y[bucket] - ay
+        best, best_area = start, -1.0
+        for i in range(start, stop):
+            area = abs(dx * (ys[i] - ay) - (ax - xs[i]) * dy)
+            if area > best_area:
+                best, best_area = i, area
+        chosen[bucket + 1] = a = best
+    return chosen
+
+
+class MinMaxPyramid:
+    """Per-block min/max sample indices of ``values`` at block sizes 2, 4, 8, ...
+
+    ``x`` is the sorted numeric sample position (e.g. matplotlib date
+    numbers); ``values`` has shape ``(n,)`` or ``(n, channels)``.
+    """
+
+    def __init__(self, x, values):
+        self.x = np.asarray(x, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        self.values = values.reshape(len(self.x), -1)
+        self.channels = self.values.shape[1]
+        # levels[k - 1] holds (argmin, argmax), each (blocks, channels), for blocks of 2**k samples
+        self.levels = []
+        low = high = np.broadcast_to(np.arange(len(self.x))[:, None], self.values.shape)
+        while len(low) > 1:
+            low, high = self._merge_pairs(low, high)
+            self.levels.append((low, high))
+
+    def _merge_pairs(self, low: np.ndarray, high: np.ndarray):
+        columns = np.arange(self.channels)
+        paired = len(low) - len(low) % 2
+
+        def merge(indices, better):
+            first, second = indices[0:paired:2], indices[1:paired:2]
+            merged = np.where(better(self.values[second, columns], self.values[first, columns]), second, first)
+            return np.concatenate((merged, indices[paired:]))
+
+        return merge(low, np.less), merge(high, np.greater)
+
+    def select(self, x_min: float, x_max: float, pixels: float, channels: Optional[Sequence[int]] = None,
+               method: str = "minmax") -> List[np.ndarray]:
+        """Sample indices to draw for ``[x_min, x_max]`` on ``pixels`` columns, one array per channel.
+
+        One sample beyond each edge is included so lines run to the axes
+        border. Ranges with at most ``POINTS_PER_PIXEL`` samples per pixel
+        are returned whole.
+        """
+        if method not in METHODS:
+            raise ValueError(f"Unknown decimation method {method!r}, expected one of {METHODS}")
+        channels = range(self.channels) if channels is None else channels
+        pixels = max(int(pixels), 1)
+        start = max(int(np.searchsorted(self.x, x_min, "left")) - 1, 0)
+        stop = min(int(np.searchsorted(self.x, x_max, "right")) + 1, len(self.x))
+        count = stop - start
+        target = POINTS_PER_PIXEL * pixels
+        if count <= target:
+            return [np.arange(start, stop) for _ in channels]
+
+        # LTTB picks from about four min/max candidates per output point
+        blocks = pixels if method == "minmax" else 2 * target
+        level = min(max(int(round(np.log2(count / blocks))), 1), len(self.levels))
+        size = 1 << level
+        low, high = self.levels[level - 1]
+        first, last = start // size, -(-stop // size)
+        # Each block contributes its min and max in time order
+        pairs = np.sort(np.stack((low[first:last], high[first:last]), axis=1), axis=1)
+        candidates = pairs.reshape(-1, self.channels)
+        if method == "minmax":
+            return [candidates[:, channel] for channel in channels]
+        selected = []
+        for channel in channels:
+            indices = candidates[:, channel]
+            selected.append(indices[lttb(self.x[indices], self.values[indices, channel], target)])
+        return selected
+
+
+class DecimatedLines:
+    """Keep matplotlib ``lines`` showing ``values`` decimated to their axes' visible x range.
+
+    ``lines[i]`` draws channel ``i`` of ``values`` against ``x`` (numbers or
+    ``datetime64``). The lines may sit on twin axes sharing one x axis.
+    Re-selection happens on ``xlim_changed`` and figure resize; the
+    callbacks hold this object, so it lives as long as the figure.
+    """
+
+    def __init__(self, x, values, lines, method: str = "minmax"):
+        self.x = np.asarray(x)
+        self.values = np.asarray(values, dtype=np.float64).reshape(len(self.x), -1)
+        numeric = self.x
+        if np.issubdtype(self.x.dtype, np.datetime64):
+            from matplotlib import dates as mdates
+
+            numeric = mdates.date2num(self.x)
+        self.pyramid = MinMaxPyramid(numeric, self.values)
+        self.lines = list(lines)
+        self.method = method
+        self._views = {}  # axes -> (xlim, pixels) last selected, so shared-x siblings do not repeat it
+
+        axes = list(dict.fromkeys(line.axes for line in self.lines))
+        for ax in axes:
+            ax.callbacks.connect("xlim_changed", lambda ax: self.update())
+        if axes:
+            axes[0].figure.canvas.mpl_connect("resize_event", lambda event: self.update())
+        self.update()
+
+    def update(self) -> None:
+        """Select the points of every line for its axes' current view."""
+        by_axes = {}
+        for channel, line in enumerate(self.lines):
+            by_axes.setdefault(line.axes, []).append(channel)
+        for ax, channels in by_axes.items():
+            view = (tuple(ax.get_xlim()), int(ax.bbox.width))
+            if self._views.get(ax) == view:
+                continue
+            self._views[ax] = view
+            selected = self.pyramid.select(*view[0], view[1], channels, self.method)
+            for channel, indices in zip(channels, selected):
+                self.lines[channel].set_data(self.x[indices], self.values[indices, channel])
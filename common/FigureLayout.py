@@ -0,0 +1,93 @@
+"""Debounced window resize handling for the plotter figures.
+
+Dragging a window edge sends dozens of ``<Configure>`` events per second, and
+a binding on the root also receives them for every child widget.
+:class:`FigureLayout` ignores the child events and waits until the root width
+has stopped changing for ``RESIZE_DEBOUNCE_MS`` before calling back once.
+
+Font sizes follow the window width (as before, ``max(8, width // 75)``) but
+are set on the figure's own artists instead of the global ``plt.rcParams``,
+and the ``tight_layout`` result is cached per figure-size bucket and font
+size, so returning to a size seen before is a ``subplots_adjust`` call.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, Tuple
+
+RESIZE_DEBOUNCE_MS = 150
+LAYOUT_BUCKET_PX = 40
+DEFAULT_WIDTH = 800
+
+
+def font_sizes(width: int) -> Dict[str, float]:
+    """Font sizes for a window ``width`` pixels wide."""
+    base = max(8, width // 75)
+    return {"font": base, "label": base, "title": base, "tick": base * 0.8, "legend": base * 0.9}
+
+
+class FigureLayout:
+    """Debounce ``master``'s resizes for ``figure`` and apply width-dependent fonts and layout.
+
+    Bind ``configure`` to the root ``<Configure>`` event. ``on_settled`` is
+    called on the Tk thread once the width has settled; it should arrange for
+    :meth:`relayout` to run where the figure is drawn and request a redraw.
+    Call :meth:`apply_fonts` after rebuilding axes, since ``Axes.clear``
+    resets label and tick fonts.
+    """
+
+    def __init__(self, master, figure, on_settled: Callable[[], object], delay_ms: int = RESIZE_DEBOUNCE_MS):
+        self.master = master
+        self.figure = figure
+        self.on_settled = on_settled
+        self.delay_ms = delay_ms
+        self.width = DEFAULT_WIDTH
+        self.sizes = font_sizes(self.width)
+        self.relayouts = 0
+        self._layouts: Dict[Tuple[int, int, float], Dict[str, float]] = {}
+        self._pending = None
+
+    def configure(self, event) -> None:
+        if event.widget is not self.master or event.width == self.width:
+            return
+        self.width = event.width
+        if self._pending is not None:
+            self.master.after_cancel(self._pending)
+        self._pending = self.master.after(self.delay_ms, self._settled)
+
+    def _settled(self) -> None:
+        self._pending = None
+        self.sizes = font_sizes(self.width)
+        self.on_settled()
+
+    def apply_fonts(self) -> None:
+        """Set the current font sizes on every axes' labels, tick labels, texts and legend."""
+        sizes = self.sizes
+        for ax in self.figure.axes:
+            ax.xaxis.label.set_fontsize(sizes["label"])
+            ax.yaxis.label.set_fontsize(sizes["label"])
+            ax.title.set_fontsize(sizes["title"])
+            ax.tick_params(labelsize=sizes["tick"])
+            for text in ax.texts:
+                text.set_fontsize(sizes["font"])
+            legend = ax.get_legend()
+            if legend is not None:
+                for text in legend.get_texts():
+                    text.set_fontsize(sizes["legend"])
+
+    def relayout(self) -> None:
+        """Apply the fonts, then the cached layout for the current figure size (``tight_layout`` on a miss)."""
+        self.apply_fonts()
+        width, height = self.figure.canvas.get_width_height()
+        key = (width // LAYOUT_BUCKET_PX, height // LAYOUT_BUCKET_PX, self.sizes["font"])
+        params = self._layouts.get(key)
+        if params is None:
+            self.figure.tight_layout(pad=1.0)
+            self.relayouts += 1
+            subplotpars = self.figure.subplotpars
+            self._layouts[key] = {
+                "left": subplotpars.left, "right": subplotpars.right,
+                "bottom": subplotpars.bottom, "top": subplotpars.top,
+            }
+        else:
+            self.figure.subplots_adjust(**params)
@@ -0,0 +1,221 @@
+"""Summary sidecar index for the daily text data logs.
+
+Next to every ``DD.txt`` a ``DD.idx.json`` holds the file's first and last
+timestamp, row count, per-channel min / max / mean, the largest gap between
+consecutive rows and the byte offset at which each hour starts. ``size`` is
+the number of log bytes the summary covers: a stale sidecar is caught up by
+scanning only the new tail, and rebuilt from scratch if the log shrank. A
+value logged as missing (dashes, see ``MinuteLog``) is left out of its
+channel's statistics and counted in ``missing``.
+
+The plotters update the sidecar from ``save_log`` as each line is written.
+To index logs written before the sidecar existed::
+
+    python common/LogIndex.py log_pressurelevel log_flowtemp log_current
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import re
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+_VERSION = 1
+_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+_LINE_RE = re.compile(r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}): (.*)$")
+_NUMBER_RE = re.compile(r"-?\d+(?:\.\d+)?")
+_DAY_FILE_RE = re.compile(r"^\d{2}\.txt$")
+
+
+def sidecar_path(log_path: str) -> str:
+    return os.path.splitext(log_path)[0] + ".idx.json"
+
+
+@dataclass
+class LogSummary:
+    """Running summary of one daily log file (timestamps as written in the log)."""
+
+    size: int = 0
+    rows: int = 0
+    first: Optional[str] = None
+    last: Optional[str] = None
+    max_gap: float = 0.0
+    minimum: List[float] = field(default_factory=list)
+    maximum: List[float] = field(default_factory=list)
+    total: List[float] = field(default_factory=list)
+    missing: List[int] = field(default_factory=list)
+    hour_offsets: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def first_time(self) -> Optional[datetime]:
+        return None if self.first is None else datetime.fromisoformat(self.first)
+
+    @property
+    def last_time(self) -> Optional[datetime]:
+        return None if self.last is None else datetime.fromisoformat(self.last)
+
+    @property
+    def mean(self) -> List[float]:
+        missing = self.missing or [0] * len(self.total)
+        return [total / (self.rows - gaps) if self.rows > gaps else math.nan
+                for total, gaps in zip(self.total, missing)]
+
+    def add(self, offset: int, timestamp: str, values: Sequence[float]) -> None:
+        """Fold in one row that starts at byte ``offset`` of the log."""
+        if self.minimum and len(values) != len(self.minimum):
+            return  # not this file's layout
+        if not self.minimum:
+            self.minimum = [math.nan] * len(values)
+            self.maximum = [math.nan] * len(values)
+            self.total = [0.0] * len(values)
+        if not self.missing:
+            self.missing = [0] * len(values)
+        for i, value in enumerate(values):
+            if math.isnan(value):
+                self.missing[i] += 1
+                continue
+            # NaN until the channel's first measured value
+            self.minimum[i] = value if math.isnan(self.minimum[i]) else min(self.minimum[i], value)
+            self.maximum[i] = value if math.isnan(self.maximum[i]) else max(self.maximum[i], value)
+            self.total[i] += value
+
+        if self.last is not None:
+            gap = (datetime.fromisoformat(timestamp) - datetime.fromisoformat(self.last)).total_seconds()
+            self.max_gap = max(self.max_gap, gap)
+        if self.first is None:
+            self.first = timestamp
+        self.last = timestamp
+        self.rows += 1
+        self.hour_offsets.setdefault(timestamp[11:13], offset)
+
+    def scan(self, log_path: str) -> None:
+        """Fold in every line from byte ``size`` to the end of ``log_path``."""
+        with open(log_path, "rb") as log_file:
+            log_file.seek(self.size)
+            offset = self.size
+            for raw in log_file:
+                match = _LINE_RE.match(raw.decode("utf-8", errors="replace").strip())
+                if match:
+                    values = [_field_value(text) for text in match.group(2).split(", ")]
+                    if not all(math.isnan(value) for value in values):  # gap lines hold no row
+                        self.add(offset, match.group(1), values)
+                offset += len(raw)
+        self.size = offset
+
+
+def _field_value(text: str) -> float:
+    """The number in one log field, or NaN for a field logged as missing."""
+    number = _NUMBER_RE.search(text)
+    return math.nan if number is None else float(number.group())
+
+
+def load_summary(log_path: str) -> Optional[LogSummary]:
+    """The sidecar as stored (possibly stale), or ``None`` if missing or unreadable."""
+    try:
+        with open(sidecar_path(log_path), "r", encoding="utf-8") as f:
+            raw = json.load(f)
+        if raw.pop("version", None) != _VERSION:
+            return None
+        return LogSummary(**raw)
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def save_summary(log_path: str, summary: LogSummary) -> None:
+    path = sidecar_path(log_path)
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": _VERSION, **asdict(summary)}, f)
+    os.replace(temp_path, path)
+
+
+def cached_summary(log_path: str) -> Optional[LogSummary]:
+    """The sidecar only if it covers the whole log; never scans the log."""
+    summary = load_summary(log_path)
+    try:
+        if summary is not None and summary.size == os.path.getsize(log_path):
+            return summary
+    except OSError:
+        pass
+    return None
+
+
+def outside_range(log_path: str, since: datetime, until: Optional[datetime] = None) -> bool:
+    """True when an up-to-date sidecar shows ``log_path`` has no rows in ``[since, until)``."""
+    summary = cached_summary(log_path)
+    if summary is None:
+        return False
+    if summary.rows == 0:
+        return True
+    return summary.last_time < since or (until is not None and summary.first_time >= until)
+
+
+def read_summary(log_path: str, write: bool = True) -> LogSummary:
+    """Up-to-date summary of ``log_path``, scanning only what the sidecar does not cover.
+
+    With ``write`` the refreshed sidecar is stored back (best effort).
+    """
+    summary = load_summary(log_path) or LogSummary()
+    size = os.path.getsize(log_path)
+    if summary.size > size:
+        summary = LogSummary()
+    if summary.size < size:
+        summary.scan(log_path)
+        if write:
+            try:
+                save_summary(log_path, summary)
+            except OSError:
+                pass
+    return summary
+
+
+def rebuild_summary(log_path: str) -> LogSummary:
+    summary = LogSummary()
+    summary.scan(log_path)
+    save_summary(log_path, summary)
+    return summary
+
+
+class LogIndexWriter:
+    """Keeps the sidecar of the day file being appended to in step with ``save_log``."""
+
+    def __init__(self):
+        self._path: Optional[str] = None
+        self._summary: Optional[LogSummary] = None
+
+    def record(self, log_path: str, offset: int, timestamp: datetime, values: Sequence[float]) -> None:
+        """Call after appending the line for ``values`` at byte ``offset`` of ``log_path``."""
+        summary = self._summary if self._path == log_path else None
+        if summary is None or summary.size != offset:
+            # New day or someone else touched the file: catch up from the log itself
+            summary = read_summary(log_path, write=False)
+        else:
+            summary.add(offset, timestamp.strftime(_TIME_FORMAT), values)
+            summary.size = os.path.getsize(log_path)
+        save_summary(log_path, summary)
+        self._path, self._summary = log_path, summary
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Rebuild DD.idx.json sidecars for daily data logs.")
+    parser.add_argument("log_dirs", nargs="+", help="log_<subsystem> directories (searched recursively)")
+    args = parser.parse_args(argv)
+
+    rebuilt = 0
+    for log_dir in args.log_dirs:
+        for root, _dirs, files in os.walk(log_dir):
+            for name in sorted(files):
+                if _DAY_FILE_RE.match(name):
+                    summary = rebuild_summary(os.path.join(root, name))
+                    print(f"{os.path.join(root, name)}: {summary.rows} rows, {summary.first} .. {summary.last}")
+                    rebuilt += 1
+    print(f"Rebuilt {rebuilt} sidecar(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""Fast reader for the 1 min text data logs.
+
+Every line is ``YYYY-MM-DD HH:MM:SS: v1[ unit], v2[ unit], ...``: the
+timestamp is fixed-width and the body is a fixed number of numbers. Instead of
+running a regex and ``strptime`` per line, :class:`LogParser` reads a file
+backwards in blocks, validates a whole block at once with byte masks, parses
+the timestamps with one ``datetime64`` conversion and the numbers with one
+``np.fromstring`` call, and stops once the block is older than the window.
+Lines the fast path rejects are retried with the caller's regex. In the
+one-line-per-minute layout (see ``MinuteLog``) a value written as dashes reads
+as NaN, and gap lines (every value dashes) are skipped.
+"""
+
+from __future__ import annotations
+
+import re
+import warnings
+from datetime import datetime, timedelta
+from typing import Callable, Iterable, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+from MinuteLog import GAP_FIELD
+
+_BLOCK_SIZE = 1 << 16
+_TIMESTAMP_WIDTH = 19  # "YYYY-MM-DD HH:MM:SS"
+_NAIVE_EPOCH = datetime(1970, 1, 1)
+
+# Expected prefix bytes; 0 marks a digit position.
+_PREFIX = np.frombuffer(b"\0\0\0\0-\0\0-\0\0 \0\0:\0\0:\0\0: ", dtype=np.uint8)
+_PREFIX_DIGIT = _PREFIX == 0
+
+_BODY_ALLOWED = np.zeros(256, dtype=bool)
+_BODY_ALLOWED[np.frombuffer(b"0123456789.- \0na", dtype=np.uint8)] = True
+_GAP = GAP_FIELD.encode()
+
+
+def naive_seconds(dt: datetime) -> float:
+    return (dt - _NAIVE_EPOCH).total_seconds()
+
+
+def local_epoch(naive: np.ndarray) -> np.ndarray:
+    """Naive local wall-clock seconds → epoch seconds (inverse of ``local_datetime64``)."""
+    naive = np.asarray(naive, dtype=np.float64)
+    if len(naive) == 0:
+        return naive
+
+    def convert(seconds: float) -> float:
+        return (_NAIVE_EPOCH + timedelta(seconds=float(seconds))).timestamp()
+
+    first = convert(naive[0]) - naive[0]
+    if first == convert(naive[-1]) - naive[-1]:
+        return naive + first
+    # The range spans a DST change
+    return np.array([convert(seconds) for seconds in naive])
+
+
+def _blocks_from_end(path: str) -> Iterator[bytes]:
+    """Yield whole-line chunks of ``path``, newest block first."""
+    with open(path, "rb") as file:
+        file.seek(0, 2)
+        position = file.tell()
+        head = b""
+        while position > 0:
+            size = min(_BLOCK_SIZE, position)
+            position -= size
+            file.seek(position)
+            data = file.read(size) + head
+            if position > 0:
+                # The first line may continue in the previous block
+                cut = data.find(b"\n")
+                if cut < 0:
+                    head = data
+                    continue
+                head, data = data[:cut], data[cut + 1:]
+            yield data
+
+
+def _blocks_from(path: str, offset: int = 0) -> Iterator[bytes]:
+    """Yield whole-line chunks of ``path`` from byte ``offset`` on, oldest first."""
+    with open(path, "rb") as file:
+        file.seek(offset)
+        tail = b""
+        while True:
+            data = file.read(_BLOCK_SIZE)
+            if not data:
+                if tail:
+                    yield tail
+                return
+            data = tail + data
+            cut = data.rfind(b"\n")
+            if cut < 0:
+                tail = data
+                continue
+            tail = data[cut + 1:]
+            yield data[:cut + 1]
+
+
+class LogParser:
+    """Parse data log lines with ``ncols`` numbers into (times, values) arrays.
+
+    ``units`` are the literal unit suffixes written after the numbers (e.g.
+    ``(" L", " psi")``). ``line_re`` is the strict per-line regex whose groups
+    are (timestamp, value 1, ..., value ncols); it is only used as a fallback
+    for lines the fast path rejects.
+    """
+
+    def __init__(self, ncols: int, units: Sequence[str] = (), line_re: Optional[re.Pattern] = None):
+        self.ncols = ncols
+        self.units = [unit.encode() for unit in units]
+        self.line_re = line_re
+
+    def parse_block(self, block: bytes) -> Tuple[np.ndarray, np.ndarray]:
+        """Parse complete lines → (naive local seconds, values with shape (n, ncols)), file order."""
+        block = block.replace(b"\r", b"")
+        cleaned = block
+        for unit in self.units:
+            cleaned = cleaned.replace(unit, b"")
+        cleaned = cleaned.replace(b",", b"").replace(_GAP, b"nan")
+
+        lines = cleaned.split(b"\n")
+        if not lines or lines[-1] == b"":
+            lines = lines[:-1]
+        if not lines:
+            return np.empty(0), np.empty((0, self.ncols))
+
+        strings = np.array(lines)
+        if strings.itemsize < len(_PREFIX) + 2:
+            strings = strings.astype(f"S{len(_PREFIX) + 2}")
+        table = strings.view(np.uint8).reshape(len(lines), strings.itemsize)
+        prefix = table[:, :len(_PREFIX)]
+        body = table[:, len(_PREFIX) - 1:]
+        ok = np.where(_PREFIX_DIGIT, (prefix >= 0x30) & (prefix <= 0x39), prefix == _PREFIX).all(axis=1)
+        ok &= _BODY_ALLOWED[body].all(axis=1)
+        ok &= (body == 0x20).sum(axis=1) == self.ncols
+
+        good = np.flatnonzero(ok)
+        times = np.empty(len(lines))
+        values = np.full((len(lines), self.ncols), np.nan)
+        if len(good):
+            stamps = table[good, :_TIMESTAMP_WIDTH].copy()
+            stamps[:, 10] = ord("T")
+            numbers = body[good].copy()
+            numbers[numbers == 0] = 0x20
+            try:
+                times[good] = stamps.view(f"S{_TIMESTAMP_WIDTH}").ravel().astype("datetime64[s]").astype(np.int64)
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore", DeprecationWarning)
+                    parsed = np.fromstring(numbers.tobytes(), sep=" ")
+            except ValueError:  # an impossible date such as month 13
+                parsed = None
+            if parsed is not None and len(parsed) == len(good) * self.ncols:
+                values[good] = parsed.reshape(len(good), self.ncols)
+            else:  # a malformed field somewhere; retry the block line by line
+                ok[:] = False
+        gap = ok & np.isnan(values).all(axis=1)
+        ok &= ~gap
+
+        bad = np.flatnonzero(~ok & ~gap)
+        if len(bad):
+            originals = block.split(b"\n")
+            for index in bad:
+                parsed_line = self._parse_line_strict(originals[index])
+                if parsed_line is not None:
+                    times[index], values[index] = parsed_line
+                    ok[index] = True
+
+        return times[ok], values[ok]
+
+    def _parse_line_strict(self, line: bytes) -> Optional[Tuple[float, list[float]]]:
+        if self.line_re is None:
+            return None
+        match = self.line_re.match(line.decode("utf-8", errors="replace").strip())
+        if not match:
+            return None
+        try:
+            dt = datetime.strptime(match.group(1), "%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            return None
+        return naive_seconds(dt), [float(match.group(i)) for i in range(2, 2 + self.ncols)]
+
+    def iter_blocks(self, path: str, offset: int = 0) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Parse ``path`` forward from byte ``offset`` → (naive local seconds, values) per block."""
+        for block in _blocks_from(path, offset):
+            yield self.parse_block(block)
+
+    def _parse_file_naive(self, path: str, since: float, until: Optional[float]) -> Tuple[np.ndarray, np.ndarray]:
+        chunks = []
+        for block in _blocks_from_end(path):
+            times, values = self.parse_block(block)
+            chunks.append((times, values))
+            if len(times) and times.min() < since:
+                break
+        if not chunks:
+            return np.empty(0), np.empty((0, self.ncols))
+
+        chunks.reverse()
+        times = np.concatenate([times for times, _ in chunks])
+        values = np.concatenate([values for _, values in chunks])
+        keep = times >= since
+        if until is not None:
+            keep &= times < until
+        return times[keep], values[keep]
+
+    def parse_files(
+        self,
+        paths: Iterable[str],
+        since: datetime,
+        until: Optional[datetime] = None,
+        on_error: Optional[Callable[[str, OSError], None]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Records with ``since <= time < until`` from daily ``paths`` (naive local bounds).
+
+        Returns epoch seconds sorted ascending and values with shape (n, ncols)
+        in log column order. An unreadable file is reported to ``on_error``
+        and skipped (re-raised when no handler is given).
+        """
+        since_s = naive_seconds(since)
+        until_s = None if until is None else naive_seconds(until)
+        parts = []
+        for path in paths:
+            try:
+                parts.append(self._parse_file_naive(path, since_s, until_s))
+            except OSError as e:
+                if on_error is None:
+                    raise
+                on_error(path, e)
+        if not parts:
+            return np.empty(0), np.empty((0, self.ncols))
+
+        naive = np.concatenate([times for times, _ in parts])
+        values = np.concatenate([values for _, values in parts])
+        if len(naive) > 1 and np.any(np.diff(naive) < 0):
+            order = np.argsort(naive, kind="stable")
+            naive, values = naive[order], values[order]
+        return local_epoch(naive), values
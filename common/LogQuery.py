@@ -0,0 +1,256 @@
+"""Streaming time-range queries over the ``log_<subsystem>/YYYY/MM/DD.txt`` data logs.
+
+:func:`iter_range` walks only the day files whose path (and, when current,
+``DD.idx.json`` sidecar) can hold rows in the range, seeks into the first of
+them (directly to the minute in one-line-per-minute files), and yields
+``(epoch times, values)`` blocks of at most ``chunk_rows`` rows, so reading
+months of logs runs in constant memory. Rows are yielded in file order; the
+logs are append-only and therefore already time-ordered.
+
+Export a range to CSV::
+
+    python common/LogQuery.py pressurelevel 2024-11-01 "2024-11-08 12:00" -o out.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import re
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterator, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from LogIndex import cached_summary, outside_range
+from LogParser import LogParser, naive_seconds, local_epoch
+from MinuteLog import minute_offset
+from paths import writable_path
+
+CHUNK_ROWS = 8192
+_BISECT_STOP = 1 << 16  # narrow the first file to one read block, the parser filters the rest
+
+
+@dataclass(frozen=True)
+class LogFormat:
+    """Layout of one subsystem's data log."""
+
+    dir_name: str
+    columns: Tuple[str, ...]
+    parser: LogParser
+
+
+FORMATS = {
+    "pressurelevel": LogFormat(
+        "log_pressurelevel",
+        ("V_plant", "P_plant", "P_storage", "P_purifier"),
+        LogParser(4, units=(" L", " V", " psi"), line_re=re.compile(
+            r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}): "
+            r"(-?\d+\.\d{2}) [VL], (-?\d+\.\d{2}) psi, (-?\d+\.\d{2}) psi, (-?\d+\.\d{2}) psi$"
+        )),
+    ),
+    "flowtemp": LogFormat(
+        "log_flowtemp",
+        ("Tip", "Shield", "Bypass", "Pumping", "Head", "ColdTip"),
+        LogParser(6, line_re=re.compile(
+            r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}): "
+            r"(-?\d+\.\d{2}), (-?\d+\.\d{2}), (-?\d+\.\d{2}), (-?\d+\.\d{2}), "
+            r"(-?\d+\.\d{2}), (-?\d+\.\d{2})$"
+        )),
+    ),
+    "current": LogFormat(
+        "log_current",
+        ("Current",),
+        LogParser(1, units=(" A",), line_re=re.compile(
+            r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}): (-?\d+\.\d{2}) A$"
+        )),
+    ),
+}
+
+
+def _format(subsystem: Union[str, LogFormat]) -> LogFormat:
+    if isinstance(subsystem, LogFormat):
+        return subsystem
+    try:
+        return FORMATS[subsystem]
+    except KeyError:
+        raise ValueError(f"Unknown log subsystem: {subsystem}") from None
+
+
+def _day_path(log_dir: str, day: datetime) -> str:
+    return os.path.join(log_dir, f"{day.year:04d}", f"{day.month:02d}", f"{day.day:02d}.txt")
+
+
+def day_files(log_dir: str, start: datetime, end: Optional[datetime] = None) -> Iterator[str]:
+    """Daily log files that may hold rows in ``[start, end)``, oldest first.
+
+    Days are selected by path; a current ``DD.idx.json`` sidecar additionally
+    rules out days without rows in the range.
+    """
+    if not os.path.isdir(log_dir):
+        return
+
+    current_day = start.date()
+    end_day = (end or datetime.now()).date()
+    one_day = timedelta(days=1)
+
+    while current_day <= end_day:
+        path = _day_path(log_dir, current_day)
+        if os.path.isfile(path) and not outside_range(path, start, end):
+            yield path
+        current_day += one_day
+
+
+def _line_seconds(line: bytes) -> Optional[float]:
+    try:
+        return naive_seconds(datetime.strptime(line[:19].decode("ascii"), "%Y-%m-%d %H:%M:%S"))
+    except (UnicodeDecodeError, ValueError):
+        return None
+
+
+def first_offset(path: str, start: datetime) -> int:
+    """Byte offset of a line boundary at or before the first row at/after ``start``.
+
+    A one-line-per-minute file is entered at the line for ``start``'s minute;
+    otherwise the sidecar's hour offsets are used when current, and failing
+    that the file is bisected by bytes down to one read block.
+    """
+    offset = minute_offset(path, start)
+    if offset is not None:
+        return offset
+
+    summary = cached_summary(path)
+    if summary is not None:
+        hour = f"{start.hour:02d}"
+        later = [offset for key, offset in summary.hour_offsets.items() if key >= hour]
+        return min(later, default=summary.size)
+
+    target = naive_seconds(start)
+    with open(path, "rb") as file:
+        lo, hi = 0, os.path.getsize(path)
+        # Invariant: every row before ``lo`` is older than ``start``.
+        while hi - lo > _BISECT_STOP:
+            mid = (lo + hi) // 2
+            file.seek(mid)
+            file.readline()
+            line_start = file.tell()
+            seconds = _line_seconds(file.readline())
+            if seconds is None:
+                break
+            if seconds < target:
+                lo = line_start
+            else:
+                hi = mid
+    return lo
+
+
+def _blocks_in_range(
+    parser: LogParser, log_dir: str, start: datetime, end: Optional[datetime]
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """(naive seconds, values) blocks of rows in ``[start, end)``, stopping past ``end``."""
+    since = naive_seconds(start)
+    until = np.inf if end is None else naive_seconds(end)
+    first_path = _day_path(log_dir, start)
+    for path in day_files(log_dir, start, end):
+        offset = first_offset(path, start) if path == first_path else 0
+        for times, values in parser.iter_blocks(path, offset):
+            keep = (times >= since) & (times < until)
+            if keep.any():
+                yield times[keep], values[keep]
+            if len(times) and times.min() >= until:
+                return
+
+
+def iter_range(
+    subsystem: Union[str, LogFormat],
+    start: datetime,
+    end: Optional[datetime] = None,
+    log_dir: Optional[str] = None,
+    chunk_rows: int = CHUNK_ROWS,
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Yield ``(epoch seconds, values (n, ncols))`` blocks for rows in ``[start, end)``.
+
+    ``start`` / ``end`` are naive local times, as written in the logs.
+    ``log_dir`` defaults to the subsystem's directory next to the app.
+    """
+    log_format = _format(subsystem)
+    parser = log_format.parser
+    if log_dir is None:
+        log_dir = writable_path(log_format.dir_name)
+
+    pending_times = np.empty(0)
+    pending_values = np.empty((0, parser.ncols))
+    for times, values in _blocks_in_range(parser, log_dir, start, end):
+        pending_times = np.concatenate([pending_times, times])
+        pending_values = np.concatenate([pending_values, values])
+        while len(pending_times) >= chunk_rows:
+            yield local_epoch(pending_times[:chunk_rows]), pending_values[:chunk_rows]
+            pending_times = pending_times[chunk_rows:]
+            pending_values = pending_values[chunk_rows:]
+
+    if len(pending_times):
+        yield local_epoch(pending_times), pending_values
+
+
+def read_range(
+    subsystem: Union[str, LogFormat],
+    start: datetime,
+    end: Optional[datetime] = None,
+    log_dir: Optional[str] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """All rows in ``[start, end)`` as one ``(epoch seconds, values)`` pair."""
+    log_format = _format(subsystem)
+    chunks = list(iter_range(log_format, start, end, log_dir))
+    if not chunks:
+        return np.empty(0), np.empty((0, log_format.parser.ncols))
+    return np.concatenate([t for t, _ in chunks]), np.concatenate([v for _, v in chunks])
+
+
+def read_files(paths: Sequence[str], subsystem: Union[str, LogFormat]) -> Tuple[np.ndarray, np.ndarray]:
+    """Every row of the given log files (any location), in the order given."""
+    parser = _format(subsystem).parser
+    times, values = [np.empty(0)], [np.empty((0, parser.ncols))]
+    for path in paths:
+        for block_times, block_values in parser.iter_blocks(path):
+            times.append(block_times)
+            values.append(block_values)
+    return local_epoch(np.concatenate(times)), np.concatenate(values)
+
+
+def write_csv(rows: Iterator[Tuple[np.ndarray, np.ndarray]], columns: Sequence[str], out) -> int:
+    """Write ``time,<columns>`` CSV from :func:`iter_range` blocks; returns the row count."""
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(["time", *columns])
+    count = 0
+    for times, values in rows:
+        stamps = [datetime.fromtimestamp(t).strftime("%Y-%m-%d %H:%M:%S") for t in times.tolist()]
+        writer.writerows([stamp, *row] for stamp, row in zip(stamps, values.tolist()))
+        count += len(stamps)
+    return count
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Export a time range of a data log to CSV.")
+    parser.add_argument("subsystem", choices=sorted(FORMATS))
+    parser.add_argument("start", type=datetime.fromisoformat, help="e.g. 2024-11-01 or '2024-11-01 12:00'")
+    parser.add_argument("end", nargs="?", type=datetime.fromisoformat, help="exclusive; default: now")
+    parser.add_argument("--log-dir", help="default: ./log_<subsystem>")
+    parser.add_argument("-o", "--output", help="CSV file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    log_format = FORMATS[args.subsystem]
+    log_dir = args.log_dir or os.path.join(os.getcwd(), log_format.dir_name)
+    rows = iter_range(log_format, args.start, args.end, log_dir)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as out:
+            count = write_csv(rows, log_format.columns, out)
+        print(f"Wrote {count} row(s) to {args.output}")
+    else:
+        write_csv(rows, log_format.columns, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
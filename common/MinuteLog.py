@@ -0,0 +1,121 @@
+"""One fixed-width line per clock minute in the daily text data logs.
+
+With wall-clock-aligned buckets the plotters log every 1 min bucket at its
+minute boundary. :class:`MinuteLogWriter` zero-pads each number to a fixed
+width and fills minutes without data with gap lines (numbers replaced by
+dashes), so line ``k`` of ``DD.txt`` is minute ``k`` of the day and starts at
+byte ``k × line width``: :func:`minute_offset` reaches any minute with one
+seek. Zero-padded numbers still match the regular log line patterns; gap
+lines match none of them and are skipped by every reader. A single value
+that was not measured (NaN) is written as dashes in its own field and reads
+back as NaN.
+
+    2024-11-01 10:52:00: 000041.18 L, 000000.51 psi, 000006.73 psi, 000001.20 psi
+    2024-11-01 10:53:00: --------- L, --------- psi, --------- psi, --------- psi
+"""
+
+from __future__ import annotations
+
+import math
+import os
+from datetime import datetime, timedelta
+from typing import Optional, Sequence
+
+FIELD_WIDTH = 9  # "-00001.23" .. "999999.99"
+GAP_FIELD = "-" * FIELD_WIDTH
+_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _minute_of_day(timestamp: datetime) -> int:
+    return timestamp.hour * 60 + timestamp.minute
+
+
+def _day_start(timestamp: datetime) -> datetime:
+    return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _stamp(timestamp: datetime) -> bytes:
+    return timestamp.strftime(_TIME_FORMAT).encode("ascii")
+
+
+class MinuteLogWriter:
+    """Append fixed-width minute lines; ``units`` is the suffix written after each number."""
+
+    def __init__(self, units: Sequence[str]):
+        self.units = tuple(units)
+        # Bytes per line on disk (text mode writes os.linesep)
+        line = self.format_line(datetime(2000, 1, 1), [0.0] * len(self.units))
+        self.width = len(line) - 1 + len(os.linesep)
+
+    def format_line(self, timestamp: datetime, values: Sequence[float]) -> str:
+        body = ", ".join(
+            (GAP_FIELD if math.isnan(value) else f"{value:0{FIELD_WIDTH}.2f}") + unit
+            for value, unit in zip(values, self.units)
+        )
+        return f"{timestamp.strftime(_TIME_FORMAT)}: {body}\n"
+
+    def gap_line(self, timestamp: datetime) -> str:
+        body = ", ".join(GAP_FIELD + unit for unit in self.units)
+        return f"{timestamp.strftime(_TIME_FORMAT)}: {body}\n"
+
+    def _fixed_rows(self, path: str, size: int, day: datetime) -> Optional[int]:
+        """Number of minute lines if ``path`` is laid out one line per minute, else ``None``."""
+        if size == 0:
+            return 0
+        if size % self.width:
+            return None
+        rows = size // self.width
+        with open(path, "rb") as file:
+            file.seek(size - self.width)
+            last = file.read(self.width)
+        if last.startswith(_stamp(day + timedelta(minutes=rows - 1))) and last.endswith(b"\n"):
+            return rows
+        return None
+
+    def append(self, path: str, timestamp: datetime, values: Sequence[float]) -> Optional[int]:
+        """Write the line for ``timestamp``'s minute, padding skipped minutes with gap lines.
+
+        Returns the byte offset of the new line, or ``None`` when the file
+        already holds that minute. A day file that is not in the fixed layout
+        (written before aligned logging, or a value too wide for its field) is
+        appended to without padding.
+        """
+        timestamp = timestamp.replace(second=0, microsecond=0)
+        day = _day_start(timestamp)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        minute = _minute_of_day(timestamp)
+
+        gaps = []
+        rows = self._fixed_rows(path, size, day)
+        if rows is not None:
+            if rows > minute:
+                return None
+            gaps = [self.gap_line(day + timedelta(minutes=k)) for k in range(rows, minute)]
+
+        with open(path, "a", encoding="utf-8") as file:
+            file.write("".join(gaps) + self.format_line(timestamp, values))
+        return size + len(gaps) * self.width
+
+
+def minute_offset(path: str, timestamp: datetime) -> Optional[int]:
+    """Byte offset of the line for ``timestamp``'s minute in a one-line-per-minute day file.
+
+    Returns the file size when the file ends before that minute, and ``None``
+    when the file is not in the fixed layout (callers fall back to a search).
+    """
+    day = _day_start(timestamp)
+    minute = _minute_of_day(timestamp)
+    with open(path, "rb") as file:
+        first = file.readline()
+        width = len(first)
+        if not (first.endswith(b"\n") and first.startswith(_stamp(day))):
+            return None
+        rows, remainder = divmod(file.seek(0, 2), width)
+        if remainder:
+            return None
+        target = min(minute, rows - 1)
+        file.seek(target * width)
+        line = file.read(width)
+    if not line.startswith(_stamp(day + timedelta(minutes=target))):
+        return None
+    return rows * width if minute >= rows else target * width
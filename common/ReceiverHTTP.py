@@ -0,0 +1,215 @@
+"""HTTP/1.1 keep-alive request handler and sample push stream for the receiver servers.
+
+The plotters poll each receiver about once a second. With the default
+``BaseHTTPRequestHandler`` (HTTP/1.0) every poll opens a new TCP connection
+and the server closes it after one reply, leaving a socket in ``TIME_WAIT``
+per poll. :class:`KeepAliveHandler` answers in HTTP/1.1 with a
+``Content-Length`` on every reply, so a client such as ``requests.Session``
+keeps one connection open and reuses it. The plotters poll through one
+session each, with ``trust_env = False``: the receivers are on loopback, so
+the proxy lookup ``requests`` would otherwise do for every request is skipped.
+
+Each receiver publishes its latest values as one :class:`Snapshot` per
+frame: the record and its JSON bytes, built once by the serial thread and
+swapped in with a single attribute assignment. A handler reads that
+attribute once and writes the bytes (:meth:`KeepAliveHandler.send_snapshot`),
+so a reply never mixes values from two frames and ``json.dumps`` runs once
+per frame instead of once per request. The snapshot also holds the sample in
+the compact formats of :mod:`SampleFormat`, picked by the ``Accept`` header.
+
+A kept-alive connection holds its handler until the client closes it or it
+has been idle for ``IDLE_TIMEOUT_S``, so serve these handlers with
+``http.server.ThreadingHTTPServer``: a single-threaded server would not
+answer anyone else while one client stays connected.
+
+A receiver that wants to push every frame instead of being polled publishes
+each one to a :class:`SampleStream`; :meth:`KeepAliveHandler.send_event_stream`
+serves it as Server-Sent Events (``text/event-stream``, one chunk per batch
+of events). Every subscriber has a bounded queue: a client that does not
+keep up loses its oldest events instead of holding back the publisher or the
+other clients.
+
+:meth:`KeepAliveHandler.send_since` answers ``/Meas/since?ts=<epoch>&limit=N``
+from a receiver's :class:`SampleHistory`, so a plotter can catch up on the
+samples it missed.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler
+from types import MappingProxyType
+from typing import List, Mapping, NamedTuple, Optional, Sequence, Set
+from urllib.parse import parse_qs
+
+from SampleFormat import ARRAY_TYPE, BINARY_TYPE, encode_array, encode_binary
+from SampleHistory import SampleHistory
+
+IDLE_TIMEOUT_S = 30
+STREAM_QUEUE_SIZE = 64
+HEARTBEAT_S = 1.0
+
+
+class Snapshot(NamedTuple):
+    """One frame's ``/Meas`` record and its serialised replies; never modified once built.
+
+    ``body`` is the JSON reply, ``array_body`` and ``binary_body`` the compact
+    formats from SampleFormat.
+    """
+
+    record: Mapping[str, object]
+    body: bytes
+    array_body: bytes
+    binary_body: bytes
+
+    @classmethod
+    def of(cls, record: Mapping[str, object], sequence: int, values: Sequence[Optional[float]]) -> Snapshot:
+        """Serialise ``record`` once; ``values`` are its unrounded channel values in
+        field order (``None`` where the record has none), used for the compact formats."""
+        timestamp = record["timestamp"]
+        return cls(
+            MappingProxyType(dict(record)),
+            json.dumps(record).encode(),
+            encode_array(sequence, timestamp, values),
+            encode_binary(sequence, timestamp, values),
+        )
+
+
+class Subscription:
+    """Events published since the subscriber last took them, oldest dropped beyond ``size``."""
+
+    def __init__(self, size: int):
+        self.events: deque = deque(maxlen=size)
+        self.dropped = 0
+
+
+class SampleStream:
+    """Fan-out of published events to every subscriber's bounded queue."""
+
+    def __init__(self, queue_size: int = STREAM_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self.sequence = 0
+        self.closed = False
+        self._ready = threading.Condition()
+        self._subscribers: Set[Subscription] = set()
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription(self.queue_size)
+        with self._ready:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._ready:
+            self._subscribers.discard(subscription)
+
+    def publish(self, data: bytes) -> None:
+        """Queue ``data`` (one line of JSON) as the next event for every subscriber."""
+        with self._ready:
+            self.sequence += 1
+            event = b"id: %d\ndata: %s\n\n" % (self.sequence, data)
+            for subscription in self._subscribers:
+                if len(subscription.events) == subscription.events.maxlen:
+                    subscription.dropped += 1
+                subscription.events.append(event)
+            self._ready.notify_all()
+
+    def take(self, subscription: Subscription, timeout: float) -> Optional[List[bytes]]:
+        """Wait up to ``timeout`` s for events and take them all; ``None`` once the stream is closed."""
+        with self._ready:
+            self._ready.wait_for(lambda: subscription.events or self.closed, timeout)
+            if self.closed:
+                return None
+            events = list(subscription.events)
+            subscription.events.clear()
+            return events
+
+    def close(self) -> None:
+        """End every subscriber's stream."""
+        with self._ready:
+            self.closed = True
+            self._ready.notify_all()
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """``BaseHTTPRequestHandler`` speaking HTTP/1.1, with helpers that always send ``Content-Length``."""
+
+    protocol_version = "HTTP/1.1"
+    timeout = IDLE_TIMEOUT_S
+    # Headers and body go out in separate writes; with Nagle on, the body of each reply on a
+    # kept-alive connection waits for the client's delayed ACK (~40 ms)
+    disable_nagle_algorithm = True
+
+    def send_bytes(self, body: bytes, content_type: str = "application/json", status: int = 200) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, data, status: int = 200) -> None:
+        self.send_bytes(json.dumps(data).encode(), status=status)
+
+    def send_snapshot(self, snapshot: Snapshot) -> None:
+        """Reply with ``snapshot`` in the format the ``Accept`` header asks for, the JSON record by default."""
+        accept = self.headers.get("Accept", "")
+        if BINARY_TYPE in accept:
+            self.send_bytes(snapshot.binary_body, BINARY_TYPE)
+        elif ARRAY_TYPE in accept:
+            self.send_bytes(snapshot.array_body, ARRAY_TYPE)
+        else:
+            self.send_bytes(snapshot.body)
+
+    def send_event_stream(self, stream: SampleStream, heartbeat_s: float = HEARTBEAT_S) -> None:
+        """Serve ``stream`` as Server-Sent Events until the client leaves or the stream closes.
+
+        Events are sent as HTTP chunks as soon as they are published; a
+        comment line goes out after ``heartbeat_s`` without events, so both
+        ends notice a dead connection.
+        """
+        subscription = stream.subscribe()
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            while True:
+                events = stream.take(subscription, heartbeat_s)
+                if events is None:
+                    break
+                body = b"".join(events) if events else b": heartbeat\n\n"
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(body), body))
+            self.wfile.write(b"0\r\n\r\n")
+        except OSError:
+            # Client gone or not reading (the socket timeout covers stalled writes)
+            self.close_connection = True
+        finally:
+            stream.unsubscribe(subscription)
+
+    def send_since(self, history: SampleHistory, query: str) -> None:
+        """Reply to ``since?ts=<epoch>[&limit=N][&step=s]`` with ``{"samples": [...], "more": bool}``.
+
+        ``samples`` are the records newer than ``ts``, oldest first, in the
+        same shape as ``/Meas``; ``more`` is true when ``limit`` cut them short
+        and the client should ask again from the last timestamp it got.
+        """
+        params = parse_qs(query)
+        try:
+            since = float(params["ts"][0])
+            limit = int(params.get("limit", [history.size])[0])
+            step = float(params.get("step", ["0"])[0])
+        except (KeyError, ValueError):
+            self.send_error(400, "Expected ts=<epoch>[&limit=N][&step=s]")
+            return
+        if limit < 1:
+            self.send_error(400, "limit must be positive")
+            return
+        samples, more = history.since(since, min(limit, history.size), step)
+        self.send_json({"samples": samples, "more": more})
@@ -0,0 +1,71 @@
+"""Coalesce plot redraw requests into at most one render per frame.
+
+Data arrival, bucket rollovers and UI changes call :meth:`RenderScheduler.request`,
+which only marks the plot dirty and is safe from the fetch thread. A timer on
+the Tk loop renders once per frame slot while dirty. Requests that arrive
+while a frame is already pending are merged into it, and slots missed while a
+slow render ran are skipped (counted as ``dropped``) rather than replayed, so
+redraw callbacks never pile up behind a busy GUI.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Dict
+
+
+class RenderScheduler:
+    """Call ``render`` on ``master``'s Tk loop at most once every ``frame_budget_ms`` while dirty."""
+
+    def __init__(self, master, render: Callable[[], object], frame_budget_ms: int = 200):
+        self.master = master
+        self.render = render
+        self.frame_budget_ms = frame_budget_ms
+        self.requested = 0
+        self.rendered = 0
+        self.merged = 0
+        self.dropped = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._after_id = None
+
+    def start(self) -> None:
+        if self._after_id is None:
+            self._after_id = self.master.after(self.frame_budget_ms, self._tick)
+
+    def stop(self) -> None:
+        if self._after_id is not None:
+            self.master.after_cancel(self._after_id)
+            self._after_id = None
+
+    def request(self) -> None:
+        """Mark the plot dirty; requests arriving while a frame is already pending are counted as ``merged``."""
+        with self._lock:
+            self.requested += 1
+            if self._dirty:
+                self.merged += 1
+            self._dirty = True
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            return {"requested": self.requested, "rendered": self.rendered, "merged": self.merged,
+                    "dropped": self.dropped}
+
+    def _tick(self) -> None:
+        start = time.monotonic()
+        try:
+            with self._lock:
+                dirty, self._dirty = self._dirty, False
+                if dirty:
+                    self.rendered += 1
+            if dirty:
+                self.render()
+        finally:
+            if self._after_id is not None:  # not stopped during render
+                # Wait for the next slot on the frame grid; slots overrun by the render are skipped
+                elapsed_ms = int((time.monotonic() - start) * 1000)
+                with self._lock:
+                    self.dropped += elapsed_ms // self.frame_budget_ms
+                delay = self.frame_budget_ms - elapsed_ms % self.frame_budget_ms
+                self._after_id = self.master.after(delay, self._tick)
@@ -0,0 +1,170 @@
+"""Rasterize plot frames on a worker thread instead of the Tk main thread.
+
+With a :class:`RenderWorker` attached, a :class:`WorkerCanvasTkAgg` behaves
+like ``FigureCanvasTkAgg`` except that drawing happens on the worker: the
+plotter's render callback builds the figure and draws it into the Agg buffer
+there, a copy of the finished RGBA frame is published, and the Tk thread only
+copies the latest frame into the canvas photo image on a short timer. Clock
+labels, checkboxes and the 200 ms main loop keep running while a frame is
+being drawn.
+
+Everything that changes the figure must then run on the worker: the render
+callback itself, and GUI-side changes such as resize handling passed through
+:meth:`RenderWorker.call`. The render callback must not read Tk variables or
+widgets either; the plotter captures what a frame shows (interval, flags and a
+copy of the buffers) on the Tk thread and passes it to :meth:`RenderWorker.request`
+as the frame's ``view``. Tk's own canvas resize waits for the frame being
+drawn. Without a worker the canvas is a plain ``FigureCanvasTkAgg``.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from matplotlib.backends import _backend_tk
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+
+class WorkerCanvasTkAgg(FigureCanvasTkAgg):
+    """TkAgg canvas whose draws run on ``worker`` when one is attached."""
+
+    worker: Optional["RenderWorker"] = None
+
+    def draw(self):
+        if self.worker is None:
+            super().draw()
+        elif self.worker.on_worker_thread():
+            FigureCanvasAgg.draw(self)
+            self.worker.publish()
+        else:
+            # Tk-side redraws (draw_idle after a resize, toolbar) become worker frames
+            self.worker.request()
+
+    def resize(self, event):
+        if self.worker is None:
+            super().resize(event)
+        else:
+            # Resizing the figure while the worker draws it would tear the frame
+            with self.worker.figure_lock:
+                super().resize(event)
+
+    def blit(self, bbox=None):
+        if self.worker is None:
+            super().blit(bbox)
+        elif self.worker.on_worker_thread():
+            self.worker.publish()
+
+    def show_frame(self, frame: np.ndarray) -> None:
+        """Copy a finished ``(height, width, 4)`` frame into the Tk photo image (Tk thread only)."""
+        _backend_tk.blit(self._tkphoto, frame, (0, 1, 2, 3))
+
+
+class RenderWorker:
+    """Run ``render(view)`` on a worker thread for ``canvas`` and show its frames on ``master``'s Tk loop.
+
+    :meth:`request` is thread-safe and merges with a pending request, like
+    ``RenderScheduler.request``; the newest ``view`` passed to it is the one
+    drawn (``None`` until the first). Errors raised by ``render`` or a queued
+    call are passed to ``log`` and counted; the worker keeps running.
+    """
+
+    def __init__(self, master, canvas: WorkerCanvasTkAgg, render: Callable[[object], object],
+                 present_ms: int = 20, log: Callable[[str], object] = print):
+        self.master = master
+        self.canvas = canvas
+        self.render = render
+        self.present_ms = present_ms
+        self.log = log
+        self.rendered = 0
+        self.presented = 0
+        self.stale = 0
+        self.errors = 0
+        self._dirty = False
+        self._view: object = None
+        self._calls: List[Callable[[], object]] = []
+        self._frame: Optional[np.ndarray] = None
+        self._stopped = False
+        self._wake = threading.Condition()
+        # Held while the worker changes or draws the figure
+        self.figure_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="RenderWorker", daemon=True)
+        self._after_id = None
+        canvas.worker = self
+
+    def start(self) -> None:
+        if not self._thread.is_alive():
+            self._thread.start()
+        if self._after_id is None:
+            self._after_id = self.master.after(self.present_ms, self._present)
+
+    def stop(self) -> None:
+        """Stop presenting and let the worker exit after its current frame (it is not joined)."""
+        with self._wake:
+            self._stopped = True
+            self._wake.notify()
+        if self._after_id is not None:
+            self.master.after_cancel(self._after_id)
+            self._after_id = None
+
+    def on_worker_thread(self) -> bool:
+        return threading.current_thread() is self._thread
+
+    def request(self, view: object = None) -> None:
+        """Draw a frame of ``view``, or of the last view requested if ``None``."""
+        with self._wake:
+            if view is not None:
+                self._view = view
+            self._dirty = True
+            self._wake.notify()
+
+    def call(self, function: Callable[[], object]) -> None:
+        """Run ``function`` on the worker before the next frame, then render that frame."""
+        with self._wake:
+            self._calls.append(function)
+            self._dirty = True
+            self._wake.notify()
+
+    def publish(self) -> None:
+        """Hand a copy of the canvas' Agg buffer to the Tk thread (worker thread only)."""
+        self._frame = np.array(self.canvas.buffer_rgba())
+
+    def counts(self) -> Dict[str, int]:
+        return {"rendered": self.rendered, "presented": self.presented, "stale": self.stale, "errors": self.errors}
+
+    def _run(self) -> None:
+        while True:
+            with self._wake:
+                while not (self._dirty or self._stopped):
+                    self._wake.wait()
+                if self._stopped:
+                    return
+                calls, self._calls = self._calls, []
+                view = self._view
+                self._dirty = False
+            with self.figure_lock:
+                for function in calls + [lambda: self.render(view)]:
+                    try:
+                        function()
+                    except Exception as e:
+                        self.errors += 1
+                        self.log(f"Render worker error: {e}")
+            self.rendered += 1
+
+    def _present(self) -> None:
+        try:
+            frame, self._frame = self._frame, None
+            if frame is not None:
+                width, height = self.canvas.get_width_height(physical=True)
+                if frame.shape[:2] == (height, width):
+                    self.canvas.show_frame(frame)
+                    self.presented += 1
+                else:
+                    # Drawn before a resize finished; draw again at the new size
+                    self.stale += 1
+                    self.request()
+        finally:
+            if self._after_id is not None:
+                self._after_id = self.master.after(self.present_ms, self._present)
@@ -0,0 +1,914 @@
+"""NumPy-backed storage engine with the same public API as ``VariousTimeDeque``.
+
+Each interval buffer is one preallocated float64 array: row 0 holds epoch
+seconds, rows 1..numdata hold the channels. Samples are appended left to right
+into a slab twice the window size and the live window is slid back to the
+front when the slab fills, so ``get_time_deque`` / ``get_data_deque`` always
+return contiguous, zero-copy views ordered oldest → newest.
+
+All buffers of one deque are carved out of a single flat float64 array. When a
+``storage_path`` is given that array is a ``numpy.memmap`` of a file next to
+the app, updated in place as samples arrive, so a restarted process maps the
+file and has every interval back without re-reading the text logs.
+
+By default a coarse bucket opens on the first sample at least ``T`` after the
+previous bucket's start, so bucket times drift with the sample clock. With
+``aligned=True`` buckets start on local wall-clock boundaries instead (exact
+minutes, 10 minutes and hours) and are stamped with that boundary.
+"""
+
+from __future__ import annotations
+
+import operator
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+MAXLEN = 100
+
+# Interval periods in seconds, finest first (matches ``Interval`` in each
+# plotter's VariousTimeDeque copy; enum members are resolved by ``.value``).
+INTERVAL_SECONDS: Tuple[int, ...] = (1, 60, 600, 3600)
+
+# Persistent file header: magic, storage kind, numdata, maxlen (all float64).
+_STORAGE_MAGIC = 4_853_272_066.0
+_HEADER_SIZE = 4
+
+
+def _interval_seconds(interval) -> int:
+    seconds = int(getattr(interval, "value", interval))
+    if seconds not in INTERVAL_SECONDS:
+        raise ValueError("Invalid interval")
+    return seconds
+
+
+def local_datetime64(epochs: np.ndarray) -> np.ndarray:
+    """Epoch seconds → naive local-time ``datetime64[us]``, the wall clock matplotlib plots."""
+    epochs = np.asarray(epochs, dtype=np.float64)
+    if len(epochs) == 0:
+        return np.empty(0, dtype="datetime64[us]")
+    first = time.localtime(epochs[0]).tm_gmtoff
+    if first == time.localtime(epochs[-1]).tm_gmtoff:
+        offsets = first
+    else:  # the window spans a DST change
+        offsets = np.array([time.localtime(t).tm_gmtoff for t in epochs])
+    return np.round((epochs + offsets) * 1e6).astype(np.int64).astype("datetime64[us]")
+
+
+def bucket_start(epoch: float, seconds: int) -> float:
+    """Start of the local wall-clock ``seconds`` bucket holding ``epoch``."""
+    offset = time.localtime(epoch).tm_gmtoff
+    return (epoch + offset) // seconds * seconds - offset
+
+
+def _bucket_starts(epochs: np.ndarray, seconds: int) -> np.ndarray:
+    """Vectorized :func:`bucket_start`."""
+    if len(epochs) == 0:
+        return epochs.copy()
+    first = time.localtime(epochs[0]).tm_gmtoff
+    if first == time.localtime(epochs[-1]).tm_gmtoff:
+        offsets = first
+    else:  # the range spans a DST change
+        offsets = np.array([time.localtime(t).tm_gmtoff for t in epochs])
+    return (epochs + offsets) // seconds * seconds - offsets
+
+
+def _spaced_indices(times: np.ndarray, spacing: float) -> np.ndarray:
+    """Indices picked by the "at least ``spacing`` after the last kept sample" rule.
+
+    The picks form the chain ``0 → first j with times[j] >= times[i] + spacing``;
+    it is followed by pointer doubling, so selection is O(n log n) array work
+    instead of a Python step per sample. ``times`` must be sorted.
+    """
+    n = len(times)
+    if n == 0:
+        return np.empty(0, dtype=np.intp)
+    jump = np.append(np.searchsorted(times, times + spacing, side="left"), n)
+    picked = np.zeros(1, dtype=np.intp)
+    while True:
+        # picked holds chain steps 0..2^k-1 and jump is the 2^k-step successor.
+        following = jump[picked]
+        following = following[following < n]
+        picked = np.concatenate([picked, following])
+        if len(following) < len(picked) - len(following):
+            return picked
+        jump = jump[jump]
+
+
+def _bucket_firsts(times: np.ndarray, seconds: int, aligned: bool) -> Tuple[np.ndarray, np.ndarray]:
+    """(index of the sample opening each bucket, bucket times) over sorted ``times``."""
+    if not aligned:
+        picked = _spaced_indices(times, seconds)
+        return picked, times[picked]
+    keys = _bucket_starts(times, seconds)
+    # A bucket opens when the boundary moves past every earlier one (as in update_data).
+    opens = np.ones(len(keys), dtype=bool)
+    opens[1:] = keys[1:] > np.maximum.accumulate(keys)[:-1]
+    picked = np.flatnonzero(opens)
+    return picked, keys[picked]
+
+
+def _history_arrays(times, values, numdata: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(epoch seconds, values with shape (n, numdata)) as float64, sorted by time."""
+    times = np.asarray(times, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64).reshape(len(times), numdata)
+    if len(times) > 1 and np.any(np.diff(times) < 0):
+        order = np.argsort(times, kind="stable")
+        times, values = times[order], values[order]
+    return times, values
+
+
+def _to_epoch(timestamp: Union[float, datetime]) -> float:
+    if isinstance(timestamp, datetime):
+        return timestamp.timestamp()
+    if isinstance(timestamp, (float, int, np.floating)):
+        return float(timestamp)
+    raise ValueError("Invalid time type")
+
+
+class _WindowExtrema:
+    """Running min / max of some rows of a :class:`RingBuffer` window, O(1) amortized per append.
+
+    Each row has a pair of monotonic deques of ``(sequence, value)``: the
+    maxima deque keeps values in decreasing order (a column is dropped once a
+    newer one is at least as large, since it can never be the maximum again)
+    and the minima deque in increasing order. The front of each deque is the
+    extreme of the window, and columns leaving the window are popped from the
+    front. The newest column is left out and compared at query time, because
+    rollup buffers rewrite it in place until their bucket closes.
+    """
+
+    __slots__ = ("rows", "_pick", "_low", "_high")
+
+    def __init__(self, rows: Sequence[int]):
+        self.rows = list(rows)
+        self._pick = operator.itemgetter(*self.rows)
+        self._low = [deque() for _ in self.rows]
+        self._high = [deque() for _ in self.rows]
+
+    def reset(self) -> None:
+        for queue in self._low + self._high:
+            queue.clear()
+
+    def push(self, sequence: int, column: Sequence[float], first: int) -> None:
+        """Add a column (all buffer rows) that will not change any more, then forget those before ``first``.
+
+        One column at most leaves the window per push.
+        """
+        for value, low, high in zip(self._pick(column), self._low, self._high):
+            while high and high[-1][1] <= value:
+                high.pop()
+            high.append((sequence, value))
+            if high[0][0] < first:
+                high.popleft()
+            while low and low[-1][1] >= value:
+                low.pop()
+            low.append((sequence, value))
+            if low[0][0] < first:
+                low.popleft()
+
+    def load(self, first: int, columns: np.ndarray) -> None:
+        """Replace the contents with finished ``columns`` (all buffer rows × k), numbered from ``first``.
+
+        Equivalent to pushing them one by one: a column stays in the maxima
+        deque exactly when it is larger than every later column (smaller for
+        the minima), which is a reversed running max / min.
+        """
+        self.reset()
+        if columns.shape[1] == 0:
+            return
+        block = columns[self.rows]
+        sequences = np.arange(first, first + block.shape[1])
+        reverse = block[:, ::-1]
+        for queues, accumulate, better in ((self._high, np.maximum, np.greater), (self._low, np.minimum, np.less)):
+            kept = np.ones(block.shape, dtype=bool)
+            kept[:, :-1] = better(block[:, :-1], accumulate.accumulate(reverse, axis=1)[:, -2::-1])
+            for queue, values, mask in zip(queues, block, kept):
+                queue.extend(zip(sequences[mask].tolist(), values[mask].tolist()))
+
+    def evict(self, first: int) -> None:
+        """Forget columns with a sequence number below ``first``."""
+        for queue in self._low + self._high:
+            while queue and queue[0][0] < first:
+                queue.popleft()
+
+    def ranges(self, newest: Sequence[float]) -> Tuple[np.ndarray, np.ndarray]:
+        """(min, max) arrays given the newest column (all buffer rows)."""
+        newest = self._pick(newest)
+        low = np.array([min(q[0][1], v) if q else v for q, v in zip(self._low, newest)])
+        high = np.array([max(q[0][1], v) if q else v for q, v in zip(self._high, newest)])
+        return low, high
+
+
+class RingBuffer:
+    """Fixed-capacity window of (epoch time, channel values) rows.
+
+    With ``tracked_rows`` the buffer also keeps the window min / max of those
+    rows (0 is the time row) up to date on every change; see :meth:`ranges`.
+    Code that writes into :meth:`data` views directly must call
+    :meth:`rescan` afterwards.
+    """
+
+    def __init__(
+        self,
+        numdata: int,
+        capacity: int = MAXLEN,
+        backing: Optional[np.ndarray] = None,
+        tracked_rows: Sequence[int] = (),
+    ):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.numdata = numdata
+        self.capacity = capacity
+        size = self.storage_size(numdata, capacity)
+        if backing is None:
+            backing = np.zeros(size, dtype=np.float64)
+        # backing[0:2] persists the window bounds next to the samples.
+        self._pos = backing[:2]
+        self._buf = backing[2:size].reshape(numdata + 1, 2 * capacity)
+        self._extrema = _WindowExtrema(tracked_rows) if len(tracked_rows) else None
+        self._newest = 0  # sequence number of the newest column
+        start, end = int(self._pos[0]), int(self._pos[1])
+        if not (0 <= start <= end <= 2 * capacity and end - start <= capacity):
+            start = end = 0
+        self._set_window(start, end)
+        self.rescan()
+
+    @staticmethod
+    def storage_size(numdata: int, capacity: int) -> int:
+        """Number of float64 slots needed to back a buffer of this shape."""
+        return 2 + (numdata + 1) * 2 * capacity
+
+    def _set_window(self, start: int, end: int) -> None:
+        self._start = start
+        self._end = end
+        self._pos[0] = start
+        self._pos[1] = end
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def append(self, timestamp: float, values: Sequence[float]) -> None:
+        start, end = self._start, self._end
+        finished = self._buf[:, end - 1].tolist() if self._extrema is not None and end > start else None
+        self._newest += 1
+        if end == self._buf.shape[1]:
+            # A window shortened by drop_before must not pull older columns back in
+            keep = min(self.capacity - 1, end - start)
+            self._buf[:, :keep] = self._buf[:, end - keep:end]
+            start, end = 0, keep
+        column = self._buf[:, end]
+        column[0] = timestamp
+        column[1:] = values
+        end += 1
+        if end - start > self.capacity:
+            start += 1
+        self._set_window(start, end)
+        if finished is not None:
+            # The previous newest column is final from now on
+            self._extrema.push(self._newest - 1, finished, self._newest - (end - start) + 1)
+
+    def extend(self, timestamps: np.ndarray, values: np.ndarray) -> None:
+        """Replace the contents with the newest ``capacity`` rows of the given arrays.
+
+        ``values`` has shape (numdata, n), aligned with ``timestamps``.
+        """
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64).reshape(self.numdata, -1)
+        count = min(len(timestamps), self.capacity)
+        if count:
+            self._buf[0, :count] = timestamps[-count:]
+            self._buf[1:, :count] = values[:, -count:]
+        self._set_window(0, count)
+        self.rescan()
+
+    def clear(self) -> None:
+        self._set_window(0, 0)
+        if self._extrema is not None:
+            self._extrema.reset()
+
+    def rescan(self) -> None:
+        """Rebuild the tracked window min / max from the stored columns (O(window))."""
+        if self._extrema is None:
+            return
+        columns = self._buf[:, self._start:max(self._start, self._end - 1)]
+        self._extrema.load(self._newest - columns.shape[1], columns)
+
+    def ranges(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """(min, max) arrays of the tracked rows over the window, or ``None`` when empty."""
+        if self._end == self._start:
+            return None
+        return self._extrema.ranges(self._buf[:, self._end - 1].tolist())
+
+    def times(self) -> np.ndarray:
+        """Epoch seconds, oldest → newest (a view; do not hold across appends)."""
+        return self._buf[0, self._start:self._end]
+
+    def data(self) -> np.ndarray:
+        """Channel values with shape (numdata, n), oldest → newest (a view)."""
+        return self._buf[1:, self._start:self._end]
+
+    def last_time(self) -> float:
+        return float(self._buf[0, self._end - 1])
+
+    def last_values(self) -> np.ndarray:
+        return self._buf[1:, self._end - 1]
+
+    def update_last(self, values: Sequence[float]) -> None:
+        """Overwrite the channel values of the newest row in place."""
+        self._buf[1:, self._end - 1] = values
+
+    def drop_before(self, timestamp: float) -> None:
+        """Evict rows older than ``timestamp`` from the front of the window."""
+        dropped = int(np.searchsorted(self.times(), timestamp, side="left"))
+        self._set_window(self._start + dropped, self._end)
+        if self._extrema is not None:
+            self._extrema.evict(self._newest - len(self) + 1)
+
+
+class ArrayTimeDeque:
+    """Drop-in alternative to ``VariousTimeDeque`` backed by :class:`RingBuffer`.
+
+    Times are returned as epoch-second arrays instead of ``datetime`` deques;
+    the ``get_last_*_time`` helpers still return ``datetime`` for callers that
+    format or compare them. The returned arrays are live views: a consumer on
+    another thread than the writer should use :meth:`snapshot` instead.
+
+    ``generation`` changes with every change to the stored samples. A consumer
+    that reads it before taking a snapshot can cache results derived from that
+    snapshot under it.
+
+    Every interval buffer keeps the running min / max of its times and plotted
+    channels (:meth:`window_ranges`), so axis limits need no scan of the data.
+    """
+
+    _STORAGE_KIND = 1.0
+
+    def __init__(
+        self,
+        numdata: int,
+        maxlen: int = MAXLEN,
+        storage_path: Optional[str] = None,
+        aligned: bool = False,
+    ):
+        self.numdata = numdata
+        self.maxlen = maxlen
+        self.aligned = aligned
+        self.lock = threading.Lock()
+        self.generation = 0
+
+        backing, self.restored = self._open_storage(storage_path)
+        self._backing = backing
+        self._build(backing[_HEADER_SIZE:])
+
+        if not self.restored:
+            self.clear()
+            self.update_data([0] * self._input_width(), time.time())
+
+    def _input_width(self) -> int:
+        """Values per sample taken by ``update_data`` and the history loaders."""
+        return self.numdata
+
+    def _storage_size(self) -> int:
+        return len(INTERVAL_SECONDS) * RingBuffer.storage_size(self.numdata, self.maxlen)
+
+    def _tracked_rows(self) -> Sequence[int]:
+        """Buffer rows whose window min / max is kept: the time row, then the plotted channels."""
+        return range(self.numdata + 1)
+
+    def _build(self, backing: np.ndarray) -> None:
+        size = RingBuffer.storage_size(self.numdata, self.maxlen)
+        rows = self._tracked_rows()
+        self._buffers = {
+            seconds: RingBuffer(self.numdata, self.maxlen, backing[i * size:(i + 1) * size], rows)
+            for i, seconds in enumerate(INTERVAL_SECONDS)
+        }
+
+    def _open_storage(self, storage_path: Optional[str]) -> Tuple[np.ndarray, bool]:
+        """Return (flat backing array, restored) — a memmap when ``storage_path`` is set.
+
+        An existing file is reused only if its header matches this deque's
+        kind and shape; otherwise it is recreated empty.
+        """
+        size = _HEADER_SIZE + self._storage_size()
+        header = np.array([_STORAGE_MAGIC, self._STORAGE_KIND, self.numdata, self.maxlen])
+
+        if storage_path is None:
+            backing = np.zeros(size, dtype=np.float64)
+            backing[:_HEADER_SIZE] = header
+            return backing, False
+
+        if os.path.isfile(storage_path) and os.path.getsize(storage_path) == size * 8:
+            backing = np.memmap(storage_path, dtype=np.float64, mode="r+", shape=(size,))
+            if np.array_equal(backing[:_HEADER_SIZE], header):
+                return backing, True
+            del backing
+
+        backing = np.memmap(storage_path, dtype=np.float64, mode="w+", shape=(size,))
+        backing[:_HEADER_SIZE] = header
+        return backing, False
+
+    def flush(self) -> None:
+        """Push pending memory-mapped writes to disk (no-op without storage)."""
+        if isinstance(self._backing, np.memmap):
+            self._backing.flush()
+
+    def update_data(self, data: Sequence[float], timestamp: Union[float, datetime]) -> None:
+        if len(data) != self.numdata:
+            raise ValueError("Data length mismatch")
+        epoch = _to_epoch(timestamp)
+
+        with self.lock:
+            self.generation += 1
+            for seconds, buffer in self._buffers.items():
+                if seconds == 1:
+                    buffer.append(epoch, data)
+                elif self.aligned:
+                    start = bucket_start(epoch, seconds)
+                    if len(buffer) == 0 or start > buffer.last_time():
+                        buffer.append(start, data)
+                elif len(buffer) == 0 or epoch - buffer.last_time() >= seconds:
+                    buffer.append(epoch, data)
+
+    def buffer(self, interval) -> RingBuffer:
+        return self._buffers[_interval_seconds(interval)]
+
+    def get_time_deque(self, interval) -> np.ndarray:
+        return self.buffer(interval).times()
+
+    def get_data_deque(self, interval) -> np.ndarray:
+        return self.buffer(interval).data()
+
+    def snapshot(self, interval) -> Tuple[np.ndarray, np.ndarray]:
+        """Consistent copies of (times, data) for ``interval``, safe across threads."""
+        with self.lock:
+            return self.get_time_deque(interval).copy(), self.get_data_deque(interval).copy()
+
+    def window_ranges(self, interval) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """(min, max) of ``[time, channel 0, channel 1, …]`` over ``interval``'s window, or ``None`` when empty.
+
+        O(channels): the buffers maintain them as samples arrive. The channels
+        are those of :meth:`get_data_deque` (bucket means for coarse
+        intervals; the calibrated channels of a :class:`CalibratedTimeDeque`).
+        """
+        with self.lock:
+            return self.buffer(interval).ranges()
+
+    def _last_datetime(self, seconds: int) -> datetime:
+        buffer = self._buffers[seconds]
+        if len(buffer) == 0:
+            return datetime.now()
+        return datetime.fromtimestamp(buffer.last_time())
+
+    def get_last_time(self) -> datetime:
+        return self._last_datetime(1)
+
+    def get_last_1min_time(self) -> datetime:
+        return self._last_datetime(60)
+
+    def get_last_10min_time(self) -> datetime:
+        return self._last_datetime(600)
+
+    def get_last_1hour_time(self) -> datetime:
+        return self._last_datetime(3600)
+
+    def newest_time(self) -> Optional[float]:
+        """Epoch of the newest row in any interval buffer, or ``None`` when all are empty.
+
+        Unlike ``get_last_time`` there is no fallback to now, so after a restore
+        this tells how far the stored samples reach.
+        """
+        with self.lock:
+            times = [buffer.last_time() for buffer in self._buffers.values() if len(buffer)]
+        return max(times) if times else None
+
+    def get_last_data(self) -> list[float]:
+        buffer = self._buffers[1]
+        if len(buffer) == 0:
+            return [0.0] * self.numdata
+        return buffer.last_values()[:self.numdata].tolist()
+
+    def clear(self) -> None:
+        """Remove all stored samples from every interval buffer."""
+        self.generation += 1
+        for buffer in self._buffers.values():
+            buffer.clear()
+
+    def trim(self, reference_time: datetime | None = None) -> None:
+        """Drop samples older than each interval's ``maxlen × T`` window.
+
+        Used after restoring from storage, where the file may predate a long
+        shutdown.
+        """
+        if reference_time is None:
+            reference_time = datetime.now()
+        reference = reference_time.timestamp()
+        with self.lock:
+            self.generation += 1
+            for seconds, buffer in self._buffers.items():
+                buffer.drop_before(reference - self.maxlen * seconds)
+
+    def load_historical(
+        self,
+        records: Sequence[Tuple[datetime, Sequence[float]]],
+        reference_time: datetime | None = None,
+    ) -> None:
+        """Populate buffers from past log records (see :meth:`load_historical_arrays`)."""
+        times = np.fromiter((dt.timestamp() for dt, _ in records), dtype=np.float64, count=len(records))
+        values = np.array([data for _, data in records], dtype=np.float64)
+        self.load_historical_arrays(times, values.reshape(len(records), self._input_width()), reference_time)
+
+    def load_historical_arrays(
+        self,
+        times: np.ndarray,
+        values: np.ndarray,
+        reference_time: datetime | None = None,
+    ) -> None:
+        """Bulk-populate buffers from epoch ``times`` and ``values`` of shape (n, numdata).
+
+        Same windowing and subsampling rules as ``VariousTimeDeque.load_historical``,
+        applied per interval with one ``searchsorted`` cutoff, a vectorized
+        minimum-spacing pick and a single slice assignment.
+        """
+        if reference_time is None:
+            reference_time = datetime.now()
+        reference = reference_time.timestamp()
+        times, values = _history_arrays(times, values, self.numdata)
+
+        with self.lock:
+            self.clear()
+
+            for seconds, buffer in self._buffers.items():
+                lo = int(np.searchsorted(times, reference - self.maxlen * seconds, side="left"))
+                kept_times, kept_values = times[lo:], values[lo:]
+                if seconds != 1:
+                    picked, kept_times = _bucket_firsts(kept_times, seconds, self.aligned)
+                    kept_values = kept_values[picked]
+                buffer.extend(kept_times, kept_values.T)
+            self.generation += 1
+
+
+class _BucketStats:
+    """Start time and running sum / min / max / count of one rollup bucket.
+
+    Backed by a flat float64 array ``[start, count, total × n, low × n,
+    high × n]`` so the open buckets persist alongside the ring buffers.
+    """
+
+    __slots__ = ("_state", "total", "low", "high")
+
+    def __init__(self, numdata: int, backing: Optional[np.ndarray] = None):
+        if backing is None:
+            backing = np.zeros(self.storage_size(numdata), dtype=np.float64)
+        self._state = backing
+        self.total = backing[2:2 + numdata]
+        self.low = backing[2 + numdata:2 + 2 * numdata]
+        self.high = backing[2 + 2 * numdata:2 + 3 * numdata]
+
+    @staticmethod
+    def storage_size(numdata: int) -> int:
+        return 2 + 3 * numdata
+
+    @property
+    def start(self) -> float | None:
+        value = self._state[0]
+        return None if np.isnan(value) else float(value)
+
+    @start.setter
+    def start(self, value: float | None) -> None:
+        self._state[0] = np.nan if value is None else value
+
+    @property
+    def count(self) -> float:
+        return self._state[1]
+
+    @count.setter
+    def count(self, value: float) -> None:
+        self._state[1] = value
+
+    def reset(self) -> None:
+        self.total[:] = 0.0
+        self.low[:] = np.inf
+        self.high[:] = -np.inf
+        self.count = 0
+
+    def add_sample(self, values: np.ndarray) -> None:
+        self.total += values
+        np.minimum(self.low, values, out=self.low)
+        np.maximum(self.high, values, out=self.high)
+        self.count += 1
+
+    def merge(self, other: "_BucketStats") -> None:
+        self.total += other.total
+        np.minimum(self.low, other.low, out=self.low)
+        np.maximum(self.high, other.high, out=self.high)
+        self.count += other.count
+
+
+class RollupTimeDeque(ArrayTimeDeque):
+    """``ArrayTimeDeque`` whose coarse buffers hold bucket mean / min / max / count.
+
+    The 1 s buffer keeps raw samples. Every other interval is a cascade: raw
+    samples build 1 min buckets, closed 1 min buckets build 10 min buckets and
+    closed 10 min buckets build 1 h buckets, so coarse buckets always nest and
+    no raw data has to be retained to compute them. A bucket row is appended
+    when the bucket opens (timestamp = first sample, as in ``update_data``) and
+    refreshed in place with the running aggregate, so the newest row of every
+    buffer is live. Work per sample is O(1). With ``aligned`` the row is
+    stamped with the bucket's wall-clock boundary instead.
+
+    Coarse rows are laid out as ``[mean × n, min × n, max × n, count]``;
+    :meth:`get_data_deque` returns the means, :meth:`get_min_deque` /
+    :meth:`get_max_deque` / :meth:`get_count_deque` the rest.
+    """
+
+    _STORAGE_KIND = 2.0
+
+    def _storage_size(self) -> int:
+        n, maxlen = self.numdata, self.maxlen
+        coarse = len(INTERVAL_SECONDS) - 1
+        return (
+            RingBuffer.storage_size(n, maxlen)
+            + coarse * RingBuffer.storage_size(3 * n + 1, maxlen)
+            + coarse * _BucketStats.storage_size(n)
+        )
+
+    def _build(self, backing: np.ndarray) -> None:
+        n, maxlen = self.numdata, self.maxlen
+        rows = self._tracked_rows()
+        offset = RingBuffer.storage_size(n, maxlen)
+        self._buffers = {1: RingBuffer(n, maxlen, backing[:offset], rows)}
+        # Closed-children aggregate (and start time) of each open coarse bucket.
+        self._closed: dict[int, _BucketStats] = {}
+        ring_size = RingBuffer.storage_size(3 * n + 1, maxlen)
+        stats_size = _BucketStats.storage_size(n)
+        for seconds in INTERVAL_SECONDS[1:]:
+            self._buffers[seconds] = RingBuffer(3 * n + 1, maxlen, backing[offset:offset + ring_size], rows)
+            offset += ring_size
+            self._closed[seconds] = _BucketStats(n, backing[offset:offset + stats_size])
+            offset += stats_size
+        self._live = _BucketStats(n)
+        self._row = np.empty(3 * n + 1)
+
+    def update_data(self, data: Sequence[float], timestamp: Union[float, datetime]) -> None:
+        if len(data) != self.numdata:
+            raise ValueError("Data length mismatch")
+        epoch = _to_epoch(timestamp)
+        values = np.asarray(data, dtype=np.float64)
+
+        with self.lock:
+            self.generation += 1
+            self._buffers[1].append(epoch, values)
+            self._add_to_rollup(epoch, values)
+
+    def _add_to_rollup(self, epoch: float, values: np.ndarray) -> None:
+        levels = INTERVAL_SECONDS[1:]
+
+        # Close buckets from fine to coarse; a coarse bucket can only roll
+        # over when the bucket below it does, which keeps buckets nested.
+        opened = []
+        for index, seconds in enumerate(levels):
+            bucket = self._closed[seconds]
+            start = bucket.start
+            if self.aligned:
+                boundary = bucket_start(epoch, seconds)
+                if start is not None and boundary <= start:
+                    break
+            elif start is not None and epoch - start < seconds:
+                break
+            if start is not None and index + 1 < len(levels):
+                self._closed[levels[index + 1]].merge(bucket)
+            bucket.reset()
+            bucket.start = boundary if self.aligned else epoch
+            opened.append(seconds)
+
+        # Raw samples are the "closed children" of the 1 min bucket.
+        self._closed[levels[0]].add_sample(values)
+
+        # Live aggregate of each open bucket = its closed children plus the
+        # open bucket one level down (already including everything below).
+        self._live.reset()
+        for seconds in levels:
+            self._live.merge(self._closed[seconds])
+            row = self._stats_row(self._live)
+            if seconds in opened:
+                self._buffers[seconds].append(self._closed[seconds].start, row)
+            else:
+                self._buffers[seconds].update_last(row)
+
+    def _stats_row(self, stats: _BucketStats) -> np.ndarray:
+        n = self.numdata
+        row = self._row
+        row[:n] = stats.total / stats.count
+        row[n:2 * n] = stats.low
+        row[2 * n:3 * n] = stats.high
+        row[3 * n] = stats.count
+        return row
+
+    def get_data_deque(self, interval) -> np.ndarray:
+        return self.buffer(interval).data()[:self.numdata]
+
+    def get_min_deque(self, interval) -> np.ndarray:
+        """Per-bucket minimum (the raw values for the 1 s buffer)."""
+        seconds = _interval_seconds(interval)
+        if seconds == 1:
+            return self._buffers[1].data()
+        return self._buffers[seconds].data()[self.numdata:2 * self.numdata]
+
+    def get_max_deque(self, interval) -> np.ndarray:
+        """Per-bucket maximum (the raw values for the 1 s buffer)."""
+        seconds = _interval_seconds(interval)
+        if seconds == 1:
+            return self._buffers[1].data()
+        return self._buffers[seconds].data()[2 * self.numdata:3 * self.numdata]
+
+    def get_count_deque(self, interval) -> np.ndarray:
+        """Number of raw samples folded into each bucket (all ones for 1 s)."""
+        seconds = _interval_seconds(interval)
+        if seconds == 1:
+            return np.ones(len(self._buffers[1]))
+        return self._buffers[seconds].data()[3 * self.numdata]
+
+    def clear(self) -> None:
+        super().clear()
+        for bucket in self._closed.values():
+            bucket.reset()
+            bucket.start = None
+
+    def load_historical_arrays(
+        self,
+        times: np.ndarray,
+        values: np.ndarray,
+        reference_time: datetime | None = None,
+    ) -> None:
+        """Bulk-populate buffers from epoch ``times`` and ``values`` of shape (n, numdata).
+
+        The 1 s buffer keeps the samples inside its own window; every sample
+        inside the longest window is rolled up into the coarse buffers, which
+        are then trimmed to their ``maxlen × T`` windows. The result (including
+        the open bucket state) matches feeding the samples through
+        :meth:`update_data` one by one.
+        """
+        if reference_time is None:
+            reference_time = datetime.now()
+        reference = reference_time.timestamp()
+        times, values = _history_arrays(times, values, self.numdata)
+
+        lo = int(np.searchsorted(times, reference - self.maxlen * INTERVAL_SECONDS[-1], side="left"))
+        times, values = times[lo:], values[lo:]
+        raw_lo = int(np.searchsorted(times, reference - self.maxlen, side="left"))
+        with self.lock:
+            self.clear()
+            self._buffers[1].extend(times[raw_lo:], values[raw_lo:].T)
+            if len(times):
+                self._bulk_rollup(times, values)
+
+            for seconds in INTERVAL_SECONDS[1:]:
+                self._buffers[seconds].drop_before(reference - self.maxlen * seconds)
+            self.generation += 1
+
+    def _bulk_rollup(self, times: np.ndarray, values: np.ndarray) -> None:
+        """Vectorized :meth:`_add_to_rollup` over sorted samples, after :meth:`clear`."""
+        # Children of the 1 min level are the raw samples.
+        child_times = times
+        total = low = high = values
+        count = np.ones(len(times))
+
+        for index, seconds in enumerate(INTERVAL_SECONDS[1:]):
+            # Buckets open exactly as in the incremental cascade.
+            starts, bucket_times = _bucket_firsts(child_times, seconds, self.aligned)
+
+            # Open bucket state: its closed children (raw samples all count;
+            # above that the newest child bucket is still open).
+            bucket = self._closed[seconds]
+            bucket.start = bucket_times[-1]
+            closed = slice(starts[-1], None if index == 0 else -1)
+            if len(count[closed]):
+                bucket.total[:] = total[closed].sum(axis=0)
+                bucket.low[:] = low[closed].min(axis=0)
+                bucket.high[:] = high[closed].max(axis=0)
+                bucket.count = count[closed].sum()
+
+            child_times = bucket_times
+            total = np.add.reduceat(total, starts, axis=0)
+            low = np.minimum.reduceat(low, starts, axis=0)
+            high = np.maximum.reduceat(high, starts, axis=0)
+            count = np.add.reduceat(count, starts)
+            rows = np.concatenate([total / count[:, None], low, high, count[:, None]], axis=1)
+            self._buffers[seconds].extend(child_times, rows.T)
+
+
+class CalibratedTimeDeque(RollupTimeDeque):
+    """``RollupTimeDeque`` that keeps a calibrated copy of every channel next to the raw one.
+
+    Samples are raw; ``slope × raw + offset`` is computed for the whole row
+    (or history block) with one NumPy operation at ingest and stored as
+    channels ``channels..2 × channels - 1``, so readers never calibrate per
+    value. The rollup aggregates the calibrated channels like any other, which
+    keeps bucket min / max right for negative slopes. :meth:`set_calibration`
+    rewrites every stored calibrated value from the raw ones once.
+
+    :meth:`get_data_deque` / :meth:`snapshot` / :meth:`get_last_data` return
+    the raw channels; :meth:`get_calibrated_deque` /
+    :meth:`calibrated_snapshot` / :meth:`get_last_calibrated` the calibrated
+    ones. :meth:`get_min_deque` / :meth:`get_max_deque` return both halves.
+    """
+
+    _STORAGE_KIND = 3.0
+
+    def __init__(
+        self,
+        channels: int,
+        maxlen: int = MAXLEN,
+        storage_path: Optional[str] = None,
+        aligned: bool = False,
+    ):
+        self.channels = channels
+        self.slope = np.ones(channels)
+        self.offset = np.zeros(channels)
+        super().__init__(2 * channels, maxlen, storage_path, aligned)
+
+    def _input_width(self) -> int:
+        return self.channels
+
+    def _tracked_rows(self) -> Sequence[int]:
+        # Only the calibrated channels are plotted
+        return [0, *range(self.channels + 1, 2 * self.channels + 1)]
+
+    def _with_calibrated(self, raw: np.ndarray) -> np.ndarray:
+        """Raw values (…, channels) → (…, 2 × channels) with the calibrated copy appended."""
+        return np.concatenate([raw, raw * self.slope + self.offset], axis=-1)
+
+    def update_data(self, data: Sequence[float], timestamp: Union[float, datetime]) -> None:
+        if len(data) != self.channels:
+            raise ValueError("Data length mismatch")
+        super().update_data(self._with_calibrated(np.asarray(data, dtype=np.float64)), timestamp)
+
+    def load_historical_arrays(
+        self,
+        times: np.ndarray,
+        values: np.ndarray,
+        reference_time: datetime | None = None,
+    ) -> None:
+        times, values = _history_arrays(times, values, self.channels)
+        super().load_historical_arrays(times, self._with_calibrated(values), reference_time)
+
+    def set_calibration(self, slope: Sequence[float], offset: Sequence[float]) -> None:
+        """Use ``slope × raw + offset`` per channel and recalibrate everything stored."""
+        n = self.channels
+        slope = np.asarray(slope, dtype=np.float64).reshape(n)
+        offset = np.asarray(offset, dtype=np.float64).reshape(n)
+        rising = slope >= 0
+        s, o, r = slope[:, None], offset[:, None], rising[:, None]
+
+        with self.lock:
+            self.generation += 1
+            self.slope, self.offset = slope, offset
+            raw = self._buffers[1].data()
+            raw[n:] = s * raw[:n] + o
+            self._buffers[1].rescan()
+
+            for seconds in INTERVAL_SECONDS[1:]:
+                # Coarse rows: [mean × 2n, min × 2n, max × 2n, count]
+                rows = self._buffers[seconds].data()
+                mean, low, high = rows[:n], rows[2 * n:3 * n], rows[4 * n:5 * n]
+                rows[n:2 * n] = s * mean + o
+                rows[3 * n:4 * n] = s * np.where(r, low, high) + o
+                rows[5 * n:6 * n] = s * np.where(r, high, low) + o
+                self._buffers[seconds].rescan()
+
+                # Open bucket state; the sum scales with its sample count
+                bucket = self._closed[seconds]
+                if bucket.count:
+                    low, high = bucket.low[:n], bucket.high[:n]
+                    bucket.total[n:] = slope * bucket.total[:n] + offset * bucket.count
+                    bucket.low[n:] = slope * np.where(rising, low, high) + offset
+                    bucket.high[n:] = slope * np.where(rising, high, low) + offset
+
+    def get_data_deque(self, interval) -> np.ndarray:
+        return self.buffer(interval).data()[:self.channels]
+
+    def get_calibrated_deque(self, interval) -> np.ndarray:
+        """Calibrated channels (bucket means for the coarse intervals)."""
+        return self.buffer(interval).data()[self.channels:2 * self.channels]
+
+    def calibrated_snapshot(self, interval) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Consistent copies of (times, raw, calibrated) for ``interval``, safe across threads."""
+        with self.lock:
+            data = self.buffer(interval).data()
+            return (
+                self.get_time_deque(interval).copy(),
+                data[:self.channels].copy(),
+                data[self.channels:2 * self.channels].copy(),
+            )
+
+    def get_last_data(self) -> list[float]:
+        return super().get_last_data()[:self.channels]
+
+    def get_last_calibrated(self) -> list[float]:
+        return super().get_last_data()[self.channels:]
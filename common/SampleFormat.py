@@ -0,0 +1,53 @@
+"""Compact wire formats for one receiver sample, chosen by the ``Accept`` header.
+
+The receivers' JSON record (``{"P_st": "6.123", ..., "timestamp": ...}``)
+carries values as 3-decimal strings that every client parses back. A client
+that sends ``Accept: BINARY_TYPE`` or ``Accept: ARRAY_TYPE`` gets the same
+sample with full float64 values instead:
+
+* ``BINARY_TYPE``: little-endian ``uint64`` sequence, ``float64`` timestamp,
+  then one ``float64`` per channel (``NaN`` for a channel without a value),
+  in the order of the JSON record's fields.
+* ``ARRAY_TYPE``: the JSON array ``[sequence, timestamp, value, ...]``
+  (``null`` for a missing value).
+
+Any other ``Accept`` gets the JSON record, so existing clients are unaffected.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import struct
+from typing import Dict, Optional, Sequence, Tuple
+
+BINARY_TYPE = "application/x-sample-struct"
+ARRAY_TYPE = "application/x-sample-array+json"
+
+HEADER = struct.Struct("<Qd")  # sequence, timestamp
+_CHANNELS: Dict[int, struct.Struct] = {}
+
+
+def _channels(count: int) -> struct.Struct:
+    packer = _CHANNELS.get(count)
+    if packer is None:
+        packer = _CHANNELS[count] = struct.Struct(f"<{count}d")
+    return packer
+
+
+def encode_binary(sequence: int, timestamp: float, values: Sequence[Optional[float]]) -> bytes:
+    floats = [math.nan if value is None else value for value in values]
+    return HEADER.pack(sequence, timestamp) + _channels(len(floats)).pack(*floats)
+
+
+def encode_array(sequence: int, timestamp: float, values: Sequence[Optional[float]]) -> bytes:
+    return json.dumps([sequence, timestamp, *values]).encode()
+
+
+def decode_binary(body: bytes) -> Tuple[int, float, Tuple[float, ...]]:
+    """(sequence, timestamp, channel values) of a ``BINARY_TYPE`` body."""
+    count, remainder = divmod(len(body) - HEADER.size, 8)
+    if count < 0 or remainder:
+        raise ValueError(f"Bad sample size: {len(body)} bytes")
+    sequence, timestamp = HEADER.unpack_from(body)
+    return sequence, timestamp, _channels(count).unpack_from(body, HEADER.size)
@@ -0,0 +1,96 @@
+"""Receiver-side history of recent timestamped samples for ``/Meas/since`` catch-up.
+
+``/Meas`` only ever returns the latest values, so whatever a receiver reads
+while its plotter is stalled, times out or restarts never reaches the plot.
+Each receiver appends every sample to a :class:`SampleHistory`; a plotter
+that notices a gap asks for everything newer than the last sample it stored
+(``/Meas/since?ts=<epoch>&limit=N``) and gets it in one reply.
+
+The history is a fixed-size ring of ``array('d')`` (one float64 per time and
+value, ``NaN`` for a missing value), so it costs nothing to keep a
+few hours and needs no numpy in the receivers that do not use it otherwise.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+HISTORY_SIZE = 7200  # one hour of 0.5 s frames
+
+
+class SampleHistory:
+    """The last ``size`` samples of ``fields`` with their timestamps, oldest dropped first.
+
+    Samples must be appended in time order. With ``decimals`` set, values are
+    served as strings with that many decimals, as the receivers' ``/Meas``
+    does; otherwise as numbers.
+    """
+
+    def __init__(self, fields: Sequence[str], size: int = HISTORY_SIZE, decimals: Optional[int] = None):
+        self.fields = tuple(fields)
+        self.size = size
+        self.decimals = decimals
+        self.count = 0  # samples appended so far; the oldest kept is count - len(self)
+        self._times = array("d", bytes(8 * size))
+        self._values = array("d", bytes(8 * size * len(self.fields)))
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return min(self.count, self.size)
+
+    def append(self, timestamp: float, values: Sequence[Optional[float]]) -> None:
+        if len(values) != len(self.fields):
+            raise ValueError("Data length mismatch")
+        width = len(self.fields)
+        with self._lock:
+            slot = self.count % self.size
+            self._times[slot] = timestamp
+            for i, value in enumerate(values):
+                self._values[slot * width + i] = math.nan if value is None else value
+            self.count += 1
+
+    def since(self, timestamp: float, limit: int, step: float = 0.0) -> Tuple[List[Dict[str, object]], bool]:
+        """Up to ``limit`` samples newer than ``timestamp``, oldest first, and whether more remain.
+
+        With ``step`` > 0, a sample closer than ``step`` s to the previous one
+        returned is skipped, so a 1 Hz consumer can catch up on a faster
+        receiver without taking every frame.
+        """
+        with self._lock:
+            # Binary search over the ring in append order for the first sample after timestamp
+            lo, hi = self.count - len(self), self.count
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if self._times[mid % self.size] > timestamp:
+                    hi = mid
+                else:
+                    lo = mid + 1
+
+            samples: List[Dict[str, object]] = []
+            previous = -math.inf
+            index = lo
+            while index < self.count and len(samples) < limit:
+                slot = index % self.size
+                sample_time = self._times[slot]
+                if sample_time - previous >= step:
+                    samples.append(self._record(slot))
+                    previous = sample_time
+                index += 1
+            return samples, index < self.count
+
+    def _record(self, slot: int) -> Dict[str, object]:
+        width = len(self.fields)
+        record: Dict[str, object] = {}
+        for i, field in enumerate(self.fields):
+            value = self._values[slot * width + i]
+            if math.isnan(value):
+                record[field] = None
+            elif self.decimals is None:
+                record[field] = value
+            else:
+                record[field] = f"{value:.{self.decimals}f}"
+        record["timestamp"] = self._times[slot]
+        return record
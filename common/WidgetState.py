@@ -0,0 +1,140 @@
+"""Retained widget state: only changed text, colours and geometry reach Tk.
+
+The GUIs refresh their readouts on a timer, and most ticks show the same
+values as the tick before. :class:`WidgetState` remembers the options last
+given to each widget and calls ``config`` / ``place`` only with the options
+that differ, and :meth:`WidgetState.changed` lets a caller format a sample
+once and skip the work while its key (a deque ``generation``, a tuple of
+values) stays the same.
+
+:class:`CanvasScene` does the same for canvas drawings that are rebuilt
+every frame: items are created once under a key and then moved or
+reconfigured only when their coordinates or options change, instead of
+``delete("all")`` and re-creating every item. Items not drawn in a frame are
+hidden rather than deleted.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Hashable, List, Optional
+
+_UNSET = object()
+
+
+class WidgetState:
+    """Last options applied to each widget; counts the Tk calls made and skipped."""
+
+    def __init__(self):
+        self.configured = 0
+        self.skipped = 0
+        self._options: Dict[object, Dict[str, object]] = {}
+        self._geometry: Dict[object, Optional[Dict[str, object]]] = {}
+        self._keys: Dict[Hashable, object] = {}
+
+    def changed(self, slot: Hashable, key: object) -> bool:
+        """Record ``key`` under ``slot``; True if it differs from the previous one."""
+        if self._keys.get(slot, _UNSET) == key:
+            return False
+        self._keys[slot] = key
+        return True
+
+    def set(self, widget, **options) -> bool:
+        """``widget.config`` with the options that differ from the last ones set; True if it was called."""
+        current = self._options.setdefault(widget, {})
+        diff = {name: value for name, value in options.items() if current.get(name, _UNSET) != value}
+        if not diff:
+            self.skipped += 1
+            return False
+        widget.config(**diff)
+        current.update(diff)
+        self.configured += 1
+        return True
+
+    def place(self, widget, **geometry) -> bool:
+        """``widget.place`` unless it is already placed with the same geometry."""
+        if self._geometry.get(widget) == geometry:
+            self.skipped += 1
+            return False
+        widget.place(**geometry)
+        self._geometry[widget] = geometry
+        self.configured += 1
+        return True
+
+    def place_forget(self, widget) -> bool:
+        """``widget.place_forget`` unless it is already unplaced."""
+        if widget in self._geometry and self._geometry[widget] is None:
+            self.skipped += 1
+            return False
+        widget.place_forget()
+        self._geometry[widget] = None
+        self.configured += 1
+        return True
+
+    def forget(self, widget) -> None:
+        """Drop what is known about ``widget``, after it was configured directly or destroyed."""
+        self._options.pop(widget, None)
+        self._geometry.pop(widget, None)
+
+
+class CanvasScene:
+    """Keyed canvas items kept across frames; only coordinate and option changes are sent to Tk.
+
+    Draw a frame between :meth:`begin` and :meth:`finish`, calling
+    :meth:`text` / :meth:`rectangle` with a key that names each item. Items
+    are stacked in drawing order.
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.created = 0
+        self.updated = 0
+        self._items: Dict[Hashable, list] = {}  # key -> [item id, coords, options]
+        self._drawn: List[Hashable] = []
+        self._restack = False
+        self._existing = 0
+
+    def begin(self) -> None:
+        self._drawn = []
+        # Items created in a later frame land above the older ones; finish() restacks then
+        self._restack = False
+        self._existing = len(self._items)
+
+    def text(self, key: Hashable, x: float, y: float, **options) -> None:
+        self._draw(key, "text", (x, y), options)
+
+    def rectangle(self, key: Hashable, x1: float, y1: float, x2: float, y2: float, **options) -> None:
+        self._draw(key, "rectangle", (x1, y1, x2, y2), options)
+
+    def _draw(self, key: Hashable, kind: str, coords: tuple, options: Dict[str, object]) -> None:
+        options["state"] = "normal"
+        entry = self._items.get(key)
+        if entry is None:
+            item = getattr(self.canvas, f"create_{kind}")(*coords, **options)
+            self._items[key] = [item, coords, options]
+            self.created += 1
+            self._restack = self._restack or self._existing > 0
+        else:
+            item, old_coords, old_options = entry
+            if coords != old_coords:
+                self.canvas.coords(item, *coords)
+                entry[1] = coords
+                self.updated += 1
+            diff = {name: value for name, value in options.items() if old_options.get(name, _UNSET) != value}
+            if diff:
+                self.canvas.itemconfigure(item, **diff)
+                old_options.update(diff)
+                self.updated += 1
+        self._drawn.append(key)
+
+    def finish(self) -> None:
+        """Hide the items not drawn in this frame."""
+        drawn = set(self._drawn)
+        for key, (item, _, options) in self._items.items():
+            if key not in drawn and options.get("state") != "hidden":
+                self.canvas.itemconfigure(item, state="hidden")
+                options["state"] = "hidden"
+                self.updated += 1
+        if self._restack:
+            for key in self._drawn:
+                self.canvas.tag_raise(self._items[key][0])
+            self._restack = False
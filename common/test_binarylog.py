@@ -0,0 +1,85 @@
+"""Tests for the fixed-record binary data log."""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from BinaryLog import HEADER_SIZE, BinaryLogReader, BinaryLogWriter, day_path
+
+
+def test_binary_log_round_trip_across_days(tmp_path):
+    writer = BinaryLogWriter(str(tmp_path), 2)
+    start = datetime(2024, 11, 1, 22, 0, 0)
+    for minute in range(240):
+        dt = start + timedelta(minutes=minute)
+        writer.append(dt, [minute, -minute], [2 * minute, 0.5], status=minute % 2)
+
+    reader = BinaryLogReader(str(tmp_path))
+    rows = reader.read(start + timedelta(minutes=100), start + timedelta(minutes=130))
+    assert len(rows) == 30
+    assert rows["time"][0] == (start + timedelta(minutes=100)).timestamp()
+    assert rows["raw"][:, 0].tolist() == list(range(100, 130))
+    assert rows["cal"][-1].tolist() == [258.0, 0.5]
+    assert rows["status"][:2].tolist() == [0, 1]
+    assert reader.read(start - timedelta(days=3), start - timedelta(days=2)) is None
+
+
+def test_binary_log_drops_torn_record_before_appending(tmp_path):
+    writer = BinaryLogWriter(str(tmp_path), 1)
+    dt = datetime(2024, 11, 1, 12, 0, 0)
+    writer.append(dt, [1.0])
+    path = day_path(str(tmp_path), dt)
+    with open(path, "ab") as file:
+        file.write(b"\x00\x01\x02")
+
+    BinaryLogWriter(str(tmp_path), 1).append(dt + timedelta(minutes=1), [2.0])
+    assert os.path.getsize(path) == HEADER_SIZE + 2 * writer.dtype.itemsize
+    rows = BinaryLogReader(str(tmp_path)).read(dt, dt + timedelta(hours=1))
+    assert np.array_equal(rows["raw"][:, 0], [1.0, 2.0])
+
+
+def test_binary_log_sets_aside_a_day_file_of_another_layout(tmp_path):
+    # Upgrade day: the morning was logged with a cal column, the afternoon is raw-only
+    dt = datetime(2024, 11, 1, 12, 0, 0)
+    path = day_path(str(tmp_path), dt)
+    BinaryLogWriter(str(tmp_path), 2).append(dt, [1.0, 2.0], [1.0, 2.0])
+    writer = BinaryLogWriter(str(tmp_path), 2, calibrated=False)
+    for minute in range(1, 4):
+        writer.append(dt + timedelta(minutes=minute), [3.0, 4.0])
+
+    old_path = os.path.splitext(path)[0] + ".old.bin"
+    assert os.path.getsize(old_path) == HEADER_SIZE + BinaryLogWriter(str(tmp_path), 2).dtype.itemsize
+    rows = BinaryLogReader(str(tmp_path)).read(dt, dt + timedelta(hours=1))
+    assert rows.dtype.names == ("time", "raw", "status")
+    assert rows["raw"].tolist() == [[3.0, 4.0]] * 3
+
+    # Another switch on the same day keeps the first renamed file
+    BinaryLogWriter(str(tmp_path), 1).append(dt + timedelta(minutes=5), [5.0])
+    assert os.path.isfile(old_path)
+    assert os.path.isfile(os.path.splitext(path)[0] + ".old2.bin")
+
+
+def test_binary_log_raw_only_layout_has_no_cal_column(tmp_path):
+    dt = datetime(2024, 11, 1, 12, 0, 0)
+    writer = BinaryLogWriter(str(tmp_path), 2, calibrated=False)
+    writer.append(dt, [1.0, 2.0], status=1)
+    assert writer.dtype.itemsize == 8 + 2 * 4 + 1
+
+    rows = BinaryLogReader(str(tmp_path)).read(dt, dt + timedelta(hours=1))
+    assert rows.dtype.names == ("time", "raw", "status")
+    assert rows["raw"][0].tolist() == [1.0, 2.0]
+    assert rows["status"].tolist() == [1]
+
+
+def test_binary_log_reads_across_switch_to_raw_only(tmp_path):
+    dt = datetime(2024, 11, 1, 12, 0, 0)
+    BinaryLogWriter(str(tmp_path), 2).append(dt, [1.0, 2.0], [10.0, 20.0])
+    BinaryLogWriter(str(tmp_path), 2, calibrated=False).append(dt + timedelta(days=1), [3.0, 4.0])
+
+    rows = BinaryLogReader(str(tmp_path)).read(dt, dt + timedelta(days=2))
+    assert rows.dtype.names == ("time", "raw", "status")
+    assert rows["raw"].tolist() == [[1.0, 2.0], [3.0, 4.0]]
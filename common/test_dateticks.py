@@ -0,0 +1,61 @@
+"""Tests for the cached interval date locator and formatter."""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+import matplotlib.dates as mdates
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from DateTicks import CachedDateFormatter, IntervalDateLocator, interval_ticks
+
+
+def _walk(vmin, vmax, step, align):
+    """Reference: walk ``datetime`` objects from the aligned start, as the plotters used to."""
+    start = mdates.num2date(vmin).replace(microsecond=0, tzinfo=None)
+    end = mdates.num2date(vmax).replace(microsecond=0, tzinfo=None)
+    since_midnight = start.hour * 3600 + start.minute * 60 + start.second
+    current = start - timedelta(seconds=since_midnight % align)
+    ticks = []
+    while current <= end:
+        ticks.append(mdates.date2num(current))
+        current += timedelta(seconds=step)
+    return ticks
+
+
+def test_ticks_match_the_datetime_walk():
+    rng = np.random.default_rng(0)
+    for step, align in ((20, 20), (1200, 1200), (7200, 3600), (36000, 36000)):
+        for _ in range(200):
+            start = datetime(2024, 11, 8) + timedelta(seconds=int(rng.integers(0, 10 * 86400)))
+            vmin = mdates.date2num(start) + rng.choice([0.0, rng.uniform(0, 1 / 86400)])
+            vmax = vmin + rng.uniform(0, 300 * step) / 86400
+            expected = _walk(vmin, vmax, step, align)
+            ticks = interval_ticks(vmin, vmax, step, align)
+            assert len(ticks) == len(expected)
+            np.testing.assert_allclose(ticks, expected, rtol=0, atol=1e-9)
+
+
+def test_ten_hour_ticks_restart_from_the_aligned_hour():
+    vmin = mdates.date2num(datetime(2024, 11, 8, 13, 25))
+    vmax = mdates.date2num(datetime(2024, 11, 9, 12, 0))
+    ticks = [mdates.num2date(t).strftime("%d %H:%M") for t in interval_ticks(vmin, vmax, 36000, 36000)]
+    assert ticks == ["08 10:00", "08 20:00", "09 06:00"]
+
+
+def test_locator_and_formatter_cache_their_results():
+    locator = IntervalDateLocator(20)
+    vmin = mdates.date2num(datetime(2024, 11, 8, 12, 0, 7))
+    vmax = vmin + 600 / 86400
+    first = locator.tick_values(vmin, vmax)
+    assert locator.tick_values(vmin, vmax) is first and locator.hits == 1
+    assert mdates.num2date(first[0]).strftime("%H:%M:%S") == "12:00:00"
+    assert len(first) == 31
+
+    formatter = CachedDateFormatter("%H:%M:%S")
+    labels = [formatter(x) for x in first]
+    assert labels[:2] == ["12:00:00", "12:00:20"]
+    assert [formatter(x) for x in first] == labels
+    assert len(formatter._labels) == len(first)
@@ -0,0 +1,67 @@
+"""Tests for min/max and LTTB level-of-detail decimation."""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from Decimation import DecimatedLines, MinMaxPyramid, lttb
+
+
+def _series(count, channels=3):
+    rng = np.random.default_rng(0)
+    return np.arange(count, dtype=np.float64), np.cumsum(rng.normal(size=(count, channels)), axis=0)
+
+
+def test_minmax_keeps_the_extremes_of_every_pixel_column():
+    x, values = _series(100_000)
+    values[51_234, 1] = 1e6  # single-sample spike
+    pyramid = MinMaxPyramid(x, values)
+
+    selected = pyramid.select(20_000.0, 80_000.0, 500)
+    for channel, indices in enumerate(selected):
+        assert np.all(np.diff(indices) >= 0)
+        assert 500 <= len(indices) <= 3 * 500  # about two points per pixel
+        inside = values[20_000:80_001, channel]
+        drawn = values[indices, channel]
+        assert drawn.max() >= inside.max() and drawn.min() <= inside.min()
+    assert 51_234 in selected[1]
+
+
+def test_short_ranges_are_returned_whole():
+    x, values = _series(1_000)
+    pyramid = MinMaxPyramid(x, values)
+    (indices,) = pyramid.select(100.0, 200.0, 800, channels=[2])
+    assert indices.tolist() == list(range(99, 202))
+    with pytest.raises(ValueError):
+        pyramid.select(0.0, 10.0, 100, method="mean")
+
+
+def test_lttb_keeps_endpoints_and_the_requested_count():
+    x, values = _series(10_000, channels=1)
+    indices = lttb(x, values[:, 0], 200)
+    assert len(indices) == 200
+    assert indices[0] == 0 and indices[-1] == 9_999
+    assert np.all(np.diff(indices) > 0)
+
+    (selected,) = MinMaxPyramid(x, values).select(0.0, 9_999.0, 100, method="lttb")
+    assert len(selected) == 200
+
+
+def test_decimated_lines_follow_zoom():
+    from matplotlib.figure import Figure
+
+    x, values = _series(200_000, channels=2)
+    ax = Figure(figsize=(6, 4), dpi=100).add_subplot()
+    twin = ax.twinx()
+    lines = ax.plot(x, values[:, 0]) + twin.plot(x, values[:, 1])
+    DecimatedLines(x, values, lines)
+
+    full = len(lines[0].get_xdata())
+    assert full < 4 * ax.bbox.width
+    ax.set_xlim(1_000, 1_200)
+    assert lines[0].get_xdata()[0] <= 1_000 and lines[0].get_xdata()[-1] >= 1_200
+    assert len(lines[0].get_xdata()) == 203
@@ -0,0 +1,86 @@
+"""Tests for debounced resize handling and the cached figure layout."""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import matplotlib
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from FigureLayout import FigureLayout, font_sizes
+
+
+class _FakeMaster:
+    """Stands in for the Tk root: ``after`` callbacks run only when the test fires them."""
+
+    def __init__(self):
+        self.pending = {}
+        self._next_id = 0
+
+    def after(self, delay_ms, callback):
+        self._next_id += 1
+        self.pending[self._next_id] = callback
+        return self._next_id
+
+    def after_cancel(self, after_id):
+        del self.pending[after_id]
+
+    def fire_all(self):
+        callbacks, self.pending = list(self.pending.values()), {}
+        for callback in callbacks:
+            callback()
+
+
+def _figure():
+    figure = Figure(figsize=(8, 4), dpi=100)
+    FigureCanvasAgg(figure)
+    ax = figure.add_subplot()
+    ax.plot([0, 1], [0, 1], label="line")
+    ax.set_ylabel("Pressure (psi)")
+    ax.legend()
+    return figure, ax
+
+
+def test_resize_events_are_debounced_to_the_final_root_width():
+    master = _FakeMaster()
+    figure, _ = _figure()
+    settled = []
+    layout = FigureLayout(master, figure, lambda: settled.append(layout.width))
+
+    for width in range(900, 1300, 10):
+        layout.configure(SimpleNamespace(widget=master, width=width))
+    layout.configure(SimpleNamespace(widget=object(), width=200))  # child widget
+    assert len(master.pending) == 1
+    master.fire_all()
+
+    assert settled == [1290]
+    assert layout.sizes == font_sizes(1290)
+
+
+def test_fonts_go_to_the_figure_and_layouts_are_cached():
+    rc_font = matplotlib.rcParams["font.size"]
+    master = _FakeMaster()
+    figure, ax = _figure()
+    layout = FigureLayout(master, figure, lambda: None)
+    layout.configure(SimpleNamespace(widget=master, width=1500))
+    master.fire_all()
+
+    layout.relayout()
+    assert ax.yaxis.label.get_fontsize() == 20
+    assert ax.get_xticklabels()[0].get_fontsize() == 16
+    assert ax.get_legend().get_texts()[0].get_fontsize() == 18
+    assert matplotlib.rcParams["font.size"] == rc_font
+    left = figure.subplotpars.left
+
+    figure.subplots_adjust(left=0.3)
+    figure.set_size_inches(8.1, 4)  # same 40 px bucket
+    layout.relayout()
+    assert layout.relayouts == 1
+    assert figure.subplotpars.left == left
+
+    figure.set_size_inches(12, 4)
+    layout.relayout()
+    assert layout.relayouts == 2
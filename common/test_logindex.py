@@ -0,0 +1,82 @@
+"""Tests for the daily log summary sidecars."""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from LogIndex import (
+    LogIndexWriter,
+    cached_summary,
+    load_summary,
+    outside_range,
+    read_summary,
+    rebuild_summary,
+)
+
+
+def _append(path, writer, dt, values):
+    offset = os.path.getsize(path) if os.path.exists(path) else 0
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(f"{dt:%Y-%m-%d %H:%M:%S}: {values[0]:.2f} L, {values[1]:.2f} psi\n")
+    writer.record(path, offset, dt, [round(value, 2) for value in values])
+
+
+def test_incremental_sidecar_matches_rebuild(tmp_path):
+    path = str(tmp_path / "01.txt")
+    writer = LogIndexWriter()
+    start = datetime(2024, 11, 1, 0, 0, 15)
+    for minute in list(range(0, 120)) + list(range(180, 200)):
+        _append(path, writer, start + timedelta(minutes=minute), [minute / 4, -minute / 8])
+
+    summary = load_summary(path)
+    assert summary.rows == 140
+    assert summary.first == "2024-11-01 00:00:15"
+    assert summary.last_time == start + timedelta(minutes=199)
+    assert summary.max_gap == 61 * 60
+    assert summary.minimum == [0.0, -24.88] and summary.maximum == [49.75, 0.0]
+    assert sorted(summary.hour_offsets) == ["00", "01", "03"]
+    with open(path, "rb") as f:
+        for hour, offset in summary.hour_offsets.items():
+            f.seek(offset)
+            assert f.readline().startswith(f"2024-11-01 {hour}:00:15".encode())
+
+    rebuilt = rebuild_summary(path)
+    assert rebuilt == summary
+    assert abs(summary.mean[0] - rebuilt.mean[0]) < 1e-9
+
+
+def test_writer_and_reader_catch_up_on_foreign_writes(tmp_path):
+    path = str(tmp_path / "02.txt")
+    writer = LogIndexWriter()
+    start = datetime(2024, 11, 2, 0, 0, 0)
+    _append(path, writer, start, [1.0, 2.0])
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("2024-11-02 00:01:00: 3.00 L, 4.00 psi\n")
+    assert cached_summary(path) is None  # stale: the sidecar no longer covers the log
+
+    _append(path, writer, start + timedelta(minutes=2), [5.0, 6.0])
+    assert cached_summary(path).rows == 3
+    assert cached_summary(path).maximum == [5.0, 6.0]
+
+    with open(path, "w", encoding="utf-8") as f:  # log replaced by a shorter one
+        f.write("2024-11-02 05:00:00: 7.00 L, 8.00 psi\n")
+    summary = read_summary(path)
+    assert (summary.rows, summary.first) == (1, "2024-11-02 05:00:00")
+
+
+def test_outside_range_uses_only_current_sidecars(tmp_path):
+    path = str(tmp_path / "03.txt")
+    writer = LogIndexWriter()
+    start = datetime(2024, 11, 3, 10, 0, 0)
+    _append(path, writer, start, [1.0, 2.0])
+    _append(path, writer, start + timedelta(hours=2), [1.0, 2.0])
+
+    assert outside_range(path, start + timedelta(hours=3))
+    assert outside_range(path, start - timedelta(days=1), until=start)
+    assert not outside_range(path, start + timedelta(hours=1))
+
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("2024-11-03 23:00:00: 1.00 L, 2.00 psi\n")
+    assert not outside_range(path, start + timedelta(hours=3))
@@ -0,0 +1,76 @@
+"""Tests for the fast data log parser."""
+
+import os
+import re
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from LogParser import LogParser
+
+_PRESSURE_RE = re.compile(
+    r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}): "
+    r"(-?\d+\.\d{2}) L, (-?\d+\.\d{2}) psi, (-?\d+\.\d{2}) psi, (-?\d+\.\d{2}) psi$"
+)
+
+
+def _write_day(path, start, minutes, extra_lines=()):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        for m in range(minutes):
+            dt = start + timedelta(minutes=m)
+            f.write(f"{dt:%Y-%m-%d %H:%M:%S}: {m / 7:.2f} L, {-m / 3:.2f} psi, 1.00 psi, {m:.2f} psi\r\n")
+        for line in extra_lines:
+            f.write(line + "\n")
+
+
+def test_parser_matches_regex_and_filters_window(tmp_path):
+    start = datetime(2024, 11, 1, 0, 0, 0)
+    path = str(tmp_path / "01.txt")
+    _write_day(path, start, 1440, extra_lines=[
+        "2024-11-01 23:59:59: 0.00 V, 0.00 psi, 0.00 psi",  # legacy 3-column line
+        "garbage",
+        "2024-11-01 23:59:59:  1.00 L, 2.00 psi, 3.00 psi, 4.00 psi",  # regex rejects too
+    ])
+
+    parser = LogParser(4, units=(" L", " psi"), line_re=_PRESSURE_RE)
+    since = start + timedelta(hours=20)
+    times, values = parser.parse_files([path], since, until=start + timedelta(hours=23))
+
+    assert len(times) == 180
+    assert times[0] == since.timestamp()
+    assert np.all(np.diff(times) == 60)
+    m = 1200 + np.arange(180)
+    assert np.allclose(values[:, 0], np.round(m / 7, 2))
+    assert np.allclose(values[:, 1], np.round(-m / 3, 2))
+    assert np.allclose(values[:, 3], m)
+
+
+def test_parser_falls_back_to_regex_for_odd_lines(tmp_path):
+    path = str(tmp_path / "02.txt")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("2024-11-02 00:00:00: 1.00 L, 2.00 psi, 3.00 psi, 4.00 psi\n")
+        f.write("2024-11-02 00:01:00: 1.00 L, 2.00 psi, 3.00 psi, 4.00 psi   \n")  # trailing blanks
+        f.write("2024-11-02 00:02:00: 1.0.0 L, 2.00 psi, 3.00 psi, 4.00 psi\n")
+        f.write("2024-11-02 00:03:00: 5.00 L, 6.00 psi, 7.00 psi, 8.00 psi")  # no newline
+
+    parser = LogParser(4, units=(" L", " psi"), line_re=_PRESSURE_RE)
+    times, values = parser.parse_files([path], datetime(2024, 11, 1))
+    assert [datetime.fromtimestamp(t).minute for t in times] == [0, 1, 3]
+    assert values[-1].tolist() == [5.0, 6.0, 7.0, 8.0]
+
+
+def test_parser_reads_from_the_end_across_blocks(tmp_path, monkeypatch):
+    import LogParser as module
+
+    monkeypatch.setattr(module, "_BLOCK_SIZE", 97)
+    start = datetime(2024, 11, 3, 0, 0, 0)
+    path = str(tmp_path / "03.txt")
+    _write_day(path, start, 300)
+
+    parser = LogParser(4, units=(" L", " psi"), line_re=_PRESSURE_RE)
+    times, values = parser.parse_files([path], start + timedelta(minutes=250))
+    assert len(times) == 50
+    assert values[:, 3].tolist() == list(range(250, 300))
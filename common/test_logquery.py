@@ -0,0 +1,103 @@
+"""Tests for streaming range queries over the daily data logs."""
+
+import io
+import os
+import sys
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import LogQuery
+from LogIndex import rebuild_summary
+from LogQuery import first_offset, iter_range, read_range, write_csv
+
+
+def _write_days(log_dir, start, days, step=timedelta(seconds=20)):
+    """Flow/temp style logs with value 0 = minutes since ``start``; returns all timestamps."""
+    stamps = []
+    dt = start
+    for _ in range(days):
+        day_end = (dt + timedelta(days=1)).replace(hour=0, minute=0, second=0)
+        path = os.path.join(log_dir, f"{dt:%Y}", f"{dt:%m}", f"{dt:%d}.txt")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            while dt < day_end:
+                minutes = (dt - start).total_seconds() / 60
+                f.write(f"{dt:%Y-%m-%d %H:%M:%S}: {minutes:.2f}, 1.00, 2.00, 3.00, 4.00, 5.00\n")
+                stamps.append(dt)
+                dt += step
+    return stamps
+
+
+def test_iter_range_yields_fixed_chunks_of_the_range(tmp_path):
+    start = datetime(2024, 11, 1, 0, 0, 5)
+    stamps = _write_days(str(tmp_path), start, 3)
+    since, until = datetime(2024, 11, 1, 13, 0), datetime(2024, 11, 3, 2, 30)
+
+    chunks = list(iter_range("flowtemp", since, until, log_dir=str(tmp_path), chunk_rows=1000))
+    assert all(len(times) == 1000 for times, _ in chunks[:-1])
+    assert 0 < len(chunks[-1][0]) <= 1000
+
+    times = np.concatenate([times for times, _ in chunks])
+    values = np.concatenate([values for _, values in chunks])
+    expected = [dt for dt in stamps if since <= dt < until]
+    assert np.array_equal(times, [dt.timestamp() for dt in expected])
+    assert np.allclose(values[:, 0], [round((dt - start).total_seconds() / 60, 2) for dt in expected])
+    assert np.all(values[:, 1:] == [1.0, 2.0, 3.0, 4.0, 5.0])
+
+    empty_times, empty_values = read_range("flowtemp", until + timedelta(days=5), log_dir=str(tmp_path))
+    assert len(empty_times) == 0 and empty_values.shape == (0, 6)
+
+
+def test_days_outside_the_range_are_not_opened(tmp_path, monkeypatch):
+    _write_days(str(tmp_path), datetime(2024, 11, 1), 4)
+    for day in ("01", "02", "03", "04"):
+        rebuild_summary(str(tmp_path / "2024" / "11" / f"{day}.txt"))
+
+    opened = []
+    parser = LogQuery.FORMATS["flowtemp"].parser
+    original = type(parser).iter_blocks
+
+    def recording(self, path, offset=0):
+        opened.append((os.path.basename(path), offset))
+        return original(self, path, offset)
+
+    monkeypatch.setattr(type(parser), "iter_blocks", recording)
+    times, _ = read_range("flowtemp", datetime(2024, 11, 2, 6), datetime(2024, 11, 3, 1), log_dir=str(tmp_path))
+
+    assert [name for name, _ in opened] == ["02.txt", "03.txt"]
+    assert opened[0][1] > 0  # seeked to the 06 h offset from the sidecar
+    assert times[0] == datetime(2024, 11, 2, 6).timestamp()
+    assert times[-1] == datetime(2024, 11, 3, 0, 59, 40).timestamp()
+
+
+def test_first_offset_bisects_without_sidecar(tmp_path):
+    _write_days(str(tmp_path), datetime(2024, 11, 1), 1, step=timedelta(seconds=2))
+    path = str(tmp_path / "2024" / "11" / "01.txt")
+    start = datetime(2024, 11, 1, 17, 30, 1)
+
+    offset = first_offset(path, start)
+    assert offset > 0
+    assert offset >= os.path.getsize(path) // 2  # skipped the morning
+    with open(path, "rb") as f:
+        f.seek(offset)
+        head = f.read(LogQuery._BISECT_STOP + 128)
+    assert head[:19] <= b"2024-11-01 17:30:01"
+    assert b"\n2024-11-01 17:30:02" in head  # the first row in range lies within one read block
+
+
+def test_write_csv(tmp_path):
+    _write_days(str(tmp_path), datetime(2024, 11, 1), 1)
+    out = io.StringIO()
+    rows = iter_range("flowtemp", datetime(2024, 11, 1, 12), datetime(2024, 11, 1, 12, 1), log_dir=str(tmp_path))
+    count = write_csv(rows, LogQuery.FORMATS["flowtemp"].columns, out)
+
+    assert count == 3
+    assert out.getvalue().splitlines() == [
+        "time,Tip,Shield,Bypass,Pumping,Head,ColdTip",
+        "2024-11-01 12:00:00,720.0,1.0,2.0,3.0,4.0,5.0",
+        "2024-11-01 12:00:20,720.33,1.0,2.0,3.0,4.0,5.0",
+        "2024-11-01 12:00:40,720.67,1.0,2.0,3.0,4.0,5.0",
+    ]
@@ -0,0 +1,99 @@
+"""Tests for the one-line-per-minute data log layout."""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from LogIndex import LogIndexWriter, load_summary, read_summary, rebuild_summary
+from LogQuery import FORMATS, read_range
+from MinuteLog import MinuteLogWriter, minute_offset
+
+_UNITS = (" L", " psi", " psi", " psi")
+
+
+def _day_file(tmp_path):
+    path = tmp_path / "2024" / "11" / "01.txt"
+    path.parent.mkdir(parents=True)
+    return str(path)
+
+
+def test_writer_pads_gaps_to_one_line_per_minute(tmp_path):
+    path = _day_file(tmp_path)
+    writer = MinuteLogWriter(_UNITS)
+    day = datetime(2024, 11, 1)
+
+    assert writer.append(path, day + timedelta(hours=10, minutes=52), [41.18, 0.51, 6.73, 1.2]) == 652 * writer.width
+    assert writer.append(path, day + timedelta(hours=10, minutes=55), [-3.5, 0.5, 6.7, 1.2]) == 655 * writer.width
+    assert writer.append(path, day + timedelta(hours=10, minutes=55, seconds=30), [0, 0, 0, 0]) is None
+
+    with open(path, "rb") as f:
+        lines = f.read().splitlines(keepends=True)
+    assert len(lines) == 656
+    assert {len(line) for line in lines} == {writer.width}
+    assert lines[0].startswith(b"2024-11-01 00:00:00: --------- L, --------- psi")
+    assert lines[652] == b"2024-11-01 10:52:00: 000041.18 L, 000000.51 psi, 000006.73 psi, 000001.20 psi" + os.linesep.encode()
+    assert lines[655].startswith(b"2024-11-01 10:55:00: -00003.50 L, ")
+
+    # Only the two data lines are rows for every reader.
+    times, values = read_range("pressurelevel", day, day + timedelta(days=1), log_dir=str(tmp_path))
+    assert [datetime.fromtimestamp(t) for t in times] == [day.replace(hour=10, minute=52), day.replace(hour=10, minute=55)]
+    assert np.allclose(values, [[41.18, 0.51, 6.73, 1.2], [-3.5, 0.5, 6.7, 1.2]])
+    summary = read_summary(path, write=False)
+    assert summary.rows == 2 and summary.minimum == [-3.5, 0.5, 6.7, 1.2]
+    assert FORMATS["pressurelevel"].parser.line_re.match(lines[652].decode().strip())
+
+
+def test_minute_offset_seeks_directly(tmp_path):
+    path = _day_file(tmp_path)
+    writer = MinuteLogWriter(("",) * 6)
+    day = datetime(2024, 11, 1)
+    for minute in range(0, 600, 7):
+        writer.append(path, day + timedelta(minutes=minute), [minute] * 6)
+
+    assert minute_offset(path, day + timedelta(minutes=301, seconds=20)) == 301 * writer.width
+    assert minute_offset(path, day + timedelta(hours=20)) == os.path.getsize(path)
+    times, _ = read_range("flowtemp", day + timedelta(minutes=300), day + timedelta(minutes=330), log_dir=str(tmp_path))
+    assert [round((t - day.timestamp()) / 60) for t in times] == [301, 308, 315, 322, 329]
+
+
+def test_legacy_files_are_appended_unpadded(tmp_path):
+    path = _day_file(tmp_path)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("2024-11-01 10:52:15: 41.18 L, 0.51 psi, 6.73 psi, 1.20 psi\n")
+    writer = MinuteLogWriter(_UNITS)
+
+    offset = writer.append(path, datetime(2024, 11, 1, 10, 55), [1, 2, 3, 4])
+    assert offset == os.path.getsize(path) - writer.width
+    assert minute_offset(path, datetime(2024, 11, 1, 10, 55)) is None
+    times, _ = read_range("pressurelevel", datetime(2024, 11, 1, 10, 53), datetime(2024, 11, 2), log_dir=str(tmp_path))
+    assert [datetime.fromtimestamp(t) for t in times] == [datetime(2024, 11, 1, 10, 55)]
+
+
+def test_missing_values_are_dashed_fields_and_read_back_as_nan(tmp_path):
+    path = _day_file(tmp_path)
+    writer = MinuteLogWriter(("",) * 6)
+    index = LogIndexWriter()
+    day = datetime(2024, 11, 1)
+    rows = [[1.0, 2.0, 3.0, 4.0, 80.0, 40.0], [1.5, 2.5, 3.5, 4.5, np.nan, np.nan]]
+    for minute, values in enumerate(rows):
+        offset = writer.append(path, day + timedelta(minutes=minute), values)
+        index.record(path, offset, day + timedelta(minutes=minute), values)
+
+    with open(path, "rb") as f:
+        lines = f.read().splitlines()
+    assert lines[1] == b"2024-11-01 00:01:00: 000001.50, 000002.50, 000003.50, 000004.50, ---------, ---------"
+
+    times, values = read_range("flowtemp", day, day + timedelta(days=1), log_dir=str(tmp_path))
+    assert len(times) == 2
+    assert np.array_equal(values, rows, equal_nan=True)
+
+    # The missing temperatures do not enter the stats, neither incrementally nor on a rebuild
+    for summary in (load_summary(path), rebuild_summary(path)):
+        assert summary.rows == 2
+        assert summary.missing == [0, 0, 0, 0, 1, 1]
+        assert summary.maximum[3:] == [4.5, 80.0, 40.0]
+        assert summary.mean[4:] == [80.0, 40.0]
@@ -0,0 +1,226 @@
+"""Tests for the HTTP/1.1 keep-alive receiver handler, snapshots and their formats, the push stream and ``/Meas/since``."""
+
+import http.client
+import json
+import os
+import sys
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ReceiverHTTP import KeepAliveHandler, SampleStream, Snapshot
+from SampleFormat import ARRAY_TYPE, BINARY_TYPE, decode_binary
+from SampleHistory import SampleHistory
+
+
+class _Handler(KeepAliveHandler):
+    connections = set()
+    stream = SampleStream()
+    history = SampleHistory(("P_st",), decimals=3)
+    snapshot = Snapshot.of({"a": 0, "b": 0, "timestamp": 0.0}, 0, (0, 0))
+
+    def do_GET(self):
+        path, _, query = self.path.partition("?")
+        if path == "/Meas":
+            self.connections.add(self.client_address)
+            self.send_json({"P_st": "1.000", "timestamp": 0.0})
+        elif path == "/Meas/frame":
+            self.send_snapshot(self.snapshot)
+        elif path == "/Meas/stream":
+            self.send_event_stream(self.stream, heartbeat_s=0.05)
+        elif path == "/Meas/since":
+            self.send_since(self.history, query)
+        else:
+            self.send_error(404)
+
+    def log_message(self, format, *args):
+        return
+
+
+def _serve():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_polls_reuse_one_connection_and_other_clients_are_still_served():
+    _Handler.connections = set()
+    server = _serve()
+    try:
+        first = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+        for _ in range(3):
+            first.request("GET", "/Meas")
+            response = first.getresponse()
+            assert response.status == 200 and response.version == 11
+            assert int(response.getheader("Content-Length")) > 0
+            assert json.loads(response.read()) == {"P_st": "1.000", "timestamp": 0.0}
+        assert len(_Handler.connections) == 1
+
+        # The first connection stays open; a second client is not blocked by it
+        second = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+        second.request("GET", "/Meas")
+        assert second.getresponse().read()
+        assert len(_Handler.connections) == 2
+
+        first.request("GET", "/missing")
+        response = first.getresponse()
+        response.read()
+        assert response.status == 404
+        first.close()
+        second.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_stream_queues_are_bounded_per_subscriber():
+    stream = SampleStream(queue_size=3)
+    fast, slow = stream.subscribe(), stream.subscribe()
+    assert stream.subscribers == 2
+
+    stream.publish(b"1")
+    assert stream.take(fast, 0) == [b"id: 1\ndata: 1\n\n"]
+    for value in (b"2", b"3", b"4", b"5"):
+        stream.publish(value)
+        assert len(stream.take(fast, 0)) == 1
+    assert fast.dropped == 0
+    # The slow subscriber keeps the newest three of its five events
+    assert [event.split(b"\n")[0] for event in stream.take(slow, 0)] == [b"id: 3", b"id: 4", b"id: 5"]
+    assert slow.dropped == 2
+    assert stream.take(slow, 0) == []
+
+    stream.unsubscribe(slow)
+    stream.close()
+    assert stream.subscribers == 1 and stream.take(fast, 1) is None
+
+
+def test_stream_pushes_chunked_events_until_closed():
+    _Handler.stream = SampleStream()
+    server = _serve()
+    try:
+        client = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+        client.request("GET", "/Meas/stream")
+        response = client.getresponse()
+        assert response.status == 200
+        assert response.getheader("Content-Type") == "text/event-stream"
+        assert response.getheader("Transfer-Encoding") == "chunked"
+
+        # Nothing published yet: heartbeats keep the connection alive
+        assert response.readline() == b": heartbeat\n"
+        assert response.readline() == b"\n"
+
+        _Handler.stream.publish(json.dumps({"P_st": "1.000"}).encode())
+        events = []
+        while len(events) < 1:
+            line = response.readline()
+            if line.startswith(b"data:"):
+                events.append(json.loads(line[5:]))
+        assert events == [{"P_st": "1.000"}]
+
+        _Handler.stream.close()
+        response.read()
+        assert response.isclosed()
+        client.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_since_returns_missed_samples_in_one_reply():
+    _Handler.history = SampleHistory(("P_st",), decimals=3)
+    for i in range(6):
+        _Handler.history.append(100.0 + 0.5 * i, (float(i),))
+    server = _serve()
+    try:
+        client = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+
+        def get(path):
+            client.request("GET", path)
+            response = client.getresponse()
+            return response.status, response.read()
+
+        status, body = get("/Meas/since?ts=100.0&limit=10&step=1")
+        assert status == 200
+        assert json.loads(body) == {
+            "samples": [
+                {"P_st": "1.000", "timestamp": 100.5},
+                {"P_st": "3.000", "timestamp": 101.5},
+                {"P_st": "5.000", "timestamp": 102.5},
+            ],
+            "more": False,
+        }
+        assert json.loads(get("/Meas/since?ts=0&limit=2")[1])["more"] is True
+        assert get("/Meas/since")[0] == 400
+        assert get("/Meas/since?ts=0&limit=0")[0] == 400
+        client.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_snapshot_is_immutable_and_serialised_once():
+    snapshot = Snapshot.of({"P_st": "1.000", "timestamp": 5.0}, 3, (1.0004,))
+    assert json.loads(snapshot.body) == dict(snapshot.record)
+    with pytest.raises(TypeError):
+        snapshot.record["P_st"] = "2.000"
+
+
+def test_meas_format_follows_the_accept_header():
+    _Handler.snapshot = Snapshot.of({"P_st": "6.123", "P_pl": None, "timestamp": 5.0}, 9, (6.1234567, None))
+    server = _serve()
+    try:
+        client = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+
+        def get(accept=None):
+            client.request("GET", "/Meas/frame", headers={"Accept": accept} if accept else {})
+            response = client.getresponse()
+            return response.getheader("Content-Type"), response.read()
+
+        content_type, body = get()
+        assert content_type == "application/json"
+        assert json.loads(body) == {"P_st": "6.123", "P_pl": None, "timestamp": 5.0}
+        assert json.loads(get("application/json")[1]) == json.loads(body)
+
+        content_type, body = get(ARRAY_TYPE)
+        assert content_type == ARRAY_TYPE and json.loads(body) == [9, 5.0, 6.1234567, None]
+
+        content_type, body = get(f"{BINARY_TYPE}, application/json;q=0.5")
+        sequence, timestamp, values = decode_binary(body)
+        assert content_type == BINARY_TYPE
+        assert (sequence, timestamp, values[0]) == (9, 5.0, 6.1234567) and values[1] != values[1]
+        client.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_replies_never_mix_two_frames():
+    stop = threading.Event()
+
+    def publish():
+        frame = 0
+        while not stop.is_set():
+            frame += 1
+            _Handler.snapshot = Snapshot.of({"a": frame, "b": frame, "timestamp": 0.0}, frame, (frame, frame))
+
+    server = _serve()
+    writer = threading.Thread(target=publish)
+    writer.start()
+    try:
+        client = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+        frames = set()
+        for _ in range(200):
+            client.request("GET", "/Meas/frame")
+            record = json.loads(client.getresponse().read())
+            assert record["a"] == record["b"]
+            frames.add(record["a"])
+        assert len(frames) > 1
+        client.close()
+    finally:
+        stop.set()
+        writer.join()
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,69 @@
+"""Tests for the coalescing plot render scheduler."""
+
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import RenderScheduler as module
+from RenderScheduler import RenderScheduler
+
+
+class _FakeMaster:
+    """Stands in for the Tk root: ``after`` callbacks run only when the test fires them."""
+
+    def __init__(self):
+        self.pending = []
+
+    def after(self, delay_ms, callback):
+        self.pending.append((delay_ms, callback))
+        return len(self.pending)
+
+    def after_cancel(self, after_id):
+        self.pending.clear()
+
+    def fire(self):
+        delay_ms, callback = self.pending.pop(0)
+        callback()
+        return delay_ms
+
+
+def test_requests_coalesce_into_one_render_per_frame():
+    master = _FakeMaster()
+    renders = []
+    scheduler = RenderScheduler(master, lambda: renders.append(1), frame_budget_ms=200)
+    scheduler.start()
+
+    threads = [threading.Thread(target=scheduler.request) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    master.fire()
+    master.fire()  # clean frame: nothing to draw
+    scheduler.request()
+    master.fire()
+
+    assert len(renders) == 2
+    assert scheduler.counts() == {"requested": 6, "rendered": 2, "merged": 4, "dropped": 0}
+    assert len(master.pending) == 1  # exactly one timer, never a queue of callbacks
+
+    scheduler.stop()
+    assert master.pending == []
+
+
+def test_slow_frames_skip_missed_slots(monkeypatch):
+    master = _FakeMaster()
+    clock = iter([0.0, 0.45, 1.0, 1.01])
+    monkeypatch.setattr(module.time, "monotonic", lambda: next(clock))
+    scheduler = RenderScheduler(master, lambda: None, frame_budget_ms=200)
+    scheduler.start()
+
+    scheduler.request()
+    master.fire()
+    assert master.pending[0][0] == 150  # 450 ms render: next slot at 600 ms, not back to back
+    scheduler.request()
+    master.fire()
+    assert master.pending[0][0] == 190
+    assert scheduler.counts()["dropped"] == 2  # the 200 and 400 ms slots the first render overran
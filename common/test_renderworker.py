@@ -0,0 +1,131 @@
+"""Tests for the off-thread plot render worker."""
+
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from RenderWorker import RenderWorker
+
+
+class _FakeMaster:
+    """Stands in for the Tk root: ``after`` callbacks run only when the test fires them."""
+
+    def __init__(self):
+        self.pending = []
+
+    def after(self, delay_ms, callback):
+        self.pending.append(callback)
+        return len(self.pending)
+
+    def after_cancel(self, after_id):
+        self.pending.clear()
+
+    def fire(self):
+        self.pending.pop(0)()
+
+
+class _Canvas(FigureCanvasAgg):
+    """Agg canvas recording the frames the Tk thread would show."""
+
+    worker = None
+
+    def __init__(self, figure):
+        super().__init__(figure)
+        self.shown = []
+
+    def draw(self):
+        super().draw()
+        self.worker.publish()
+
+    def show_frame(self, frame):
+        self.shown.append((threading.current_thread(), frame))
+
+
+def _wait_for(condition):
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def _worker(render_log, errors=None):
+    master = _FakeMaster()
+    figure = Figure(figsize=(2, 1), dpi=50)
+    ax = figure.add_subplot()
+    canvas = _Canvas(figure)
+
+    def render(view):
+        render_log.append(threading.current_thread())
+        ax.plot([0, 1], [0, 1])
+        canvas.draw()
+
+    worker = RenderWorker(master, canvas, render, log=(errors if errors is not None else []).append)
+    return master, figure, canvas, worker
+
+
+def test_frames_are_drawn_on_the_worker_and_shown_on_the_tk_thread():
+    renders = []
+    master, _, canvas, worker = _worker(renders)
+    worker.start()
+    worker.request()
+    _wait_for(lambda: worker.rendered == 1)
+    master.fire()
+
+    assert renders == [worker._thread]
+    assert len(canvas.shown) == 1
+    thread, frame = canvas.shown[0]
+    assert thread is threading.current_thread()
+    assert frame.shape == (50, 100, 4) and frame.dtype == np.uint8
+    master.fire()  # no new frame: nothing to show
+    assert worker.counts() == {"rendered": 1, "presented": 1, "stale": 0, "errors": 0}
+    worker.stop()
+    assert master.pending == []
+
+
+def test_calls_run_before_the_frame_and_errors_do_not_stop_the_worker():
+    renders, errors = [], []
+    master, figure, canvas, worker = _worker(renders, errors)
+    order = []
+
+    def fail():
+        order.append("fail")
+        raise RuntimeError("boom")
+
+    worker.call(fail)
+    worker.call(lambda: order.append("resize"))
+    worker.start()
+    _wait_for(lambda: worker.rendered == 1)
+    assert order == ["fail", "resize"] and len(renders) == 1
+    assert errors == ["Render worker error: boom"] and worker.counts()["errors"] == 1
+
+    # A frame drawn before the figure was resized is dropped and redrawn
+    figure.set_size_inches(3, 1)
+    master.fire()
+    assert canvas.shown == [] and worker.counts()["stale"] == 1
+    _wait_for(lambda: worker.rendered == 2)
+    master.fire()
+    assert canvas.shown[0][1].shape == (50, 150, 4)
+    worker.stop()
+
+
+def test_the_latest_requested_view_is_drawn_and_kept_for_later_frames():
+    master = _FakeMaster()
+    canvas = _Canvas(Figure(figsize=(2, 1), dpi=50))
+    frames = []
+    worker = RenderWorker(master, canvas, lambda view: frames.append((view, worker.figure_lock.locked())))
+    worker.request(("1 s", 1))
+    worker.request(("1 min", 2))  # merged: only the newer view is drawn
+    worker.start()
+    _wait_for(lambda: worker.rendered == 1)
+    worker.request()  # e.g. a Tk-side redraw: the same view again
+    _wait_for(lambda: worker.rendered == 2)
+
+    assert frames == [(("1 min", 2), True), (("1 min", 2), True)]
+    worker.stop()
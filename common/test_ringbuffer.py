@@ -0,0 +1,330 @@
+"""Tests for the NumPy ring buffer engine (RingBuffer / ArrayTimeDeque)."""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pytest
+
+from RingBuffer import MAXLEN, ArrayTimeDeque, CalibratedTimeDeque, RingBuffer, RollupTimeDeque, bucket_start
+
+
+def test_ring_buffer_views_are_ordered_and_contiguous():
+    buffer = RingBuffer(2, capacity=5)
+    for i in range(23):
+        buffer.append(float(i), [i, -i])
+
+    times = buffer.times()
+    data = buffer.data()
+    assert len(buffer) == 5
+    assert times.tolist() == [18.0, 19.0, 20.0, 21.0, 22.0]
+    assert data[1].tolist() == [-18.0, -19.0, -20.0, -21.0, -22.0]
+    assert times.flags["C_CONTIGUOUS"] and data[0].flags["C_CONTIGUOUS"]
+    assert np.shares_memory(times, buffer._buf)
+
+
+def test_ring_buffer_extend_keeps_newest():
+    buffer = RingBuffer(1, capacity=3)
+    buffer.extend(np.arange(10.0), np.arange(10.0)[None, :] * 2)
+    assert buffer.times().tolist() == [7.0, 8.0, 9.0]
+    assert buffer.data()[0].tolist() == [14.0, 16.0, 18.0]
+    buffer.append(10.0, [20.0])
+    assert buffer.times().tolist() == [8.0, 9.0, 10.0]
+
+
+def test_ring_buffer_compaction_after_drop_before_keeps_trimmed_rows_out():
+    buffer = RingBuffer(1, capacity=4)
+    for i in range(8):
+        buffer.append(float(i), [i])
+    buffer.drop_before(7.0)
+    assert buffer.times().tolist() == [7.0]
+
+    # The slab is full: this append compacts it
+    buffer.append(8.0, [8])
+    assert buffer.times().tolist() == [7.0, 8.0]
+    assert buffer.data()[0].tolist() == [7.0, 8.0]
+
+
+def test_array_time_deque_subsampling_matches_various_time_deque():
+    deque = ArrayTimeDeque(1)
+    deque.clear()
+    start = 1_700_000_000.0
+    for i in range(0, 7200, 1):
+        deque.update_data([float(i)], start + i)
+
+    assert len(deque.get_time_deque(1)) == MAXLEN
+    assert deque.get_time_deque(60)[-1] == start + 7140
+    assert np.all(np.diff(deque.get_time_deque(600)) == 600)
+    assert deque.get_time_deque(3600).tolist() == [start, start + 3600]
+    assert deque.get_last_data() == [7199.0]
+    assert deque.get_last_1hour_time() == datetime.fromtimestamp(start + 3600)
+
+
+def test_array_time_deque_load_historical():
+    now = datetime(2024, 11, 1, 12, 0, 0)
+    records = [(now - timedelta(minutes=m), [float(m), 1.0]) for m in range(300, -1, -1)]
+    deque = ArrayTimeDeque(2)
+    deque.load_historical(records, reference_time=now)
+
+    assert deque.get_time_deque(1).tolist() == [now.timestamp() - 60, now.timestamp()]
+    assert len(deque.get_time_deque(60)) == MAXLEN
+    assert deque.get_data_deque(60)[0][-1] == 0.0
+    assert len(deque.get_time_deque(600)) == 31
+
+
+def test_rollup_cascade_keeps_mean_min_max_count():
+    deque = RollupTimeDeque(1)
+    deque.clear()
+    start = 1_700_000_000.0
+    values = np.sin(np.arange(7200) / 37.0)
+    values[1234] = 50.0  # a spike that point subsampling would drop
+    for i, value in enumerate(values):
+        deque.update_data([value], start + i)
+
+    minute_means = deque.get_data_deque(60)[0]
+    assert np.allclose(minute_means[-2], values[7080:7140].mean())
+    assert deque.get_count_deque(60)[-1] == 60
+
+    assert deque.get_time_deque(3600).tolist() == [start, start + 3600]
+    assert deque.get_max_deque(3600)[0].tolist() == [50.0, values[3600:].max()]
+    assert np.allclose(deque.get_data_deque(3600)[0], [values[:3600].mean(), values[3600:].mean()])
+    assert deque.get_count_deque(600).sum() == 7200
+    assert deque.get_min_deque(600)[0][2] == values[1200:1800].min()
+
+
+def test_rollup_load_historical_trims_each_window():
+    now = datetime(2024, 11, 1, 12, 0, 0)
+    records = [(now - timedelta(minutes=m), [float(m)]) for m in range(7000, -1, -1)]
+    deque = RollupTimeDeque(1)
+    deque.load_historical(records, reference_time=now)
+
+    assert len(deque.get_time_deque(1)) == 2
+    assert deque.get_time_deque(60)[0] >= now.timestamp() - MAXLEN * 60
+    assert deque.get_time_deque(3600)[0] >= now.timestamp() - MAXLEN * 3600
+    assert deque.get_count_deque(600)[-2] == 10
+
+
+def test_persistent_storage_restores_every_interval(tmp_path):
+    path = str(tmp_path / "plotbuf.bin")
+    start = 1_700_000_000.0
+    deque = RollupTimeDeque(2, storage_path=path)
+    assert not deque.restored
+    deque.clear()
+    for i in range(4000):
+        deque.update_data([float(i), -float(i)], start + i)
+    deque.flush()
+    expected = {s: deque.snapshot(s) for s in (1, 60, 600, 3600)}
+    del deque
+
+    restored = RollupTimeDeque(2, storage_path=path)
+    assert restored.restored
+    for seconds, (times, data) in expected.items():
+        assert np.array_equal(restored.get_time_deque(seconds), times)
+        assert np.array_equal(restored.get_data_deque(seconds), data)
+
+    # The open buckets continue where they left off.
+    restored.update_data([4000.0, -4000.0], start + 4000)
+    assert restored.get_count_deque(60)[-1] == 41
+    assert restored.get_count_deque(3600)[-1] == 401
+
+
+def test_newest_time_survives_trim_after_a_long_shutdown(tmp_path):
+    path = str(tmp_path / "plotbuf.bin")
+    start = 1_700_000_000.0
+    deque = RollupTimeDeque(2, storage_path=path)
+    deque.clear()
+    assert deque.newest_time() is None
+    for i in range(30):
+        deque.update_data([float(i), 0.0], start + i)
+    deque.flush()
+    del deque
+
+    restored = RollupTimeDeque(2, storage_path=path)
+    assert restored.newest_time() == start + 29
+    restored.trim(datetime.fromtimestamp(start + 3 * 3600))  # the 1 s and 1 min windows are gone
+    assert len(restored.get_time_deque(1)) == 0 and len(restored.get_time_deque(60)) == 0
+    assert restored.newest_time() == start  # the 10 min / 1 h buckets opened by the first sample
+
+
+def test_persistent_storage_recreated_on_shape_mismatch(tmp_path):
+    path = str(tmp_path / "plotbuf.bin")
+    ArrayTimeDeque(2, storage_path=path).flush()
+    assert ArrayTimeDeque(2, storage_path=path).restored
+    assert not ArrayTimeDeque(3, storage_path=path).restored
+    assert not RollupTimeDeque(3, storage_path=path).restored
+
+
+def _irregular_history(now):
+    rng = np.random.default_rng(7)
+    times = np.sort(now - rng.uniform(0, 120 * 3600, 20000))
+    return times, rng.normal(size=(len(times), 2))
+
+
+def test_bulk_load_matches_per_interval_subsampling():
+    now = 1_700_000_000.0
+    times, values = _irregular_history(now)
+    bulk = ArrayTimeDeque(2)
+    bulk.load_historical_arrays(times, values, reference_time=datetime.fromtimestamp(now))
+
+    for seconds in (1, 60, 600, 3600):
+        # Subsampling restarts at each interval's own window edge.
+        window = times >= now - MAXLEN * seconds
+        reference = ArrayTimeDeque(2)
+        reference.clear()
+        for t, v in zip(times[window], values[window]):
+            reference.update_data(v, t)
+        assert np.array_equal(bulk.get_time_deque(seconds), reference.get_time_deque(seconds))
+        assert np.array_equal(bulk.get_data_deque(seconds), reference.get_data_deque(seconds))
+
+
+@pytest.mark.parametrize("aligned", [False, True])
+def test_rollup_bulk_load_matches_incremental_updates(aligned):
+    now = 1_700_000_000.0
+    times, values = _irregular_history(now)
+    bulk = RollupTimeDeque(2, aligned=aligned)
+    bulk.load_historical_arrays(times, values, reference_time=datetime.fromtimestamp(now))
+
+    incremental = RollupTimeDeque(2, aligned=aligned)
+    incremental.clear()
+    window = times >= now - MAXLEN * 3600
+    for t, v in zip(times[window], values[window]):
+        incremental.update_data(v, t)
+    incremental.trim(datetime.fromtimestamp(now))
+
+    for seconds in (1, 60, 600, 3600):
+        assert np.array_equal(bulk.get_time_deque(seconds), incremental.get_time_deque(seconds))
+        assert np.allclose(bulk.buffer(seconds).data(), incremental.buffer(seconds).data())
+
+    # The open buckets continue identically.
+    bulk.update_data([1.0, 2.0], now + 30)
+    incremental.update_data([1.0, 2.0], now + 30)
+    for seconds in (60, 600, 3600):
+        assert np.allclose(bulk.buffer(seconds).data(), incremental.buffer(seconds).data())
+
+
+def test_aligned_buckets_start_on_wall_clock_boundaries():
+    start = datetime(2024, 11, 1, 10, 52, 15)
+    drift, aligned = RollupTimeDeque(1), RollupTimeDeque(1, aligned=True)
+    plain = ArrayTimeDeque(1, aligned=True)
+    for deque in (drift, aligned, plain):
+        deque.clear()
+    # A slightly slow sample clock: 1 min buckets drift to :16, :17, ...
+    for i in range(90):
+        t = start + timedelta(seconds=i * 60.01 + 0.5 * (i % 2))
+        for deque in (drift, aligned, plain):
+            deque.update_data([float(i)], t)
+
+    assert datetime.fromtimestamp(drift.get_time_deque(60)[-1]).second != 0
+    for deque in (aligned, plain):
+        for seconds in (60, 600, 3600):
+            times = deque.get_time_deque(seconds)
+            assert all(bucket_start(t, seconds) == t for t in times)
+            assert np.all(np.diff(times) >= seconds)
+    assert datetime.fromtimestamp(aligned.get_time_deque(60)[0]) == datetime(2024, 11, 1, 10, 52)
+    assert datetime.fromtimestamp(aligned.get_time_deque(600)[0]) == datetime(2024, 11, 1, 10, 50)
+    assert datetime.fromtimestamp(aligned.get_time_deque(3600)[0]) == datetime(2024, 11, 1, 10, 0)
+    # Every 1 min bucket holds the samples of exactly its clock minute.
+    samples = [(start + timedelta(seconds=i * 60.01 + 0.5 * (i % 2))).timestamp() for i in range(90)]
+    minutes = [bucket_start(t, 60) for t in samples]
+    expected = [minutes.count(t) for t in aligned.get_time_deque(60)]
+    assert np.array_equal(aligned.get_count_deque(60), expected)
+
+
+def test_recalibration_matches_ingesting_with_the_new_calibration():
+    now = 1_700_000_000.0
+    times, values = _irregular_history(now)
+    slope, offset = [2.0, -0.5], [1.0, 3.0]
+
+    recalibrated = CalibratedTimeDeque(2, aligned=True)
+    recalibrated.load_historical_arrays(times, values, reference_time=datetime.fromtimestamp(now))
+    recalibrated.set_calibration(slope, offset)
+
+    fresh = CalibratedTimeDeque(2, aligned=True)
+    fresh.set_calibration(slope, offset)
+    fresh.load_historical_arrays(times, values, reference_time=datetime.fromtimestamp(now))
+
+    for deque in (recalibrated, fresh):
+        deque.update_data([1.0, 2.0], now + 30)
+    for seconds in (1, 60, 600, 3600):
+        assert np.allclose(recalibrated.buffer(seconds).data(), fresh.buffer(seconds).data())
+        raw = recalibrated.get_data_deque(seconds)
+        assert np.allclose(recalibrated.get_calibrated_deque(seconds), raw * np.c_[slope] + np.c_[offset])
+    # A negative slope swaps which raw extreme becomes the calibrated minimum.
+    assert np.allclose(fresh.get_min_deque(60)[3], -0.5 * fresh.get_max_deque(60)[1] + 3.0)
+    assert fresh.get_last_data() == [1.0, 2.0]
+    assert fresh.get_last_calibrated() == [3.0, 2.0]
+
+
+def test_generation_changes_with_every_write():
+    deque = CalibratedTimeDeque(2)
+    seen = [deque.generation]
+    deque.update_data([1.0, 2.0], 1_700_000_000.0)
+    seen.append(deque.generation)
+    deque.set_calibration([2.0, 2.0], [0.0, 0.0])
+    seen.append(deque.generation)
+    deque.trim(datetime.fromtimestamp(1_700_000_000.0 + 10 * MAXLEN))
+    seen.append(deque.generation)
+    deque.clear()
+    seen.append(deque.generation)
+    deque.load_historical_arrays(np.array([1_700_000_000.0]), np.array([[1.0, 2.0]]),
+                                 datetime.fromtimestamp(1_700_000_001.0))
+    seen.append(deque.generation)
+    assert len(set(seen)) == len(seen)
+    # Reads leave it alone
+    deque.calibrated_snapshot(1)
+    assert deque.generation == seen[-1]
+
+
+def _scanned_ranges(deque, seconds):
+    times = deque.get_time_deque(seconds)
+    data = deque.get_calibrated_deque(seconds) if isinstance(deque, CalibratedTimeDeque) else deque.get_data_deque(seconds)
+    rows = np.vstack([times, data])
+    return rows.min(axis=1), rows.max(axis=1)
+
+
+@pytest.mark.parametrize("deque_class", [ArrayTimeDeque, RollupTimeDeque, CalibratedTimeDeque])
+def test_window_ranges_track_every_change(deque_class, tmp_path):
+    path = str(tmp_path / "plotbuf.bin")
+    rng = np.random.default_rng(3)
+    now = 1_700_000_000.0
+    deque = deque_class(2, storage_path=path, aligned=True)
+
+    def check():
+        for seconds in (1, 60, 600, 3600):
+            low, high = deque.window_ranges(seconds)
+            expected_low, expected_high = _scanned_ranges(deque, seconds)
+            assert np.array_equal(low, expected_low) and np.array_equal(high, expected_high)
+
+    times, values = _irregular_history(now)
+    deque.load_historical_arrays(times, values, reference_time=datetime.fromtimestamp(now))
+    check()
+    for i in range(3 * MAXLEN):
+        deque.update_data(rng.normal(size=2).round(1).tolist(), now + 7 * i)
+        check()
+    if deque_class is CalibratedTimeDeque:
+        deque.set_calibration([-2.0, 0.5], [1.0, 0.0])
+        check()
+    deque.trim(datetime.fromtimestamp(now + 7 * 3 * MAXLEN + 80))
+    check()
+    deque.flush()
+    del deque
+
+    deque = deque_class(2, storage_path=path, aligned=True)
+    check()
+    deque.clear()
+    assert deque.window_ranges(1) is None
+
+
+def test_compaction_after_drop_before_keeps_only_the_window():
+    buffer = RingBuffer(1, capacity=10, tracked_rows=(0, 1))
+    for i in range(15):
+        buffer.append(float(i), [float(i)])
+    buffer.drop_before(13.0)
+    for i in range(15, 21):  # fills the slab and slides the window back
+        buffer.append(float(i), [float(i)])
+    assert buffer.times().tolist() == [13.0, 14.0, 15.0, 16.0, 17.0, 18.0, 19.0, 20.0]
+    low, high = buffer.ranges()
+    assert low.tolist() == [13.0, 13.0] and high.tolist() == [20.0, 20.0]
@@ -0,0 +1,33 @@
+"""Tests for the compact sample wire formats."""
+
+import json
+import math
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from SampleFormat import HEADER, decode_binary, encode_array, encode_binary
+
+
+def test_binary_round_trip_keeps_full_precision():
+    values = (6.123456789012345, -1.0e-12, None, 72.3)
+    body = encode_binary(42, 1731043200.123456, values)
+    assert len(body) == HEADER.size + 8 * len(values)
+
+    sequence, timestamp, decoded = decode_binary(body)
+    assert (sequence, timestamp) == (42, 1731043200.123456)
+    assert decoded[:2] == values[:2] and decoded[3] == values[3]
+    assert math.isnan(decoded[2])
+
+    assert decode_binary(encode_binary(1, 2.0, ())) == (1, 2.0, ())
+    with pytest.raises(ValueError):
+        decode_binary(body[:-1])
+    with pytest.raises(ValueError):
+        decode_binary(b"\x00" * 8)
+
+
+def test_array_is_sequence_timestamp_then_values():
+    assert json.loads(encode_array(7, 100.5, (1.25, None))) == [7, 100.5, 1.25, None]
@@ -0,0 +1,42 @@
+"""Tests for the receiver-side sample history."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from SampleHistory import SampleHistory
+
+
+def test_since_returns_newer_samples_oldest_first_across_the_wrap():
+    history = SampleHistory(("a", "b"), size=5)
+    for i in range(8):
+        history.append(100.0 + i, (i, None if i == 6 else 2 * i))
+    assert len(history) == 5 and history.count == 8
+
+    samples, more = history.since(104.0, limit=10)
+    assert [s["timestamp"] for s in samples] == [105.0, 106.0, 107.0]
+    assert samples[1] == {"a": 6.0, "b": None, "timestamp": 106.0}
+    assert not more
+
+    # Older than everything kept: start at the oldest sample still in the ring
+    samples, more = history.since(0.0, limit=2)
+    assert [s["timestamp"] for s in samples] == [103.0, 104.0] and more
+    assert history.since(107.0, limit=10) == ([], False)
+
+    with pytest.raises(ValueError):
+        history.append(108.0, (1,))
+
+
+def test_step_thins_fast_samples_and_decimals_format_like_meas():
+    history = SampleHistory(("P_st",), size=100, decimals=3)
+    for i in range(10):
+        history.append(1000.0 + 0.5 * i, (1.23456 + i,))
+    samples, more = history.since(999.0, limit=100, step=1)
+    assert [s["timestamp"] for s in samples] == [1000.0, 1001.0, 1002.0, 1003.0, 1004.0]
+    assert samples[0]["P_st"] == "1.235" and not more
+
+    samples, more = history.since(999.0, limit=2, step=1)
+    assert [s["timestamp"] for s in samples] == [1000.0, 1001.0] and more
@@ -0,0 +1,128 @@
+"""Tests for the retained widget state and the keyed canvas scene."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from WidgetState import CanvasScene, WidgetState
+
+
+class _Widget:
+    """Records the Tk calls a label or button would receive."""
+
+    def __init__(self):
+        self.calls = []
+
+    def config(self, **options):
+        self.calls.append(("config", options))
+
+    def place(self, **geometry):
+        self.calls.append(("place", geometry))
+
+    def place_forget(self):
+        self.calls.append(("place_forget", {}))
+
+
+class _Canvas:
+    """Keeps canvas items as dicts and records every call."""
+
+    def __init__(self):
+        self.items = {}
+        self.order = []
+        self.calls = []
+
+    def _create(self, kind, coords, options):
+        item = len(self.items) + 1
+        self.items[item] = {"kind": kind, "coords": coords, **options}
+        self.order.append(item)
+        self.calls.append("create")
+        return item
+
+    def create_text(self, *coords, **options):
+        return self._create("text", coords, options)
+
+    def create_rectangle(self, *coords, **options):
+        return self._create("rectangle", coords, options)
+
+    def coords(self, item, *coords):
+        self.items[item]["coords"] = coords
+        self.calls.append("coords")
+
+    def itemconfigure(self, item, **options):
+        self.items[item].update(options)
+        self.calls.append("itemconfigure")
+
+    def tag_raise(self, item):
+        self.order.remove(item)
+        self.order.append(item)
+
+    def visible(self):
+        return [self.items[item]["text"] for item in self.order
+                if self.items[item]["state"] == "normal" and self.items[item]["kind"] == "text"]
+
+
+def test_widgets_get_only_the_options_that_changed():
+    state = WidgetState()
+    label, button = _Widget(), _Widget()
+
+    assert state.set(label, text=": 1.00 psi", fg="black")
+    assert not state.set(label, text=": 1.00 psi", fg="black")
+    assert state.set(label, text=": 1.25 psi", fg="black")
+    assert label.calls == [("config", {"text": ": 1.00 psi", "fg": "black"}), ("config", {"text": ": 1.25 psi"})]
+
+    state.place(button, x=10, y=20)
+    state.place(button, x=10, y=20)
+    state.place_forget(button)
+    state.place_forget(button)
+    state.place(button, x=10, y=20)
+    assert [name for name, _ in button.calls] == ["place", "place_forget", "place"]
+    assert (state.configured, state.skipped) == (5, 3)
+
+    state.forget(label)
+    state.set(label, text=": 1.25 psi")
+    assert len(label.calls) == 3
+
+    assert state.changed("rfm", 1) and not state.changed("rfm", 1)
+    assert state.changed("rfm", 2) and state.changed("drc91c", 2)
+
+
+def test_scene_updates_items_in_place_and_keeps_drawing_order():
+    canvas = _Canvas()
+    scene = CanvasScene(canvas)
+
+    def frame(values, mini=False):
+        scene.begin()
+        if not mini:
+            scene.rectangle(("bkg", 0), 0, 10, 50, 20, fill="black")
+        scene.text(("flow", 0), 5, 15, text=values[0], fill="white")
+        if not mini:
+            scene.text(("input", 0), 5, 30, text="Input: ", fill="white")
+        scene.finish()
+
+    frame(["0.00"])
+    assert canvas.calls == ["create"] * 3
+    canvas.calls.clear()
+
+    frame(["0.00"])
+    assert canvas.calls == []
+    frame(["1.50"])
+    assert canvas.calls == ["itemconfigure"] and canvas.visible() == ["1.50", "Input: "]
+
+    frame(["1.50"], mini=True)
+    assert canvas.visible() == ["1.50"]
+    frame(["1.50"])
+    assert canvas.visible() == ["1.50", "Input: "]
+    assert scene.created == 3
+
+    # An item first drawn in a later frame is still stacked in drawing order
+    canvas2 = _Canvas()
+    scene2 = CanvasScene(canvas2)
+    scene2.begin()
+    scene2.text("value", 0, 0, text="3.00")
+    scene2.finish()
+    scene2.begin()
+    scene2.rectangle("bkg", 0, 0, 10, 10, fill="gray")
+    scene2.text("value", 0, 0, text="3.00")
+    scene2.finish()
+    assert [canvas2.items[item]["kind"] for item in canvas2.order] == ["rectangle", "text"]
@@ -48,6 +48,7 @@
 # 그래프를 그릴 기간 표시 입력 영역은 그래프를 그릴 때, 그래프의 x축에 해당하는 값을 입력하는 영역임.
 
 import os
+import sys
 import tkinter as tk
 from tkinter import ttk, messagebox
 import matplotlib.pyplot as plt
@@ -55,6 +56,25 @@ from datetime import datetime, timedelta
 from tkinterdnd2 import DND_FILES, TkinterDnD
 import re
 from dataclasses import dataclass
+from typing import Optional
+
+_COMMON_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "common"))
+if _COMMON_DIR not in sys.path:
+    sys.path.insert(0, _COMMON_DIR)
+
+from Decimation import DecimatedLines
+from LogIndex import LogSummary, read_summary
+from LogQuery import read_files
+from RingBuffer import local_datetime64
+
+# 그래프 선 데이터 축소 방식: "minmax" (픽셀 열마다 최소/최대) 또는 "lttb"
+DECIMATION_METHOD = "minmax"
+
+# LogViewer 로그 종류 → LogQuery subsystem
+_SUBSYSTEMS = {
+    "Pressure & Level Log": "pressurelevel",
+    "Flow & Temperature Log": "flowtemp",
+}
 
 @dataclass
 class LogFile():
@@ -62,6 +82,7 @@ class LogFile():
     first_date: datetime
     last_date: datetime
     log_type: str
+    summary: Optional[LogSummary] = None  # DD.idx.json sidecar (time range, stats, max gap)
 
 
 class LogViewer:
@@ -186,11 +207,14 @@ class LogViewer:
             widget.destroy()
 
     def is_valid_pressure_level_log(self, log_line):
-        pattern = r'^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}: -?\d+\.\d{2} [VL], -?\d+\.\d{2} psi, -?\d+\.\d{2} psi, -?\d+\.\d{2} psi$'
+        # 값 자리의 "-----"는 데이터가 없는 분(분 단위 고정 폭 로그의 gap 줄)
+        value = r'(?:-?\d+\.\d{2}|-+)'
+        pattern = rf'^\d{{4}}-\d{{2}}-\d{{2}} \d{{2}}:\d{{2}}:\d{{2}}: {value} [VL], {value} psi, {value} psi, {value} psi$'
         return re.match(pattern, log_line) is not None
 
     def is_valid_flow_temperature_log(self, log_line):
-        pattern = r'^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}: -?\d+\.\d{2}, -?\d+\.\d{2}, -?\d+\.\d{2}, -?\d+\.\d{2}, -?\d+\.\d{2}, -?\d+\.\d{2}$'
+        value = r'(?:-?\d+\.\d{2}|-+)'
+        pattern = rf'^\d{{4}}-\d{{2}}-\d{{2}} \d{{2}}:\d{{2}}:\d{{2}}: {value}, {value}, {value}, {value}, {value}, {value}$'
         return re.match(pattern, log_line) is not None
 
     def check_file(self, file):
@@ -224,17 +248,15 @@ class LogViewer:
     def manage_log_files(self):
         # 로그 파일의 첫번째 줄과 마지막 줄의 시간을 불러온 다음에, 이를 기준으로 로그파일들을 정렬함.
         # 정렬된 로그 파일들을 self.log_files에 저장함.
+        # 시간 범위는 파일 옆 DD.idx.json 요약에서 읽고, 요약이 없거나 오래됐을 때만 새로 쓰인 부분을 읽음.
+        # 요약 파일은 로거만 씀 — 뷰어는 읽기만 하므로 로그 폴더를 건드리지 않음.
         if len(self.log_files) == 0:
             return
         
         for logfile in self.log_files:
-            with open(logfile.file_path, 'r') as f:
-                first_line = f.readline().strip()
-                last_line = None
-                for line in f:
-                    last_line = line
-                logfile.first_date = datetime.strptime(first_line.split(': ')[0], "%Y-%m-%d %H:%M:%S")
-                logfile.last_date = datetime.strptime(last_line.split(': ')[0], "%Y-%m-%d %H:%M:%S")
+            logfile.summary = read_summary(logfile.file_path, write=False)
+            logfile.first_date = logfile.summary.first_time
+            logfile.last_date = logfile.summary.last_time
         
         self.log_files = sorted(self.log_files, key=lambda x: x.first_date)
 
@@ -245,20 +267,9 @@ class LogViewer:
             self.possible_period_value2.config(text="")
             return
         
-        first_date = None
-        last_date = None
-        for logfile in self.log_files:
-            with open(logfile.file_path, 'r') as f:
-                first_line = f.readline().strip()
-                last_line = None
-                for line in f:
-                    last_line = line
-                file_first_date = datetime.strptime(first_line.split(': ')[0], "%Y-%m-%d %H:%M:%S")
-                file_last_date = datetime.strptime(last_line.split(': ')[0], "%Y-%m-%d %H:%M:%S")
-                if first_date is None or file_first_date < first_date:
-                    first_date = file_first_date
-                if last_date is None or file_last_date > last_date:
-                    last_date = file_last_date
+        # manage_log_files가 요약에서 채워둔 시간 범위를 사용함.
+        first_date = min(logfile.first_date for logfile in self.log_files)
+        last_date = max(logfile.last_date for logfile in self.log_files)
 
         self.possible_period_value1.config(text=first_date.strftime("%Y-%m-%d %H:%M:%S"))
         self.possible_period_value2.config(text=last_date.strftime("%Y-%m-%d %H:%M:%S"))
@@ -269,15 +280,17 @@ class LogViewer:
         if len(self.log_files) == 0:
             return
         
+        # 파일 안의 간격은 요약의 max_gap으로, 파일 사이의 간격은 첫/마지막 시간으로 확인함.
         prev_date = None
         for logfile in self.log_files:
-            with open(logfile.file_path, 'r') as f:
-                for line in f:
-                    date = datetime.strptime(line.split(': ')[0], "%Y-%m-%d %H:%M:%S")
-                    if prev_date is not None and date - prev_date > timedelta(minutes=5):
-                        self.status_bar.config(text=f"Status: Non-continuous time detected at {logfile}")
-                        return False
-                    prev_date = date
+            within_file_gap = logfile.summary.max_gap if logfile.summary is not None else 0.0
+            if (
+                within_file_gap > timedelta(minutes=5).total_seconds()
+                or (prev_date is not None and logfile.first_date - prev_date > timedelta(minutes=5))
+            ):
+                self.status_bar.config(text=f"Status: Non-continuous time detected at {logfile}")
+                return False
+            prev_date = logfile.last_date
         self.status_bar.config(text="")
         return True
 
@@ -330,30 +343,23 @@ class LogViewer:
             else: # 둘 다 올린 경우
                 self.draw_multiple_mixed_graph()
 
-    def draw_pressure_level_graph(self):
-        datetimes = []
-        volume = []
-        plant_pressure = []
-        storage_pressure = []
-        purifier_pressure = []
+    def read_log_data(self, log_type):
+        # 해당 종류의 로그 파일들을 불러온 순서대로 읽어서 (시각, 값 배열 (n, 채널 수))로 돌려줌.
+        paths = [logfile.file_path for logfile in self.log_files if logfile.log_type == log_type]
+        times, values = read_files(paths, _SUBSYSTEMS[log_type])
+        return local_datetime64(times), values
 
-        for logfile in self.log_files:
-            with open(logfile.file_path, 'r') as f:
-                for line in f:
-                    date, data = line.split(': ')
-                    level, pressure1, pressure2, pressure3 = data.split(', ')
-                    datetimes.append(datetime.strptime(date, "%Y-%m-%d %H:%M:%S"))
-                    volume.append(float(level.split()[0]))
-                    plant_pressure.append(float(pressure1.split()[0]))
-                    storage_pressure.append(float(pressure2.split()[0]))
-                    purifier_pressure.append(float(pressure3.split()[0]))
+    def draw_pressure_level_graph(self):
+        datetimes, values = self.read_log_data("Pressure & Level Log")
+        volume, plant_pressure, storage_pressure, purifier_pressure = values.T
 
         fig, ax1 = plt.subplots()
         ax2 = ax1.twinx()
-        ax1.plot(datetimes, volume, 'b-', label='Volume')
-        ax2.plot(datetimes, plant_pressure, 'g-', label='P_plant')
-        ax2.plot(datetimes, storage_pressure, 'r-', label='P_storage')
-        ax2.plot(datetimes, purifier_pressure, 'skyblue', label='P_purifier')
+        lines = ax1.plot(datetimes, volume, 'b-', label='Volume')
+        lines += ax2.plot(datetimes, plant_pressure, 'g-', label='P_plant')
+        lines += ax2.plot(datetimes, storage_pressure, 'r-', label='P_storage')
+        lines += ax2.plot(datetimes, purifier_pressure, 'skyblue', label='P_purifier')
+        DecimatedLines(datetimes, values, lines, DECIMATION_METHOD)
         ax1.set_xlabel('Time')
         ax1.set_ylabel('Volume')
         ax2.set_ylabel('Pressure', color='r')
@@ -364,35 +370,18 @@ class LogViewer:
         plt.show()
 
     def draw_flow_temperature_graph(self):
-        datetimes = []
-        tip_flow = []
-        shield_flow = []
-        bypass_flow = []
-        pumping_flow = []
-        head_temperature = []
-        coldtip_temperature = []
+        datetimes, values = self.read_log_data("Flow & Temperature Log")
+        tip_flow, shield_flow, bypass_flow, pumping_flow, head_temperature, coldtip_temperature = values.T
 
-        for logfile in self.log_files:
-            with open(logfile.file_path, 'r') as f:
-                for line in f:
-                    date, data = line.split(': ')
-                    flow1, flow2, flow3, flow4, temperature1, temperature2 = data.split(', ')
-                    datetimes.append(datetime.strptime(date, "%Y-%m-%d %H:%M:%S"))
-                    tip_flow.append(float(flow1.split()[0]))
-                    shield_flow.append(float(flow2.split()[0]))
-                    bypass_flow.append(float(flow3.split()[0]))
-                    pumping_flow.append(float(flow4.split()[0]))
-                    head_temperature.append(float(temperature1.split()[0]))
-                    coldtip_temperature.append(float(temperature2.split()[0]))
-        
         fig, ax1 = plt.subplots()
         ax2 = ax1.twinx()
-        ax1.plot(datetimes, tip_flow, 'g-', label='Tip Flow')
-        ax1.plot(datetimes, shield_flow, 'b-', label='Shield Flow')
-        ax1.plot(datetimes, bypass_flow, 'p-', label='Bypass Flow')
-        ax1.plot(datetimes, pumping_flow, 's-', label='Pumping Flow')
-        ax2.plot(datetimes, head_temperature, 'r-', label='Head Temperature')
-        ax2.plot(datetimes, coldtip_temperature, 'y-', label='Coldtip Temperature')
+        lines = ax1.plot(datetimes, tip_flow, 'g-', label='Tip Flow')
+        lines += ax1.plot(datetimes, shield_flow, 'b-', label='Shield Flow')
+        lines += ax1.plot(datetimes, bypass_flow, 'p-', label='Bypass Flow')
+        lines += ax1.plot(datetimes, pumping_flow, 's-', label='Pumping Flow')
+        lines += ax2.plot(datetimes, head_temperature, 'r-', label='Head Temperature')
+        lines += ax2.plot(datetimes, coldtip_temperature, 'y-', label='Coldtip Temperature')
+        DecimatedLines(datetimes, values, lines, DECIMATION_METHOD)
         ax1.set_xlabel('Time')
         ax1.set_ylabel('Flow (L/min)')
         ax2.set_ylabel('Temperature (K)', color='r')
@@ -403,43 +392,11 @@ class LogViewer:
         plt.show()
 
     def draw_multiple_mixed_graph(self):
-        datetimes_pressurelevel = []
-        volume = []
-        plant_pressure = []
-        storage_pressure = []
-        purifier_pressure = []
-
-        datetimes_flowtemp = []
-        tip_flow = []
-        shield_flow = []
-        bypass_flow = []
-        pumping_flow = []
-        head_temperature = []
-        coldtip_temperature = []
+        datetimes_pressurelevel, values_pressurelevel = self.read_log_data("Pressure & Level Log")
+        volume, plant_pressure, storage_pressure, purifier_pressure = values_pressurelevel.T
 
-        for logfile in self.log_files:
-            if logfile.log_type == "Pressure & Level Log":
-                with open(logfile.file_path, 'r') as f:
-                    for line in f:
-                        date, data = line.split(': ')
-                        level, pressure1, pressure2, pressure3 = data.split(', ')
-                        datetimes_pressurelevel.append(datetime.strptime(date, "%Y-%m-%d %H:%M:%S"))
-                        volume.append(float(level.split()[0]))
-                        plant_pressure.append(float(pressure1.split()[0]))
-                        storage_pressure.append(float(pressure2.split()[0]))
-                        purifier_pressure.append(float(pressure3.split()[0]))
-            elif logfile.log_type == "Flow & Temperature Log":
-                with open(logfile.file_path, 'r') as f:
-                    for line in f:
-                        date, data = line.split(': ')
-                        flow1, flow2, flow3, flow4, temperature1, temperature2 = data.split(', ')
-                        datetimes_flowtemp.append(datetime.strptime(date, "%Y-%m-%d %H:%M:%S"))
-                        tip_flow.append(float(flow1.split()[0]))
-                        shield_flow.append(float(flow2.split()[0]))
-                        bypass_flow.append(float(flow3.split()[0]))
-                        pumping_flow.append(float(flow4.split()[0]))
-                        head_temperature.append(float(temperature1.split()[0]))
-                        coldtip_temperature.append(float(temperature2.split()[0]))
+        datetimes_flowtemp, values_flowtemp = self.read_log_data("Flow & Temperature Log")
+        tip_flow, shield_flow, bypass_flow, pumping_flow, head_temperature, coldtip_temperature = values_flowtemp.T
 
         fig, ax = plt.subplots(2, 1)
         ax1 = ax[0]
@@ -447,10 +404,11 @@ class LogViewer:
         ax3 = ax1.twinx()
         ax4 = ax2.twinx()
 
-        ax1.plot(datetimes_pressurelevel, volume, 'b-', label='Volume')
-        ax3.plot(datetimes_pressurelevel, plant_pressure, 'g-', label='P_plant')
-        ax3.plot(datetimes_pressurelevel, storage_pressure, 'r-', label='P_storage')
-        ax3.plot(datetimes_pressurelevel, purifier_pressure, 'skyblue', label='P_purifier')
+        lines = ax1.plot(datetimes_pressurelevel, volume, 'b-', label='Volume')
+        lines += ax3.plot(datetimes_pressurelevel, plant_pressure, 'g-', label='P_plant')
+        lines += ax3.plot(datetimes_pressurelevel, storage_pressure, 'r-', label='P_storage')
+        lines += ax3.plot(datetimes_pressurelevel, purifier_pressure, 'skyblue', label='P_purifier')
+        DecimatedLines(datetimes_pressurelevel, values_pressurelevel, lines, DECIMATION_METHOD)
         ax1.set_xlabel('Time')
         ax1.set_ylabel('Volume')
         ax3.set_ylabel('Pressure', color='r')
@@ -459,12 +417,13 @@ class LogViewer:
         ax1.grid()
         ax3.grid(color='r')
 
-        ax2.plot(datetimes_flowtemp, tip_flow, 'g-', label='Tip Flow')
-        ax2.plot(datetimes_flowtemp, shield_flow, 'b-', label='Shield Flow')
-        ax2.plot(datetimes_flowtemp, bypass_flow, 'p-', label='Bypass Flow')
-        ax2.plot(datetimes_flowtemp, pumping_flow, 's-', label='Pumping Flow')
-        ax4.plot(datetimes_flowtemp, head_temperature, 'r-', label='Head Temperature')
-        ax4.plot(datetimes_flowtemp, coldtip_temperature, 'y-', label='Coldtip Temperature')
+        lines = ax2.plot(datetimes_flowtemp, tip_flow, 'g-', label='Tip Flow')
+        lines += ax2.plot(datetimes_flowtemp, shield_flow, 'b-', label='Shield Flow')
+        lines += ax2.plot(datetimes_flowtemp, bypass_flow, 'p-', label='Bypass Flow')
+        lines += ax2.plot(datetimes_flowtemp, pumping_flow, 's-', label='Pumping Flow')
+        lines += ax4.plot(datetimes_flowtemp, head_temperature, 'r-', label='Head Temperature')
+        lines += ax4.plot(datetimes_flowtemp, coldtip_temperature, 'y-', label='Coldtip Temperature')
+        DecimatedLines(datetimes_flowtemp, values_flowtemp, lines, DECIMATION_METHOD)
         ax2.set_xlabel('Time')
         ax2.set_ylabel('Flow (L/min)')
         ax4.set_ylabel('Temperature (K)', color='r')
@@ -1 +1 @@
-python -m PyInstaller --onefile --noconsole -n=LogViewer .\LogViewer.py
+python -m PyInstaller --onefile --noconsole -n=LogViewer --paths=..\common --hidden-import=paths --hidden-import=RingBuffer --hidden-import=LogParser --hidden-import=LogIndex --hidden-import=LogQuery --hidden-import=MinuteLog --hidden-import=Decimation .\LogViewer.py